@@ -0,0 +1,69 @@
+"""
+Benchmarks for hangman word selection, hints and simulated players.
+"""
+import os
+import random
+
+from harness import add_project_path, run_group
+
+PROJECT = add_project_path("hangman")
+
+SIZES = {
+    "quick": {"picks": 1_000, "games": 200, "hints": 1_000},
+    "full": {"picks": 100_000, "games": 3_000, "hints": 100_000},
+}
+
+
+def cases(scale):
+    size = SIZES[scale]
+
+    def random_words():
+        from main import get_random_word
+
+        return lambda: [
+            get_random_word(difficulty)
+            for _ in range(size["picks"] // 3)
+            for difficulty in ("easy", "medium", "hard")
+        ]
+
+    def load_index():
+        from main import load_word_bank
+        from word_index import WordIndex
+
+        return WordIndex.build(load_word_bank())
+
+    def build_index():
+        from main import load_word_bank
+        from word_index import WordIndex
+
+        words = load_word_bank()
+        return lambda: WordIndex.build(words)
+
+    def hints():
+        index = load_index()
+        rng = random.Random(0)
+        boards = []
+        for word in rng.choices(index.words, k=size["hints"]):
+            guessed = set(rng.sample("etaoinshrdlu", 4))
+            boards.append(([c if c in guessed else "_" for c in word], guessed))
+        return lambda: [index.best_letter(board, guessed) for board, guessed in boards]
+
+    def simulated_players():
+        from word_index import solve
+
+        index = load_index()
+        words = random.Random(1).choices(index.words, k=size["games"])
+        return lambda: [solve(word, index) for word in words]
+
+    return {
+        "hangman.get_random_word": random_words,
+        "hangman.build_word_index": build_index,
+        "hangman.hint": hints,
+        "hangman.simulated_players": simulated_players,
+    }
+
+
+if __name__ == "__main__":
+    # The word bank is loaded relative to the game folder
+    os.chdir(PROJECT)
+    run_group(cases)
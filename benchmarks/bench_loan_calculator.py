@@ -0,0 +1,54 @@
+"""
+Benchmarks for loan_calculator: metric calculation, the EIR residual and the sensitivity grid.
+"""
+import numpy as np
+
+from harness import add_project_path, run_group
+
+add_project_path("loan_calculator")
+
+SIZES = {
+    "quick": {"loans": 100, "guesses": 100_000},
+    "full": {"loans": 2_000, "guesses": 10_000_000},
+}
+
+
+def cases(scale):
+    size = SIZES[scale]
+
+    def loan_metrics():
+        from loan_calculator import calculate_loan_metrics
+
+        rng = np.random.default_rng(0)
+        loans = list(zip(
+            rng.uniform(10_000, 1_000_000, size["loans"]),
+            rng.integers(1, 36, size["loans"]),
+            rng.uniform(1, 15, size["loans"]),
+        ))
+        return lambda: [calculate_loan_metrics(p, int(t), r) for p, t, r in loans]
+
+    def residual():
+        from kernels import eir_residual
+
+        guesses = np.linspace(0.0001, 0.3, size["guesses"])
+        return lambda: eir_residual(guesses, 100_000.0, 500.0, 360)
+
+    def grid():
+        from sensitivity import _unit_grid, sensitivity_grid
+
+        def run():
+            # Cold: the cached per-unit grid is what is being measured
+            _unit_grid.cache_clear()
+            return sensitivity_grid(250_000)
+
+        return run
+
+    return {
+        "loan.calculate_loan_metrics": loan_metrics,
+        "loan.eir_residual": residual,
+        "loan.sensitivity_grid_200x40": grid,
+    }
+
+
+if __name__ == "__main__":
+    run_group(cases)
@@ -0,0 +1,78 @@
+"""
+Benchmarks for the SPX vs SPXEW metrics and the cross-sectional engine.
+"""
+import os
+import tempfile
+
+import numpy as np
+
+from harness import add_project_path, run_group
+from synthetic import generate_universe
+
+add_project_path("spx_spxew_analysis")
+
+SIZES = {
+    "quick": {"bars": 100_000, "symbols": 50, "days": 2_520, "corr_symbols": 50, "corr_days": 500},
+    "full": {"bars": 10_000_000, "symbols": 1_500, "days": 3_780, "corr_symbols": 300, "corr_days": 1_000},
+}
+
+
+def spread_metrics(df):
+    """
+    The metric pipeline of spx_spxew_analysis.py, without the download and plots.
+    """
+    df = df.copy()
+    df["SPX_Normalized"] = df["SPX"] / df["SPX"].iloc[0]
+    df["SPXEW_Normalized"] = df["SPXEW"] / df["SPXEW"].iloc[0]
+    df["SPX_Return"] = df["SPX"].pct_change()
+    df["SPXEW_Return"] = df["SPXEW"].pct_change()
+    df["Return_Spread"] = df["SPXEW_Return"] - df["SPX_Return"]
+    df["Cumulative_Return_Spread"] = (1 + df["Return_Spread"]).cumprod() - 1
+    df["SPX_Volatility"] = df["SPX_Return"].rolling(window=252).std() * np.sqrt(252)
+    df["SPXEW_Volatility"] = df["SPXEW_Return"].rolling(window=252).std() * np.sqrt(252)
+    for col in ("SPX", "SPXEW"):
+        df[f"{col}_Drawdown"] = (df[col] - df[col].cummax()) / df[col].cummax()
+    return df
+
+
+def cases(scale):
+    size = SIZES[scale]
+
+    def spread():
+        prices = generate_universe(2, size["bars"], seed=10)
+        prices.columns = ["SPX", "SPXEW"]
+        return lambda: spread_metrics(prices)
+
+    def returns(n_symbols, n_days, seed):
+        return generate_universe(n_symbols, n_days, seed=seed).pct_change().iloc[1:]
+
+    def beta():
+        from cross_sectional import rolling_beta
+
+        r = returns(size["symbols"], size["days"], 11)
+        benchmark = r.mean(axis=1)
+        return lambda: rolling_beta(r, benchmark, 252)
+
+    def dispersion():
+        from cross_sectional import cross_sectional_dispersion
+
+        r = returns(size["symbols"], size["days"], 12)
+        return lambda: cross_sectional_dispersion(r)
+
+    def correlations():
+        from cross_sectional import rolling_correlation_matrices
+
+        r = returns(size["corr_symbols"], size["corr_days"], 13)
+        path = os.path.join(tempfile.gettempdir(), "bench_rolling_correlations.npy")
+        return lambda: rolling_correlation_matrices(r, 60, path)
+
+    return {
+        "spx.spread_metrics": spread,
+        "cross_sectional.rolling_beta": beta,
+        "cross_sectional.dispersion": dispersion,
+        "cross_sectional.rolling_correlations": correlations,
+    }
+
+
+if __name__ == "__main__":
+    run_group(cases)
@@ -0,0 +1,111 @@
+"""
+Benchmarks for stock_visualizer: indicators, backtests, resampling, the screener, streaming and charting.
+"""
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from harness import add_project_path, run_group
+from synthetic import generate_ohlcv, generate_universe
+
+add_project_path("stock_visualizer")
+
+SIZES = {
+    "quick": {"bars": 100_000, "sweep_symbols": 20, "sweep_bars": 1_000, "chart_bars": 1_000,
+              "screener_symbols": 1_000, "stream_bars": 20_000},
+    "full": {"bars": 10_000_000, "sweep_symbols": 1_000, "sweep_bars": 2_520, "chart_bars": 5_000,
+             "screener_symbols": 10_000, "stream_bars": 1_000_000},
+}
+
+
+def cases(scale):
+    size = SIZES[scale]
+
+    def indicator(cls, **params):
+        def setup():
+            df = generate_ohlcv(size["bars"], seed=1)
+            return lambda: cls(df, **params).calculate()
+
+        return setup
+
+    def backtest():
+        from backtest import run_backtest
+
+        df = generate_ohlcv(size["bars"], seed=2)
+        return lambda: run_backtest(df, 20, 50, cost_bps=5, slippage_bps=2)
+
+    def sweep():
+        from backtest import parameter_sweep
+
+        prices = generate_universe(size["sweep_symbols"], size["sweep_bars"], seed=3)
+        return lambda: parameter_sweep(prices, range(5, 55, 5), range(20, 220, 20), cost_bps=5)
+
+    def pyramid():
+        from data.resample import OHLCPyramid
+
+        df = generate_ohlcv(size["bars"], seed=4)
+        return lambda: OHLCPyramid(df)
+
+    def screener(step):
+        def setup():
+            from screener import Screener
+
+            prices = generate_universe(size["screener_symbols"], 300, seed=6)
+            screener = Screener(capacity=size["screener_symbols"])
+            for symbol in prices.columns:
+                screener.load(symbol, prices[[symbol]].rename(columns={symbol: "Close"}))
+            if step == "query":
+                return lambda: screener.query("rsi < 30 and crossed_above(macd_hist, 0)")
+            # One new bar for every symbol, vectorized across the universe
+            next_day = prices.index[-1] + pd.Timedelta(days=1)
+            symbols = list(prices.columns)
+            close = prices.iloc[-1].to_numpy() * np.random.default_rng(7).uniform(0.97, 1.03, len(symbols))
+            return lambda: screener.update(symbols, [next_day] * len(symbols), close)
+
+        return setup
+
+    def stream():
+        from indicators import MovingAverage, MACD, RSI
+        from stream import ReplaySource, StreamingChart, StreamRunner
+
+        df = generate_ohlcv(1_000 + size["stream_bars"], seed=8)
+        history, live = df.iloc[:1_000], df.iloc[1_000:]
+        replay = ReplaySource(live)
+
+        def run():
+            indicators = [cls(history) for cls in (MovingAverage, MACD, RSI)]
+            for indicator in indicators:
+                indicator.calculate()
+            chart = StreamingChart(indicators, last_timestamp=history.index[-1])
+            StreamRunner(replay, chart, lambda updates: None).start().join()
+
+        return run
+
+    def chart():
+        from app import plot_stock
+
+        df = generate_ohlcv(size["chart_bars"], seed=5)
+        return lambda: plot_stock(df, "candlestick", "SYN").to_json()
+
+    from indicators import MovingAverage, MACD, RSI
+
+    return {
+        "indicators.moving_average": indicator(MovingAverage),
+        "indicators.macd": indicator(MACD),
+        "indicators.rsi": indicator(RSI),
+        "backtest.run_backtest": backtest,
+        "backtest.parameter_sweep": sweep,
+        "resample.build_pyramid": pyramid,
+        "screener.update_all_symbols": screener("update"),
+        "screener.query": screener("query"),
+        "stream.replay_with_indicators": stream,
+        "app.plot_stock_to_json": chart,
+    }
+
+
+if __name__ == "__main__":
+    # Keep Streamlit's cache files and the metadata cache out of the repo
+    os.chdir(tempfile.gettempdir())
+    run_group(cases)
@@ -0,0 +1,68 @@
+"""
+Timing and peak-memory measurement shared by the benchmark groups.
+
+Each group module defines `cases(scale)` returning {name: setup}, where
+setup() prepares inputs and returns the zero-argument callable to measure.
+Running a group module prints its results as one JSON object.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def add_project_path(project):
+    """
+    Make a project's flat modules importable (the apps are run from their own folder).
+    """
+    path = os.path.join(ROOT, project)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+    return path
+
+
+def measure(setup, repeats=3):
+    """
+    Best wall time over `repeats` runs plus the peak memory of one traced run.
+
+    Timing and memory tracing are done in separate runs, since tracemalloc
+    slows allocation-heavy code down.
+    """
+    func = setup()
+    func()  # warm-up: imports, caches, JIT compilation
+    times = []
+    for _ in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": min(times), "peak_bytes": peak}
+
+
+def run_group(cases):
+    """
+    Command-line entry point for a group module.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", choices=["quick", "full"], default="quick")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this")
+    args = parser.parse_args()
+
+    results = {}
+    for name, setup in cases(args.scale).items():
+        if args.filter in name:
+            results[name] = measure(setup, args.repeats)
+            print(f"{name}: {results[name]['seconds']:.4f}s", file=sys.stderr)
+    print(json.dumps(results))
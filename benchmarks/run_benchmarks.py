@@ -0,0 +1,135 @@
+"""
+Run the benchmark groups, save JSON baselines and flag regressions.
+
+    python run_benchmarks.py --scale quick --save baselines/quick.json
+    python run_benchmarks.py --scale quick --compare baselines/quick.json --threshold 0.25
+
+Each group runs in its own interpreter, so the projects' flat modules
+(e.g. the two `kernels` modules) never collide and memory peaks do not
+leak between groups. The run exits with status 1 when a group fails, and a
+comparison does when any baseline case is slower, uses more memory than
+the baseline by more than the threshold, or did not run at all.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GROUPS = ["stock_visualizer", "loan_calculator", "hangman", "spx_analysis"]
+
+# Differences below these are treated as noise whatever the ratio
+MIN_SECONDS_DELTA = 0.001
+MIN_BYTES_DELTA = 1_000_000
+
+
+def run_groups(groups, scale, repeats, name_filter):
+    """
+    Return the results of all cases and the list of groups that failed.
+    """
+    results = {}
+    failed = []
+    for group in groups:
+        command = [
+            sys.executable,
+            os.path.join(HERE, f"bench_{group}.py"),
+            "--scale", scale,
+            "--repeats", str(repeats),
+            "--filter", name_filter,
+        ]
+        completed = subprocess.run(command, cwd=HERE, capture_output=True, text=True)
+        if completed.returncode != 0:
+            print(f"Group {group} failed:\n{completed.stderr}", file=sys.stderr)
+            failed.append(group)
+            continue
+        for name, result in json.loads(completed.stdout.strip().splitlines()[-1]).items():
+            results[name] = dict(result, group=group)
+    return results, failed
+
+
+def compare(results, baseline, threshold, groups=GROUPS, name_filter=""):
+    """
+    Return a list of regression messages (empty when everything is within threshold).
+
+    A baseline case that was selected for this run (by group and filter) but
+    has no result counts as a regression: its group crashed or it was removed.
+    """
+    regressions = []
+    for name, previous in sorted(baseline.items()):
+        # Baselines saved before cases recorded their group match any group
+        if name not in results and previous.get("group", groups[0]) in groups and name_filter in name:
+            print(f"{name:<40} missing")
+            regressions.append(f"{name}: in the baseline but did not run")
+
+    for name, current in sorted(results.items()):
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"{name:<40} new case")
+            continue
+        time_ratio = current["seconds"] / previous["seconds"] if previous["seconds"] else 1.0
+        memory_ratio = current["peak_bytes"] / previous["peak_bytes"] if previous["peak_bytes"] else 1.0
+        print(f"{name:<40} time x{time_ratio:.2f}  memory x{memory_ratio:.2f}")
+
+        if time_ratio > 1 + threshold and current["seconds"] - previous["seconds"] > MIN_SECONDS_DELTA:
+            regressions.append(f"{name}: {previous['seconds']:.4f}s -> {current['seconds']:.4f}s")
+        if memory_ratio > 1 + threshold and current["peak_bytes"] - previous["peak_bytes"] > MIN_BYTES_DELTA:
+            regressions.append(
+                f"{name}: peak {previous['peak_bytes'] / 1e6:.1f}MB -> {current['peak_bytes'] / 1e6:.1f}MB"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite with JSON baselines")
+    parser.add_argument("--scale", choices=["quick", "full"], default="quick")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--groups", nargs="+", choices=GROUPS, default=GROUPS)
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this")
+    parser.add_argument("--save", help="Write the results to this JSON baseline")
+    parser.add_argument("--compare", help="Compare against this JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative slowdown")
+    args = parser.parse_args()
+
+    results, failed = run_groups(args.groups, args.scale, args.repeats, args.filter)
+
+    if args.save and failed:
+        print(f"Not saving a partial baseline to {args.save}", file=sys.stderr)
+    elif args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w") as file:
+            json.dump(
+                {
+                    "meta": {
+                        "scale": args.scale,
+                        "python": platform.python_version(),
+                        "machine": platform.platform(),
+                        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+                    },
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
+        print(f"Saved {len(results)} results to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        if baseline["meta"]["scale"] != args.scale:
+            sys.exit(f"Baseline was recorded at scale {baseline['meta']['scale']!r}")
+        regressions = compare(results, baseline["results"], args.threshold, args.groups, args.filter)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        if not failed:
+            print("\nNo regressions")
+
+    if failed:
+        sys.exit(f"Failed groups: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
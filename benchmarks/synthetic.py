@@ -0,0 +1,168 @@
+"""
+Seeded synthetic market data for offline benchmarks.
+
+Prices follow a geometric Brownian motion with occasional overnight gaps;
+volume is lognormal and rises with the size of the move. Daily bars skip
+US federal holidays, and single bars (missing data) and runs of bars
+(trading halts) are left out at random, so calendars, missing-day checks
+and rangebreaks see realistic holes.
+"""
+import numpy as np
+import pandas as pd
+from pandas.tseries.holiday import USFederalHolidayCalendar
+
+TRADING_DAYS = 252
+
+
+def _ohlcv_arrays(n_bars, rng, start_price, mu, sigma, gap_prob, gap_sigma, base_volume):
+    dt = 1.0 / TRADING_DAYS
+    log_returns = rng.normal((mu - 0.5 * sigma**2) * dt, sigma * np.sqrt(dt), n_bars)
+    gaps = np.where(rng.random(n_bars) < gap_prob, rng.normal(0.0, gap_sigma, n_bars), 0.0)
+
+    close = start_price * np.exp(np.cumsum(log_returns + gaps))
+    prev_close = np.concatenate([[start_price], close[:-1]])
+    open_ = prev_close * np.exp(gaps)
+
+    intraday = np.abs(rng.normal(0.0, sigma * np.sqrt(dt), (2, n_bars)))
+    high = np.maximum(open_, close) * np.exp(intraday[0])
+    low = np.minimum(open_, close) * np.exp(-intraday[1])
+
+    move = np.abs(log_returns + gaps) / (sigma * np.sqrt(dt))
+    volume = base_volume * (1 + move) * rng.lognormal(0.0, 0.3, n_bars)
+    return open_, high, low, close, volume.astype(np.int64)
+
+
+def _missing_bars(n_bars, rng, missing_prob, halt_prob, halt_bars):
+    """
+    Mask of absent bars: single missing bars plus halts of halt_bars[0]..halt_bars[1] bars.
+
+    The first bar is always present.
+    """
+    missing = rng.random(n_bars) < missing_prob
+    starts = np.flatnonzero(rng.random(n_bars) < halt_prob)
+    ends = np.minimum(starts + rng.integers(halt_bars[0], halt_bars[1] + 1, len(starts)), n_bars)
+    # +1 where a halt starts, -1 where it ends: bars with a positive running sum are halted
+    edges = np.zeros(n_bars + 1, dtype=np.int64)
+    np.add.at(edges, starts, 1)
+    np.add.at(edges, ends, -1)
+    missing |= np.cumsum(edges[:-1]) > 0
+    missing[0] = False
+    return missing
+
+
+def _bar_index(start, periods, freq, holidays):
+    """
+    Timestamps of `periods` bars; "B" is built with array arithmetic, which
+    stays fast for millions of bars where pandas' business-day offsets do not.
+    """
+    if freq != "B":
+        return pd.date_range(start, periods=periods, freq=freq, name="Date")
+    # Enough calendar days for the weekdays plus about ten holidays a year
+    first = np.datetime64(pd.Timestamp(start).date(), "D")
+    days = first + np.arange(periods * 3 // 2 + 14)
+    # 1970-01-01 was a Thursday: Monday is 0 after shifting by 3
+    days = days[(days.astype(np.int64) + 3) % 7 < 5]
+    if holidays:
+        calendar = USFederalHolidayCalendar()
+        # The calendar has no holidays after its end date (2200)
+        end = min(pd.Timestamp(days[-1]), calendar.end_date)
+        dates = calendar.holidays(pd.Timestamp(days[0]), end) if end >= pd.Timestamp(days[0]) else []
+        days = days[~np.isin(days, np.asarray(dates, dtype="datetime64[D]"))]
+    return pd.DatetimeIndex(days[:periods].astype("datetime64[us]"), name="Date")
+
+
+def generate_ohlcv(
+    n_bars,
+    seed=0,
+    start="2000-01-03",
+    freq="B",
+    start_price=100.0,
+    mu=0.07,
+    sigma=0.25,
+    gap_prob=0.02,
+    gap_sigma=0.03,
+    base_volume=1_000_000,
+    holidays=True,
+    missing_prob=0.005,
+    halt_prob=0.001,
+    halt_bars=(2, 10),
+):
+    """
+    Generate one synthetic OHLCV frame.
+
+    Parameters:
+    - n_bars (int): Number of bars.
+    - seed (int or numpy.random.SeedSequence): Seed for reproducible output.
+    - start (str): First timestamp.
+    - freq (str): Bar frequency for the index ("B" daily, "min" for intraday).
+    - start_price (float): Price before the first bar.
+    - mu, sigma (float): Annualized drift and volatility of the GBM.
+    - gap_prob (float): Probability of an overnight gap on each bar.
+    - gap_sigma (float): Standard deviation of the gap log-return.
+    - base_volume (int): Typical volume on a quiet bar.
+    - holidays (bool): Skip US federal holidays in a "B" index.
+    - missing_prob (float): Probability that a single bar is missing.
+    - halt_prob (float): Probability that a trading halt starts on a bar.
+    - halt_bars (tuple): Shortest and longest halt, in bars. Prices keep
+      moving during a halt, so trading resumes with a gap.
+
+    Returns:
+    pandas.DataFrame: Open, High, Low, Close, Volume indexed by timestamp,
+    `n_bars` slots of which the missing and halted bars are left out.
+    """
+    rng = np.random.default_rng(seed)
+    open_, high, low, close, volume = _ohlcv_arrays(
+        n_bars, rng, start_price, mu, sigma, gap_prob, gap_sigma, base_volume
+    )
+    missing = _missing_bars(n_bars, rng, missing_prob, halt_prob, halt_bars)
+    df = pd.DataFrame(
+        {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume},
+        index=_bar_index(start, n_bars, freq, holidays),
+    )
+    return df[~missing]
+
+
+def generate_universe(
+    n_symbols,
+    n_bars,
+    seed=0,
+    start="2000-01-03",
+    mu=0.07,
+    sigma=0.25,
+    gap_prob=0.02,
+    gap_sigma=0.03,
+    base_volume=1_000_000,
+    holidays=True,
+    missing_prob=0.005,
+    halt_prob=0.001,
+    halt_bars=(2, 10),
+):
+    """
+    Generate closing prices for many symbols with independent, reproducible streams.
+
+    Each symbol gets its own child of SeedSequence(seed), so symbol k is the
+    same whatever the size of the universe. The index skips US federal
+    holidays (unless holidays=False); a symbol's missing and halted bars
+    are NaN. The bars are daily and each symbol starts between 10 and 500.
+
+    Parameters:
+    - n_symbols (int): Number of symbols.
+    - n_bars (int): Number of bars per symbol.
+    - seed, start, mu, sigma, gap_prob, gap_sigma, base_volume, holidays,
+      missing_prob, halt_prob, halt_bars: As in generate_ohlcv.
+
+    Returns:
+    pandas.DataFrame: Close prices, one column per symbol (SYM0000, SYM0001, ...).
+    """
+    streams = np.random.SeedSequence(seed).spawn(n_symbols)
+    index = _bar_index(start, n_bars, "B", holidays)
+    closes = np.empty((n_bars, n_symbols))
+    for i, stream in enumerate(streams):
+        rng = np.random.default_rng(stream)
+        start_price = rng.uniform(10, 500)
+        closes[:, i] = _ohlcv_arrays(
+            n_bars, rng, start_price, mu, sigma, gap_prob, gap_sigma, base_volume
+        )[3]
+        missing = _missing_bars(n_bars, rng, missing_prob, halt_prob, halt_bars)
+        closes[missing, i] = np.nan
+    return pd.DataFrame(closes, index=index, columns=[f"SYM{i:04d}" for i in range(n_symbols)])
@@ -0,0 +1,428 @@
+import math
+
+import numpy as np
+
+# Shape type codes stored in ShapeCollection.kinds
+RECTANGLE, SQUARE, CIRCLE = 0, 1, 2
+TYPE_NAMES = ("Rectangle", "Square", "Circle")
+TYPE_CODES = {name: code for code, name in enumerate(TYPE_NAMES)}
+
+DEFAULT_COLOR = 'Blue'
+DEFAULT_PALETTE = ('Blue', 'Red', 'Black', 'Purple', 'Brown', 'Green', 'Orange')
+
+
+def shape_area(kinds, width, height):
+    """
+    Area of shapes given as arrays (or scalars) of type codes and dimensions.
+    """
+    return np.where(kinds == CIRCLE, math.pi * width**2, width * height)
+
+
+def shape_perimeter(kinds, width, height):
+    """
+    Perimeter of shapes given as arrays (or scalars) of type codes and dimensions.
+    """
+    return np.where(kinds == CIRCLE, 2 * math.pi * width, 2 * (width + height))
+
+
+class ShapeCollection:
+    """
+    Rectangles, squares and circles stored as parallel NumPy arrays.
+
+    One row per shape: `kinds` holds the type code, `width` and `height`
+    the dimensions (the side twice for squares, the radius twice for
+    circles), and `color_index` an index into `palette`. Areas, perimeters,
+    filters and sorts are whole-array operations, so millions of shapes cost
+    a few array passes instead of a Python call per shape.
+
+    Indexing with an int gives a Rectangle, Square or Circle view of that
+    row; slices, boolean masks and index arrays give a new collection that
+    owns copies of the rows, so changing one never changes the other.
+    """
+
+    def __init__(self, kinds, width, height, color_index, palette=DEFAULT_PALETTE):
+        self.kinds = np.asarray(kinds, dtype=np.uint8)
+        self.width = np.asarray(width, dtype=np.float64)
+        self.height = np.asarray(height, dtype=np.float64)
+        self.color_index = np.asarray(color_index, dtype=np.uint16)
+        self.palette = list(palette)
+        self._color_codes = {color: i for i, color in enumerate(self.palette)}
+
+    @classmethod
+    def from_arrays(cls, kinds, width, height=None, colors=DEFAULT_COLOR):
+        """
+        Build a collection from per-shape arrays.
+
+        Parameters:
+        - kinds (array-like): Type codes (RECTANGLE, SQUARE, CIRCLE) or type names.
+        - width (array-like): Width, side length or radius of each shape.
+        - height (array-like, optional): Height of the rectangles; ignored for squares and circles.
+        - colors (str or array-like): One color for all shapes, or one per shape.
+
+        Returns:
+        ShapeCollection: The shapes, with a palette of the distinct colors.
+        """
+        kinds = np.asarray(kinds)
+        if kinds.dtype.kind in 'US':
+            kinds = np.array([TYPE_CODES[name] for name in kinds], dtype=np.uint8)
+        kinds = kinds.astype(np.uint8)
+        width = np.broadcast_to(np.asarray(width, dtype=np.float64), kinds.shape)
+        height = width if height is None else np.broadcast_to(np.asarray(height, dtype=np.float64), kinds.shape)
+        # Squares and circles have one dimension, kept in both columns
+        height = np.where(kinds == RECTANGLE, height, width)
+
+        if isinstance(colors, str):
+            palette, color_index = [colors], np.zeros(kinds.shape, dtype=np.uint16)
+        else:
+            palette, color_index = np.unique(np.asarray(colors), return_inverse=True)
+            palette = palette.tolist()
+        return cls(kinds, width.copy(), height, color_index, palette)
+
+    @classmethod
+    def random(cls, n, seed=None, max_size=10.0, palette=DEFAULT_PALETTE):
+        """
+        Random shapes for demos and benchmarks, reproducible from a seed.
+
+        Parameters:
+        - n (int): Number of shapes.
+        - seed (int, optional): Seed of the NumPy Generator.
+        - max_size (float): Upper bound of widths, heights and radii.
+        - palette (sequence of str): Colors to draw from.
+
+        Returns:
+        ShapeCollection: n shapes of uniformly random type, size and color.
+        """
+        rng = np.random.default_rng(seed)
+        kinds = rng.integers(0, len(TYPE_NAMES), n, dtype=np.uint8)
+        width = rng.uniform(0.1, max_size, n)
+        height = np.where(kinds == RECTANGLE, rng.uniform(0.1, max_size, n), width)
+        color_index = rng.integers(0, len(palette), n, dtype=np.uint16)
+        return cls(kinds, width, height, color_index, palette)
+
+    @classmethod
+    def from_shapes(cls, shapes):
+        """
+        Gather individual Rectangle, Square and Circle objects into one collection.
+        """
+        shapes = list(shapes)
+        return cls.from_arrays(
+            [shape.kind for shape in shapes],
+            [shape.collection.width[shape.index] for shape in shapes],
+            [shape.collection.height[shape.index] for shape in shapes],
+            [shape.color for shape in shapes],
+        )
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            index = range(len(self))[key]
+            return VIEW_CLASSES[self.kinds[index]]._view(self, index)
+        # Slices are views into this collection's arrays: copy them, as the
+        # palette is copied, so neither collection sees the other's edits
+        return ShapeCollection(
+            self.kinds[key].copy(),
+            self.width[key].copy(),
+            self.height[key].copy(),
+            self.color_index[key].copy(),
+            self.palette,
+        )
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __repr__(self):
+        counts = ", ".join(f"{count} {name}" for name, count in self.counts().items())
+        return f"ShapeCollection({len(self)} shapes: {counts})"
+
+    @property
+    def nbytes(self):
+        return self.kinds.nbytes + self.width.nbytes + self.height.nbytes + self.color_index.nbytes
+
+    @property
+    def colors(self):
+        """
+        Color name of every shape.
+        """
+        return np.asarray(self.palette, dtype=object)[self.color_index]
+
+    def color_code(self, color):
+        """
+        Palette index of a color, added to the palette if new.
+        """
+        if color not in self._color_codes:
+            self._color_codes[color] = len(self.palette)
+            self.palette.append(color)
+        return self._color_codes[color]
+
+    def area(self):
+        """
+        Calculate the area of every shape.
+
+        Returns:
+        numpy.ndarray: Areas, in the collection's order.
+        """
+        return shape_area(self.kinds, self.width, self.height)
+
+    def perimeter(self):
+        """
+        Calculate the perimeter of every shape.
+
+        Returns:
+        numpy.ndarray: Perimeters, in the collection's order.
+        """
+        return shape_perimeter(self.kinds, self.width, self.height)
+
+    def counts(self):
+        """
+        Number of shapes of each type, by type name.
+        """
+        counts = np.bincount(self.kinds, minlength=len(TYPE_NAMES))
+        return dict(zip(TYPE_NAMES, counts.tolist()))
+
+    def mask(self, kind=None, color=None, min_area=None, max_area=None, min_perimeter=None, max_perimeter=None):
+        """
+        Boolean mask of the shapes matching every given condition.
+
+        Parameters:
+        - kind (str or int, optional): Type name or code; ValueError if unknown.
+        - color (str, optional): Color name.
+        - min_area, max_area (float, optional): Inclusive area bounds.
+        - min_perimeter, max_perimeter (float, optional): Inclusive perimeter bounds.
+
+        Returns:
+        numpy.ndarray: One bool per shape.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if kind is not None:
+            code = TYPE_CODES.get(kind, kind)
+            if code not in range(len(TYPE_NAMES)):
+                raise ValueError(f"Unknown shape kind {kind!r}; use one of {list(TYPE_NAMES)}")
+            mask &= self.kinds == code
+        if color is not None:
+            code = self._color_codes.get(color)
+            mask &= False if code is None else self.color_index == code
+        if min_area is not None or max_area is not None:
+            area = self.area()
+            if min_area is not None:
+                mask &= area >= min_area
+            if max_area is not None:
+                mask &= area <= max_area
+        if min_perimeter is not None or max_perimeter is not None:
+            perimeter = self.perimeter()
+            if min_perimeter is not None:
+                mask &= perimeter >= min_perimeter
+            if max_perimeter is not None:
+                mask &= perimeter <= max_perimeter
+        return mask
+
+    def filter(self, **conditions):
+        """
+        New collection of the shapes matching the conditions of `mask`.
+        """
+        return self[self.mask(**conditions)]
+
+    def sort(self, by='area', descending=False):
+        """
+        New collection sorted by 'area', 'perimeter', 'width', 'height', 'kind' or 'color'.
+        """
+        keys = {
+            'area': self.area,
+            'perimeter': self.perimeter,
+            'width': lambda: self.width,
+            'height': lambda: self.height,
+            'kind': lambda: self.kinds,
+            'color': lambda: self.color_index,
+        }
+        if by not in keys:
+            raise ValueError(f"Cannot sort by {by!r}; use one of {sorted(keys)}")
+        order = np.argsort(keys[by](), kind='stable')
+        return self[order[::-1] if descending else order]
+
+    def layout(self, columns=None, padding=1.0):
+        """
+        Grid positions that draw every shape in its own cell.
+
+        Returns:
+        tuple of numpy.ndarray: x and y of each shape's lower-left corner
+        (its center for circles), as the notebook draws them.
+        """
+        n = len(self)
+        columns = columns or max(1, math.ceil(math.sqrt(n)))
+        extent = np.where(self.kinds == CIRCLE, 2 * self.width, np.maximum(self.width, self.height))
+        cell = (extent.max() if n else 0.0) + padding
+        x = (np.arange(n) % columns) * cell
+        y = -(np.arange(n) // columns) * cell
+        circles = self.kinds == CIRCLE
+        return np.where(circles, x + self.width, x), np.where(circles, y + self.width, y)
+
+    def draw(self, ax=None, x=None, y=None, title=None):
+        """
+        Draw all shapes at once: one PolyCollection for the rectangles and
+        squares and one EllipseCollection for the circles, both built
+        straight from the arrays, so no Python object is created per shape.
+
+        Parameters:
+        - ax (matplotlib.axes.Axes, optional): Axes to draw on; a new figure by default.
+        - x, y (array-like, optional): Positions as returned by `layout`; the grid layout by default.
+        - title (str, optional): Axes title.
+
+        Returns:
+        matplotlib.axes.Axes: The axes drawn on.
+        """
+        # Imported here: the array operations do not need matplotlib
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import EllipseCollection, PolyCollection
+        from matplotlib.colors import to_rgba_array
+
+        if ax is None:
+            _, ax = plt.subplots()
+        if x is None or y is None:
+            x, y = self.layout()
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        facecolors = to_rgba_array(self.palette)[self.color_index]
+
+        boxes = self.kinds != CIRCLE
+        if boxes.any():
+            x0, y0 = x[boxes], y[boxes]
+            x1, y1 = x0 + self.width[boxes], y0 + self.height[boxes]
+            vertices = np.stack(
+                [np.column_stack(corner) for corner in ((x0, y0), (x1, y0), (x1, y1), (x0, y1))], axis=1
+            )
+            ax.add_collection(PolyCollection(vertices, facecolors=facecolors[boxes], edgecolors='none'))
+
+        circles = ~boxes
+        if circles.any():
+            diameters = 2 * self.width[circles]
+            ax.add_collection(EllipseCollection(
+                diameters, diameters, np.zeros(circles.sum()), units='xy',
+                offsets=np.column_stack([x[circles], y[circles]]), offset_transform=ax.transData,
+                facecolors=facecolors[circles], edgecolors='none',
+            ))
+
+        if len(self):
+            left = np.where(circles, x - self.width, x)
+            bottom = np.where(circles, y - self.width, y)
+            right = np.where(circles, x + self.width, x + self.width)
+            top = np.where(circles, y + self.width, y + self.height)
+            ax.set_xlim(left.min() - 1, right.max() + 1)
+            ax.set_ylim(bottom.min() - 1, top.max() + 1)
+        ax.set_aspect('equal', 'box')
+        if title:
+            ax.set_title(title)
+        return ax
+
+
+class Shape:
+    """
+    One shape, stored as a row of a ShapeCollection.
+
+    Constructing a shape directly creates a one-row collection for it;
+    shapes taken from a collection read and write that collection's arrays.
+    """
+    kind = None
+
+    def __init__(self, color=DEFAULT_COLOR, width=0.0, height=0.0):
+        collection = ShapeCollection([self.kind], [width], [height], [0], [color])
+        self.collection = collection
+        self.index = 0
+
+    @classmethod
+    def _view(cls, collection, index):
+        shape = cls.__new__(cls)
+        shape.collection = collection
+        shape.index = index
+        return shape
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.color}, area={self.area():.2f})"
+
+    @property
+    def color(self):
+        return self.collection.palette[self.collection.color_index[self.index]]
+
+    @color.setter
+    def color(self, color):
+        self.collection.color_index[self.index] = self.collection.color_code(color)
+
+    def get_color(self):
+        return self.color
+
+    def _dimensions(self):
+        c, i = self.collection, self.index
+        return c.kinds[i], c.width[i], c.height[i]
+
+    def area(self):
+        return float(shape_area(*self._dimensions()))
+
+    def perimeter(self):
+        return float(shape_perimeter(*self._dimensions()))
+
+    def draw(self):
+        import matplotlib.pyplot as plt
+
+        row = self.collection[self.index:self.index + 1]
+        # At the origin like the notebook: lower-left corner, or center for circles
+        row.draw(x=[0.0], y=[0.0], title=type(self).__name__)
+        plt.show()
+
+
+class Rectangle(Shape):
+    kind = RECTANGLE
+
+    def __init__(self, width, height):
+        super().__init__(width=width, height=height)
+
+    @property
+    def width(self):
+        return float(self.collection.width[self.index])
+
+    @width.setter
+    def width(self, value):
+        self.collection.width[self.index] = value
+        if self.kind == SQUARE:
+            self.collection.height[self.index] = value
+
+    @property
+    def height(self):
+        return float(self.collection.height[self.index])
+
+    @height.setter
+    def height(self, value):
+        self.collection.height[self.index] = value
+        if self.kind == SQUARE:
+            self.collection.width[self.index] = value
+
+
+class Square(Rectangle):
+    kind = SQUARE
+
+    def __init__(self, side_length):
+        # Since a square is a special case of a rectangle, we can reuse the Rectangle's __init__ method
+        super().__init__(width=side_length, height=side_length)
+
+    @property
+    def side_length(self):
+        return self.width
+
+
+class Circle(Shape):
+    kind = CIRCLE
+
+    def __init__(self, radius):
+        super().__init__(width=radius, height=radius)
+
+    @property
+    def radius(self):
+        return float(self.collection.width[self.index])
+
+    @radius.setter
+    def radius(self, value):
+        self.collection.width[self.index] = value
+        self.collection.height[self.index] = value
+
+
+VIEW_CLASSES = {RECTANGLE: Rectangle, SQUARE: Square, CIRCLE: Circle}
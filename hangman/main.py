@@ -1,9 +1,13 @@
 import streamlit as st
 import random
+import string
 import time
+import atexit
 import logging
 from typing import List, Set, Dict
 from dataclasses import dataclass, field
+from word_index import WordIndex
+from stats_store import StatsStore
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -18,6 +22,8 @@ class GameConfig:
         'medium': (6, 7),
         'hard': (8, 30)
     }
+    STATS_DB = 'stats.db'
+    LEADERBOARD_SIZE = 10
 
 @dataclass
 class GameState:
@@ -30,6 +36,7 @@ class GameState:
     message_type: str = "info"
     guessing_board: List[str] = field(default_factory=list)
     last_guess_time: float = 0.0
+    auto_solved: bool = False
 
 # Hangman ASCII art
 HANGMAN_IMAGES = [
@@ -84,6 +91,23 @@ HANGMAN_IMAGES = [
 -------"""
 ]
 
+# Markup that only depends on a handful of states, built once at import
+GALLOWS_HTML = [
+    f'<div class="hangman-ascii">{image}</div>' for image in HANGMAN_IMAGES
+]
+LIVES_HTML = [
+    f'<div class="lives-remaining">Lives remaining: {GameConfig.MAX_LIVES - attempts}</div>'
+    for attempts in range(GameConfig.MAX_LIVES + 1)
+]
+BADGE_HTML = {
+    (letter, correct): (
+        f'<span class="letter-badge '
+        f'{"letter-badge-correct" if correct else "letter-badge-incorrect"}">{letter}</span>'
+    )
+    for letter in string.ascii_lowercase
+    for correct in (True, False)
+}
+
 @st.cache_data
 def load_word_bank() -> List[str]:
     """Load and cache the word bank."""
@@ -94,6 +118,18 @@ def load_word_bank() -> List[str]:
         logger.error("Word bank file not found!")
         return ["hangman"]  # Default fallback
 
+@st.cache_resource
+def load_word_index() -> WordIndex:
+    """Build the bitset index over the word bank once per process."""
+    return WordIndex.build(load_word_bank())
+
+@st.cache_resource
+def get_stats_store() -> StatsStore:
+    """Open the persistent stats store once per process."""
+    store = StatsStore(GameConfig.STATS_DB, top_n=GameConfig.LEADERBOARD_SIZE)
+    atexit.register(store.close)
+    return store
+
 def get_random_word(difficulty: str) -> str:
     """Get a random word based on difficulty level."""
     word_list = load_word_bank()
@@ -104,97 +140,29 @@ def get_random_word(difficulty: str) -> str:
     ]
     return random.choice(filtered_words) if filtered_words else random.choice(word_list)
 
+@st.cache_resource
+def load_css_block() -> str:
+    """Read the stylesheet once per process and wrap it in a style block."""
+    try:
+        with open('assets/style.css', 'r') as file:
+            return f"<style>\n{file.read()}</style>"
+    except FileNotFoundError:
+        logger.error("Stylesheet not found!")
+        return ""
+
 def load_custom_css() -> None:
-    """Load custom CSS styles."""
-    st.markdown("""
-        <style>
-        .game-title {
-            text-align: center;
-            color: #1E88E5;
-            font-size: 48px;
-            margin-bottom: 30px;
-        }
-        /* Hide Streamlit form hints */
-        .stTextInput + div[data-baseweb="form-control-counter"] {
-            display: none !important;
-        }
-        .st-emotion-cache-16idsys p {
-            display: none;
-        }
-        .word-display {
-            font-family: monospace;
-            font-size: 36px;
-            letter-spacing: 5px;
-            margin: 20px 0;
-            text-align: center;
-        }
-        .lives-remaining {
-            font-size: 24px;
-            font-weight: bold;
-            color: #E53935;
-            text-align: center;
-        }
-        .hangman-ascii {
-            font-family: monospace;
-            white-space: pre;
-            font-size: 18px;
-            line-height: 1.2;
-            background-color: #f0f0f0;
-            padding: 20px;
-            border-radius: 10px;
-            margin: 20px auto;
-            text-align: center;
-        }
-        .guessed-letters {
-            font-family: monospace;
-            font-size: 20px;
-            color: #666;
-            letter-spacing: 2px;
-            text-align: center;
-            margin: 20px 0;
-        }
-        .stats-container {
-            background-color: #f8f9fa;
-            padding: 20px;
-            border-radius: 10px;
-            margin: 20px 0;
-            text-align: center;
-        }
-        .letter-badge {
-            display: inline-block;
-            color: white;
-            width: 30px;
-            height: 30px;
-            line-height: 30px;
-            text-align: center;
-            border-radius: 50%;
-            margin: 0 3px;
-        }
-        .letter-badge-correct {
-            background-color: #4CAF50;  /* Green color for correct guesses */
-        }
-        .letter-badge-incorrect {
-            background-color: #F44336;  /* Red color for incorrect guesses */
-        }
-        /* Game message styles */
-        .game-message-error {
-            color: #F44336;  /* Red for errors/incorrect guesses */
-            font-weight: bold;
-        }
-        .game-message-success {
-            color: #4CAF50;  /* Green for correct guesses */
-            font-weight: bold;
-        }
-        .game-message-warning {
-            color: #FFA726;  /* Orange for warnings */
-            font-weight: bold;
-        }
-        .game-message-info {
-            color: #2196F3;  /* Blue for info */
-            font-weight: bold;
-        }
-        </style>
-    """, unsafe_allow_html=True)
+    """Load custom CSS styles (full page runs only, fragments reuse them)."""
+    st.markdown(load_css_block(), unsafe_allow_html=True)
+
+def new_game_stats() -> Dict[str, int]:
+    """Statistics of a player with no games yet."""
+    return {
+        'wins': 0,
+        'losses': 0,
+        'total_games': 0,
+        'best_streak': 0,
+        'current_streak': 0
+    }
 
 def initialize_session_state() -> None:
     """Initialize all session state variables."""
@@ -202,15 +170,14 @@ def initialize_session_state() -> None:
     if 'difficulty' not in st.session_state:
         st.session_state.difficulty = 'medium'
     
+    # Anonymous players' stats are kept for the session only
+    if 'player' not in st.session_state:
+        st.session_state.player = ""
+
     # Initialize game statistics if not present
     if 'game_stats' not in st.session_state:
-        st.session_state.game_stats = {
-            'wins': 0,
-            'losses': 0,
-            'total_games': 0,
-            'best_streak': 0,
-            'current_streak': 0
-        }
+        st.session_state.game_stats = new_game_stats()
+        st.session_state.stats_html = ""
     
     # Initialize game state if not present
     if 'game_state' not in st.session_state or st.session_state.game_state is None:
@@ -233,6 +200,12 @@ def update_game_stats(won: bool) -> None:
         stats['losses'] += 1
         stats['current_streak'] = 0
 
+    st.session_state.stats_html = build_stats_html(stats)
+
+    # Queued for the background writer, the game never waits on disk
+    if st.session_state.player:
+        get_stats_store().record_game(st.session_state.player, won)
+
 def process_guess(guess: str) -> bool:
     """Process the player's guess and update game state."""
     game_state = st.session_state.game_state
@@ -256,8 +229,12 @@ def process_guess(guess: str) -> bool:
         game_state.message_type = "warning"
         return False
 
-    # Update game state
     game_state.last_guess_time = current_time
+    apply_guess(game_state, guess)
+    return True
+
+def apply_guess(game_state: GameState, guess: str) -> None:
+    """Apply a validated guess and check the win/lose conditions."""
     game_state.guessed_letters.add(guess)
 
     if guess in game_state.word:
@@ -272,38 +249,102 @@ def process_guess(guess: str) -> bool:
         game_state.message = f"Incorrect guess! {GameConfig.MAX_LIVES - game_state.incorrect_attempts} lives remaining"
         game_state.message_type = "error"
 
-    # Check win/lose conditions
+    # Check win/lose conditions (games finished by the solver are not recorded)
     if '_' not in game_state.guessing_board:
         game_state.game_over = True
         game_state.game_won = True
-        update_game_stats(True)
     elif game_state.incorrect_attempts >= GameConfig.MAX_LIVES:
         game_state.game_over = True
         game_state.game_won = False
-        update_game_stats(False)
+    if game_state.game_over and not game_state.auto_solved:
+        update_game_stats(game_state.game_won)
 
-    return True
+def show_hint() -> None:
+    """Suggest the letter found in most of the words that still fit the board."""
+    game_state = st.session_state.game_state
+    letter, remaining = load_word_index().best_letter(
+        game_state.guessing_board, game_state.guessed_letters
+    )
+    if letter is None:
+        game_state.message = "No hint available"
+        game_state.message_type = "warning"
+        return
+    words = "word fits" if remaining == 1 else "words fit"
+    game_state.message = f"Hint: try '{letter}' ({remaining} {words} the board)"
+    game_state.message_type = "info"
+
+def auto_solve() -> None:
+    """Let the solver play the best letter until the game ends."""
+    game_state = st.session_state.game_state
+    game_state.auto_solved = True
+    index = load_word_index()
+    while not game_state.game_over:
+        letter, _ = index.best_letter(game_state.guessing_board, game_state.guessed_letters)
+        if letter is None:
+            break
+        apply_guess(game_state, letter)
 
 def get_letter_badge_class(letter: str, word: str) -> str:
     """Return the CSS class for letter badge based on whether the guess was correct."""
     return "letter-badge-correct" if letter in word else "letter-badge-incorrect"
 
+def get_letter_badges_html(guessed_letters: Set[str], word: str) -> str:
+    """Join the prebuilt badges for the guessed letters."""
+    return ''.join(
+        BADGE_HTML.get((letter, letter in word))
+        or f'<span class="letter-badge {get_letter_badge_class(letter, word)}">{letter}</span>'
+        for letter in sorted(guessed_letters)
+    )
+
+def build_stats_html(stats: Dict[str, int]) -> str:
+    """Build the statistics panel markup (only when the stats change)."""
+    total_games = stats['total_games']
+    if total_games == 0:
+        return ""
+    win_rate = (stats['wins'] / total_games) * 100
+    return f"""
+        <div class="stats-container">
+            <div>Games Played: {total_games}</div>
+            <div>Win Rate: {win_rate:.1f}%</div>
+            <div>Best Streak: {stats['best_streak']}</div>
+            <div>Current Streak: {stats['current_streak']}</div>
+        </div>
+        """
+
 def display_game_stats() -> None:
     """Display game statistics."""
-    stats = st.session_state.game_stats
-    total_games = stats['total_games']
-    if total_games > 0:
-        win_rate = (stats['wins'] / total_games) * 100
+    if st.session_state.stats_html:
+        st.markdown(st.session_state.stats_html, unsafe_allow_html=True)
+
+def display_player_selector() -> None:
+    """Player name input; a named player's stats are loaded from the store."""
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        player = st.text_input(
+            "Player name",
+            value=st.session_state.player,
+            placeholder="Enter a name to save your stats",
+            key='player_input'
+        ).strip()
+
+    if player != st.session_state.player:
+        st.session_state.player = player
+        stats = get_stats_store().get_player(player) if player else None
+        st.session_state.game_stats = stats or new_game_stats()
+        st.session_state.stats_html = build_stats_html(st.session_state.game_stats)
+
+def display_leaderboard() -> None:
+    """Display the precomputed top players."""
+    leaderboard = get_stats_store().leaderboard()
+    if not leaderboard:
+        return
+    with st.expander("🏆 Leaderboard"):
+        rows = "\n".join(
+            f"| {rank} | {entry['player']} | {entry['wins']} | {entry['total_games']} | {entry['best_streak']} |"
+            for rank, entry in enumerate(leaderboard, start=1)
+        )
         st.markdown(
-            f"""
-            <div class="stats-container">
-                <div>Games Played: {total_games}</div>
-                <div>Win Rate: {win_rate:.1f}%</div>
-                <div>Best Streak: {stats['best_streak']}</div>
-                <div>Current Streak: {stats['current_streak']}</div>
-            </div>
-            """,
-            unsafe_allow_html=True
+            "| # | Player | Wins | Games | Best Streak |\n|---|---|---|---|---|\n" + rows
         )
 
 def display_difficulty_selector() -> None:
@@ -323,101 +364,121 @@ def display_difficulty_selector() -> None:
             st.session_state.game_state = None  # Clear game state
             st.rerun()
 
-def main() -> None:
-    """Main game function."""
-    try:
-        st.set_page_config(
-            page_title="Hangman Game",
-            page_icon="🎮",
-            layout="wide",
-            initial_sidebar_state="collapsed"
-        )
-        
-        # Initialize all session state variables first
-        initialize_session_state()
-        
-        load_custom_css()
-        
-        st.markdown('<h1 class="game-title">🎮 Hangman Game</h1>', unsafe_allow_html=True)
-        
-        if not st.session_state.game_state.game_over:
-            display_difficulty_selector()
+@st.fragment
+def game_board() -> None:
+    """Board, guessed letters, gallows and guess form.
 
-        # Create two columns for layout
-        left_col, right_col = st.columns([3, 2])
-        
-        with right_col:
-            # Display hangman image
-            st.markdown(
-                f'<div class="hangman-ascii">{HANGMAN_IMAGES[st.session_state.game_state.incorrect_attempts]}</div>',
-                unsafe_allow_html=True
-            )
-            display_game_stats()
-        
-        with left_col:
-            game_state = st.session_state.game_state
-            
+    Runs as a fragment: submitting a guess re-renders only this part of the
+    page. The guess is processed before the board is drawn (into containers
+    laid out above the form), so each guess takes a single run.
+    """
+    game_state = st.session_state.game_state
+
+    # Create two columns for layout
+    left_col, right_col = st.columns([3, 2])
+
+    with left_col:
+        board = st.container()
+
+        if not game_state.game_over:
+            # Game input form
+            with st.form(key='guess_form', clear_on_submit=True):
+                col1, col2, col3 = st.columns([3, 2, 3])
+                with col2:
+                    guess = st.text_input(
+                        "Enter your guess",
+                        max_chars=1,
+                        key="guess_input",
+                        placeholder="Type a letter",
+                        label_visibility="collapsed"
+                    )
+                    submit_button = st.form_submit_button(
+                        "Guess!",
+                        use_container_width=True
+                    )
+
+            hint_col, solve_col = st.columns(2)
+            if hint_col.button("💡 Hint", key="hint", use_container_width=True):
+                show_hint()
+            if solve_col.button("🤖 Solve", key="solve", use_container_width=True):
+                auto_solve()
+            elif submit_button or guess:
+                process_guess(guess)
+
+            if game_state.game_over:
+                # The stats and difficulty selector live outside the fragment
+                st.rerun()
+
+        with board:
             # Display lives remaining
-            st.markdown(
-                f'<div class="lives-remaining">Lives remaining: {GameConfig.MAX_LIVES - game_state.incorrect_attempts}</div>',
-                unsafe_allow_html=True
-            )
-            
+            st.markdown(LIVES_HTML[game_state.incorrect_attempts], unsafe_allow_html=True)
+
             # Display word progress
             st.markdown(
                 f'<div class="word-display">{" ".join(game_state.guessing_board)}</div>',
                 unsafe_allow_html=True
             )
-            
+
             # Display guessed letters
             if game_state.guessed_letters:
-                guessed = sorted(game_state.guessed_letters)
-                letter_badges = ''.join([
-                    f'<span class="letter-badge {get_letter_badge_class(letter, game_state.word)}">{letter}</span>'
-                    for letter in guessed
-                ])
+                letter_badges = get_letter_badges_html(game_state.guessed_letters, game_state.word)
                 st.markdown(
                     f'<div class="guessed-letters">Guessed letters: {letter_badges}</div>',
                     unsafe_allow_html=True
                 )
-            
+
             # Display game messages
             if game_state.message:
                 st.markdown(
                     f'<div class="game-message-{game_state.message_type}">{game_state.message}</div>',
                     unsafe_allow_html=True
                 )
-            
+
             # Game over conditions
             if game_state.game_over:
-                if game_state.game_won:
+                if game_state.auto_solved and game_state.game_won:
+                    st.info(f'🤖 Solved in {len(game_state.guessed_letters)} guesses: {game_state.word}')
+                elif game_state.auto_solved:
+                    st.warning(f'🤖 The solver ran out of lives! The word was: {game_state.word}')
+                elif game_state.game_won:
                     st.success('🎉 Congratulations! You won!')
                 else:
                     st.error(f'💔 Game Over! The word was: {game_state.word}')
-                
+
                 if st.button("Play Again", key="new_game"):
                     st.session_state.game_state = None
                     st.rerun()
-            else:
-                # Game input form
-                with st.form(key='guess_form', clear_on_submit=True):
-                    col1, col2, col3 = st.columns([3, 2, 3])
-                    with col2:
-                        guess = st.text_input(
-                            "Enter your guess",
-                            max_chars=1,
-                            key="guess_input",
-                            placeholder="Type a letter",
-                            label_visibility="collapsed"
-                        )
-                        submit_button = st.form_submit_button(
-                            "Guess!",
-                            use_container_width=True
-                        )
-                    
-                    if submit_button or guess:
-                        if process_guess(guess):
-                            st.rerun()
+
+    with right_col:
+        # Display hangman image
+        st.markdown(GALLOWS_HTML[game_state.incorrect_attempts], unsafe_allow_html=True)
+        display_game_stats()
+
+def main() -> None:
+    """Main game function."""
+    try:
+        st.set_page_config(
+            page_title="Hangman Game",
+            page_icon="🎮",
+            layout="wide",
+            initial_sidebar_state="collapsed"
+        )
+        
+        # Initialize all session state variables first
+        initialize_session_state()
+        
+        load_custom_css()
+        
+        st.markdown('<h1 class="game-title">🎮 Hangman Game</h1>', unsafe_allow_html=True)
+        
+        display_player_selector()
+
+        if not st.session_state.game_state.game_over:
+            display_difficulty_selector()
+
+        game_board()
+
+        display_leaderboard()
 
     except Exception as e:
         logger.error(f"An error occurred: {str(e)}")
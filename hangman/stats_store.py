@@ -0,0 +1,158 @@
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    player TEXT PRIMARY KEY,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    total_games INTEGER NOT NULL DEFAULT 0,
+    best_streak INTEGER NOT NULL DEFAULT 0,
+    current_streak INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS players_rank ON players (wins DESC, best_streak DESC);
+CREATE TABLE IF NOT EXISTS games (
+    player TEXT NOT NULL,
+    won INTEGER NOT NULL,
+    played_at REAL NOT NULL
+);
+"""
+
+# One game result; the streak arithmetic happens in SQL so a batch can hold
+# several games of the same player
+UPSERT = """
+INSERT INTO players (player, wins, losses, total_games, best_streak, current_streak)
+VALUES (:player, :won, 1 - :won, 1, :won, :won)
+ON CONFLICT (player) DO UPDATE SET
+    wins = wins + :won,
+    losses = losses + 1 - :won,
+    total_games = total_games + 1,
+    current_streak = CASE WHEN :won THEN current_streak + 1 ELSE 0 END,
+    best_streak = MAX(best_streak, CASE WHEN :won THEN current_streak + 1 ELSE 0 END)
+"""
+
+STAT_COLUMNS = ['wins', 'losses', 'total_games', 'best_streak', 'current_streak']
+
+
+class StatsStore:
+    """Player statistics and a top-N leaderboard persisted in SQLite (WAL mode).
+
+    record_game only puts the result on an in-memory queue; a background
+    thread writes queued results in batched transactions, so the game never
+    waits on disk. Reads see results once their batch is flushed.
+
+    The leaderboard ranks players by (wins, best streak). Both only ever
+    grow, so a player can only enter the top N through their own update:
+    the list is kept current by checking just the players in each batch,
+    never by sorting all players.
+    """
+
+    def __init__(self, path: str = "stats.db", top_n: int = 10,
+                 flush_interval: float = 0.5, batch_size: int = 500):
+        self.path = path
+        self.top_n = top_n
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._queue: "queue.Queue[Optional[Tuple[str, int, float]]]" = queue.Queue()
+        self._lock = threading.Lock()
+
+        self._reader = self._connect()
+        self._reader.executescript(SCHEMA)
+        self._leaderboard = self._load_leaderboard()
+
+        self._writer = threading.Thread(target=self._run, name="stats-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        # With WAL, NORMAL only risks the last transactions on power loss
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def record_game(self, player: str, won: bool) -> None:
+        """Queue a finished game; returns immediately."""
+        self._queue.put((player, int(won), time.time()))
+
+    def _run(self) -> None:
+        connection = self._connect()
+        running = True
+        while running:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            # Take whatever else is already queued, up to one batch
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                running = False
+                batch = [item for item in batch if item is not None]
+            if batch:
+                try:
+                    self._write_batch(connection, batch)
+                except sqlite3.Error as e:
+                    logger.error(f"Failed to write {len(batch)} game results: {e}")
+        connection.close()
+
+    def _write_batch(self, connection: sqlite3.Connection, batch: List[Tuple[str, int, float]]) -> None:
+        with connection:
+            connection.executemany(
+                UPSERT, [{'player': player, 'won': won} for player, won, _ in batch]
+            )
+            connection.executemany("INSERT INTO games VALUES (?, ?, ?)", batch)
+        players = sorted({player for player, _, _ in batch})
+        placeholders = ",".join("?" * len(players))
+        rows = connection.execute(
+            f"SELECT * FROM players WHERE player IN ({placeholders})", players
+        ).fetchall()
+        self._update_leaderboard([dict(row) for row in rows])
+
+    def _load_leaderboard(self) -> List[Dict]:
+        rows = self._reader.execute(
+            "SELECT * FROM players ORDER BY wins DESC, best_streak DESC LIMIT ?", (self.top_n,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    @staticmethod
+    def _rank_key(entry: Dict) -> Tuple[int, int]:
+        return entry['wins'], entry['best_streak']
+
+    def _update_leaderboard(self, updated: List[Dict]) -> None:
+        with self._lock:
+            board = {entry['player']: entry for entry in self._leaderboard}
+            lowest = min(map(self._rank_key, board.values()), default=(0, 0))
+            for entry in updated:
+                if entry['player'] in board or len(board) < self.top_n or self._rank_key(entry) > lowest:
+                    board[entry['player']] = entry
+            ranked = sorted(board.values(), key=self._rank_key, reverse=True)
+            self._leaderboard = ranked[:self.top_n]
+
+    def leaderboard(self) -> List[Dict]:
+        """Top players by wins, then best streak."""
+        with self._lock:
+            return [dict(entry) for entry in self._leaderboard]
+
+    def get_player(self, player: str) -> Optional[Dict[str, int]]:
+        """Flushed statistics of one player, or None for a new player."""
+        with self._lock:
+            row = self._reader.execute(
+                "SELECT * FROM players WHERE player = ?", (player,)
+            ).fetchone()
+        return {column: row[column] for column in STAT_COLUMNS} if row else None
+
+    def close(self) -> None:
+        """Flush everything queued and stop the writer thread."""
+        self._queue.put(None)
+        self._writer.join()
+        self._reader.close()
@@ -1,14 +1,21 @@
-from dash import Dash, dcc, html
-from dash.dependencies import Input, Output
-from loan_calculator import calculate_loan_metrics
+from functools import lru_cache
+from dash import Dash, dcc, html, no_update
+from dash.dependencies import ClientsideFunction, Input, Output, State
+from flask import request as flask_request
 
-# External CSS stylesheets for additional styling
-external_stylesheets = ['https://codepen.io/chriddyp/pen/bWLwgP.css']
+# The calculation modules and plotly.graph_objects are imported inside the
+# callbacks that use them: nothing of them is needed for the first paint, and
+# on a cold start the first request should only wait for Dash itself.
+# Styles come from assets/style.css, served by this app instead of codepen.
 
-app = Dash(__name__, external_stylesheets=external_stylesheets)
+app = Dash(__name__)
 app.title = 'Loan Calculator'
 server = app.server
 
+# Dash fingerprints asset URLs with ?m=<mtime>, so a fingerprinted asset can be
+# cached for good: a new deploy changes the URL
+ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
 # Define a vibrant color scheme
 colors = {
     'background': '#f4f4f4',
@@ -16,6 +23,12 @@ colors = {
     'accent': '#ff4500'  # Choose a vibrant color for accents
 }
 
+# Submits closer together than this are dropped in the browser
+DEBOUNCE_MS = 500
+
+def result_line(label, value_id):
+    return html.P([f"{label}: ", html.Span(id=value_id)])
+
 def create_layout():
     return html.Div(style={'backgroundColor': colors['background'], 'padding': '20px'}, children=[
         html.H1("Loan Calculator", style={'textAlign': 'center', 'color': colors['text']}),
@@ -42,52 +55,168 @@ def create_layout():
             html.Button("Calculate", id="calculate_button", n_clicks=0, style={'margin-top': '20px', 'background-color': colors['accent'], 'color': colors['background']}),
         ], style={'textAlign': 'center'}),
 
-        html.Div(id="result", style={'margin-top': '30px', 'textAlign': 'center', 'color': colors['text'], 'fontSize': '18px'})
+        # Last EIR request sent to the server, and the client-side debounce window
+        dcc.Store(id="eir_request"),
+        dcc.Store(id="debounce_ms", data=DEBOUNCE_MS),
+        # Sends the last submit that fell inside the debounce window once it closes
+        dcc.Interval(id="eir_trailing", disabled=True),
+
+        # Shown after the first Calculate, then filled in by the browser as the inputs
+        # change; only the EIR comes from the server
+        html.Div(id="result", style={'margin-top': '30px', 'textAlign': 'center', 'color': colors['text'], 'fontSize': '18px', 'display': 'none'}, children=[
+            html.H3("Loan Details", style={'color': colors['accent']}),
+            result_line("Principal Amount", "principal"),
+            result_line("Interest Rate", "rate"),
+            result_line("Loan Tenure", "tenure_text"),
+
+            html.H3("Financial Summary", style={'color': colors['accent']}),
+            result_line("Total Repayment", "total_repayment"),
+            result_line("Total Interest", "total_interest"),
+            result_line("Yearly Interest", "yearly_interest"),
+            result_line("Monthly Interest", "monthly_interest"),
+            result_line("Monthly Installment", "monthly_installment"),
+            html.P(["Effective Interest Rate (EIR): ", html.Span("press Calculate", id="eir"), html.Span(id="eir_note")]),
+        ]),
+
+        html.Div([
+            html.H3("Rate × Tenure Sensitivity", style={'color': colors['accent']}),
+            dcc.RadioItems(
+                id="sensitivity_metric",
+                options=[
+                    {'label': 'Effective Interest Rate', 'value': 'eir'},
+                    {'label': 'Monthly Installment', 'value': 'monthly_installment'},
+                ],
+                value='eir',
+                inline=True,
+            ),
+            dcc.Graph(id="sensitivity"),
+        ], id="sensitivity_section", style={'margin-top': '30px', 'textAlign': 'center', 'display': 'none'})
     ])
 
 app.layout = create_layout()
 
-@app.callback(
-    Output("result", "children"),
-    Input("calculate_button", "n_clicks"),
-    [Input("total_loan", "value"), Input("tenure", "value"), Input("interest_rate", "value")]
+# Closed-form figures: computed in the browser on every change, no server round trip
+app.clientside_callback(
+    ClientsideFunction(namespace="loan", function_name="summary"),
+    [
+        Output("result", "style"),
+        Output("principal", "children"),
+        Output("rate", "children"),
+        Output("tenure_text", "children"),
+        Output("total_repayment", "children"),
+        Output("total_interest", "children"),
+        Output("yearly_interest", "children"),
+        Output("monthly_interest", "children"),
+        Output("monthly_installment", "children"),
+        Output("eir_note", "children"),
+    ],
+    [Input("total_loan", "value"), Input("tenure", "value"), Input("interest_rate", "value"), Input("eir_request", "data")]
 )
-def update_result(n_clicks, total_loan, tenure, interest_rate):
-    if n_clicks > 0:
-        monthly_installment, total_repayment, effective_interest_rate = calculate_loan_metrics(total_loan, tenure, interest_rate)
-
-        # Calculate additional financial details
-        total_interest = total_repayment - total_loan
-        tenure_yr = int(tenure)
-        tenure_mth = int(tenure_yr * 12)
-        yearly_interest = total_interest / tenure_yr
-        monthly_interest = total_interest / (tenure_yr * 12)
-
-        # Format dollar amounts with commas
-        formatted_monthly_installment = "${:,.2f}".format(monthly_installment)
-        formatted_total_repayment = "${:,.2f}".format(total_repayment)
-        formatted_total_loan = "${:,.2f}".format(total_loan)
-        formatted_total_interest = "${:,.2f}".format(total_interest)
-        formatted_yearly_interest = "${:,.2f}".format(yearly_interest)
-        formatted_monthly_interest = "${:,.2f}".format(monthly_interest)
-
-        result_html = html.Div([
-            html.H3("Loan Details", style={'color': colors['accent']}),
-            html.P(f"Principal Amount: {formatted_total_loan}"),
-            html.P(f"Interest Rate: {interest_rate}%"),
-            html.P(f"Loan Tenure: {tenure_yr} years ({tenure_mth} months)"),
 
-            html.H3("Financial Summary", style={'color': colors['accent']}),
-            html.P(f"Total Repayment: {formatted_total_repayment}"),
-            html.P(f"Total Interest: {formatted_total_interest}"),
-            html.P(f"Yearly Interest: {formatted_yearly_interest}"),
-            html.P(f"Monthly Interest: {formatted_monthly_interest}"),
-            html.P(f"Monthly Installment: {formatted_monthly_installment}"),
-            html.P(f"Effective Interest Rate (EIR): {(effective_interest_rate*100):,.2f}%")
-        ], style={'margin-top': '20px', 'textAlign': 'center'})
+# Explicit submit (button or Enter): the browser only issues an EIR request
+# when the figures changed, at most once per debounce window; a submit inside
+# the window is sent by the eir_trailing timer when it closes
+app.clientside_callback(
+    ClientsideFunction(namespace="loan", function_name="request"),
+    [Output("eir_request", "data"), Output("eir_trailing", "interval"), Output("eir_trailing", "disabled")],
+    [Input("calculate_button", "n_clicks"), Input("total_loan", "n_submit"), Input("tenure", "n_submit"), Input("interest_rate", "n_submit"), Input("eir_trailing", "n_intervals")],
+    [State("total_loan", "value"), State("tenure", "value"), State("interest_rate", "value"), State("eir_request", "data"), State("debounce_ms", "data")],
+    prevent_initial_call=True
+)
 
-        return result_html
+@lru_cache(maxsize=1024)
+def cached_loan_metrics(total_loan, tenure, interest_rate):
+    """
+    calculate_loan_metrics memoized on its inputs, so repeated figures skip the EIR search.
+    """
+    from loan_calculator import calculate_loan_metrics
 
+    return calculate_loan_metrics(total_loan, tenure, interest_rate)
+
+@app.callback(
+    Output("eir", "children"),
+    Input("eir_request", "data"),
+    prevent_initial_call=True
+)
+def update_eir(request):
+    if not request:
+        return no_update
+    _, _, effective_interest_rate = cached_loan_metrics(request["total_loan"], request["tenure"], request["interest_rate"])
+    if effective_interest_rate is None:
+        return "did not converge"
+    return f"{(effective_interest_rate*100):,.2f}%"
+
+def sensitivity_figure(request, metric):
+    """
+    Heatmap of the EIR or installment over the rate × tenure grid, with the submitted loan marked.
+    """
+    import plotly.graph_objects as go
+    from sensitivity import sensitivity_grid
+
+    grid = sensitivity_grid(request["total_loan"])
+    if metric == 'eir':
+        z, title, hover = grid['eir'] * 100, "EIR (%)", "%{z:.2f}%"
+    else:
+        z, title, hover = grid['monthly_installment'], "Monthly Installment ($)", "$%{z:,.2f}"
+
+    fig = go.Figure(go.Heatmap(
+        x=grid['rates'],
+        y=grid['tenures'],
+        z=z,
+        colorscale="Oranges",
+        colorbar=dict(title=title),
+        hovertemplate="Rate %{x:.1f}%<br>Tenure %{y} years<br>" + hover + "<extra></extra>",
+    ))
+    fig.add_trace(go.Scatter(
+        x=[request["interest_rate"]], y=[request["tenure"]], mode="markers",
+        marker=dict(color=colors['text'], size=10, symbol="x"), name="Your loan", hoverinfo="skip",
+    ))
+    fig.update_layout(
+        xaxis_title="Interest Rate p.a. (%)",
+        yaxis_title="Loan Tenure (years)",
+        paper_bgcolor=colors['background'],
+        margin=dict(l=60, r=20, t=20, b=50),
+        height=450,
+        showlegend=False,
+    )
+    return fig
+
+@app.callback(
+    [Output("sensitivity", "figure"), Output("sensitivity_section", "style")],
+    [Input("eir_request", "data"), Input("sensitivity_metric", "value")],
+    prevent_initial_call=True
+)
+def update_sensitivity(request, metric):
+    if not request:
+        return no_update, no_update
+    return sensitivity_figure(request, metric), {'margin-top': '30px', 'textAlign': 'center', 'display': 'block'}
+
+@server.after_request
+def cache_assets(response):
+    if flask_request.path.startswith("/assets/") and "m" in flask_request.args and response.status_code == 200:
+        response.headers["Cache-Control"] = ASSET_CACHE_CONTROL
+    return response
+
+WARMUP_REQUEST = {"total_loan": 100000, "tenure": 5, "interest_rate": 3.5}
+
+def warmup():
+    """
+    Import and exercise the calculation path once, so the first user does not pay for it.
+
+    Runs the EIR search (compiling the numba kernel when numba is installed),
+    the default sensitivity grid and both heatmaps, then clears the memo so
+    the warmup loan does not count as a user's cache entry.
+    """
+    cached_loan_metrics(WARMUP_REQUEST["total_loan"], WARMUP_REQUEST["tenure"], WARMUP_REQUEST["interest_rate"])
+    cached_loan_metrics.cache_clear()
+    for metric in ('eir', 'monthly_installment'):
+        sensitivity_figure(WARMUP_REQUEST, metric).to_plotly_json()
+
+@server.route("/_ah/warmup")
+def warmup_endpoint():
+    # App Engine calls this before routing traffic to a new instance
+    warmup()
+    return "", 200
 
 
 if __name__ == "__main__":
@@ -0,0 +1,69 @@
+// Closed-form loan figures computed in the browser, and the debounced
+// request that triggers the server-side EIR search.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    loan: {
+        summary: function (totalLoan, tenure, interestRate, request) {
+            const hidden = {display: 'none'};
+            const valid = totalLoan > 0 && tenure > 0 && interestRate >= 0;
+            // Nothing is shown until the first Calculate, as before the figures moved here
+            if (!valid || !request) {
+                return [hidden, '', '', '', '', '', '', '', '', ''];
+            }
+
+            const money = (value) => '$' + value.toLocaleString('en-US', {
+                minimumFractionDigits: 2,
+                maximumFractionDigits: 2
+            });
+            const tenureYr = Math.trunc(tenure);
+            const totalInterest = (interestRate / 100) * totalLoan * tenure;
+            const totalRepayment = totalLoan + totalInterest;
+            const monthlyInstallment = totalRepayment / (tenure * 12);
+
+            const current = request &&
+                request.total_loan === totalLoan &&
+                request.tenure === tenure &&
+                request.interest_rate === interestRate;
+
+            return [
+                {display: 'block'},
+                money(totalLoan),
+                interestRate + '%',
+                tenureYr + ' years (' + tenureYr * 12 + ' months)',
+                money(totalRepayment),
+                money(totalInterest),
+                money(totalInterest / tenureYr),
+                money(totalInterest / (tenureYr * 12)),
+                money(monthlyInstallment),
+                current ? '' : ' (press Calculate to update)'
+            ];
+        },
+
+        request: function (nClicks, nSubmitLoan, nSubmitTenure, nSubmitRate, nTrailing,
+                           totalLoan, tenure, interestRate, previous, debounceMs) {
+            // Outputs: the request, then the trailing timer's interval and disabled flag
+            const noUpdate = window.dash_clientside.no_update;
+            const trailing = window.dash_clientside.callback_context.triggered
+                .some((trigger) => trigger.prop_id === 'eir_trailing.n_intervals');
+            if (!(totalLoan > 0 && tenure > 0 && interestRate >= 0)) {
+                return [noUpdate, noUpdate, trailing ? true : noUpdate];
+            }
+            const now = Date.now();
+            const unchanged = previous &&
+                previous.total_loan === totalLoan &&
+                previous.tenure === tenure &&
+                previous.interest_rate === interestRate;
+            // Repeated submits of the same figures never reach the server
+            // (and cancel a pending trailing send)
+            if (unchanged) {
+                return [noUpdate, noUpdate, true];
+            }
+            // A submit inside the debounce window is sent when the window
+            // closes, with the figures the inputs hold then
+            const wait = previous ? previous.time + debounceMs - now : 0;
+            if (wait > 0) {
+                return [noUpdate, wait, false];
+            }
+            return [{total_loan: totalLoan, tenure: tenure, interest_rate: interestRate, time: now}, noUpdate, true];
+        }
+    }
+});
@@ -0,0 +1,27 @@
+"""
+Gunicorn settings for App Engine (see the entrypoint in app.yaml).
+
+The app is imported once in the master (preload_app) and warmed there, so
+every worker forks with Dash, the calculation modules and the compiled EIR
+kernel already in memory instead of loading them on its first request.
+"""
+import os
+
+wsgi_app = "app:server"
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+preload_app = True
+# Workers that stop answering the heartbeat (e.g. a hung EIR solve) are
+# restarted after this many seconds; startup cost is paid in the master
+# (preload_app) and never counts against it
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+
+
+def when_ready(server):
+    # Runs in the master after the app is loaded and before workers fork
+    import app
+
+    app.warmup()
+    server.log.info("Loan calculator warmed up")
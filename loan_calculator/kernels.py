@@ -0,0 +1,80 @@
+import importlib.util
+
+import numpy as np
+
+# numba is imported, and the kernel compiled, on first use rather than at
+# import time: importing it costs about 0.3 s on every cold start
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+
+DEFAULT_BACKEND = "numba" if NUMBA_AVAILABLE else "numpy"
+
+_numba_kernels = {}
+
+
+def _eir_residual_numpy(eir_guess, total_loan, monthly_installment, tenure_mth):
+    """
+    Closed form of the month-by-month balance recursion, vectorized over guesses.
+    """
+    eir_guess = np.asarray(eir_guess, dtype=np.float64)
+    monthly_rate = eir_guess / 12
+    growth = (1 + monthly_rate) ** tenure_mth
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity = np.where(
+            monthly_rate == 0, tenure_mth, (growth - 1) / monthly_rate
+        )
+    return total_loan * growth - monthly_installment * annuity
+
+
+def _eir_residual_numba():
+    """
+    Compile (or load from numba's on-disk cache) the fused residual kernel.
+    """
+    if "eir_residual" not in _numba_kernels:
+        import numba
+
+        @numba.njit(cache=True)
+        def kernel(eir_guess, total_loan, monthly_installment, tenure_mth):
+            # Same closed form as the NumPy version, fused into one pass
+            out = np.empty(eir_guess.shape)
+            for i in range(eir_guess.size):
+                monthly_rate = eir_guess.flat[i] / 12
+                if monthly_rate == 0:
+                    out.flat[i] = total_loan - monthly_installment * tenure_mth
+                else:
+                    growth = (1 + monthly_rate) ** tenure_mth
+                    out.flat[i] = (
+                        total_loan * growth - monthly_installment * (growth - 1) / monthly_rate
+                    )
+            return out
+
+        _numba_kernels["eir_residual"] = kernel
+    return _numba_kernels["eir_residual"]
+
+
+def eir_residual(eir_guess, total_loan, monthly_installment, tenure_mth, backend=None):
+    """
+    Remaining balance after `tenure_mth` months at annual rate(s) `eir_guess`.
+
+    Parameters:
+    - eir_guess (float or numpy.ndarray): Guessed Effective Interest Rate(s).
+    - total_loan (float): Total loan amount.
+    - monthly_installment (float): Monthly installment.
+    - tenure_mth (int): Total number of months in the loan tenure.
+    - backend (str, optional): "numba" or "numpy"; defaults to numba when installed.
+
+    Returns:
+    float or numpy.ndarray: Remaining balance for each guess.
+    """
+    backend = backend or DEFAULT_BACKEND
+    if backend == "numba" and not NUMBA_AVAILABLE:
+        raise ImportError("The numba backend requires numba to be installed")
+
+    scalar = np.ndim(eir_guess) == 0
+    if backend == "numba":
+        guesses = np.atleast_1d(np.asarray(eir_guess, dtype=np.float64))
+        result = _eir_residual_numba()(
+            guesses, float(total_loan), float(monthly_installment), int(tenure_mth)
+        )
+    else:
+        result = _eir_residual_numpy(eir_guess, total_loan, monthly_installment, tenure_mth)
+    return float(result.reshape(-1)[0]) if scalar else result
@@ -0,0 +1,63 @@
+"""
+Parity check and timings for the EIR residual kernel.
+
+    python kernels_benchmark.py
+"""
+import time
+
+import numpy as np
+
+import kernels
+
+BACKENDS = ["numpy"] + (["numba"] if kernels.NUMBA_AVAILABLE else [])
+
+
+def eir_residual_reference(eir_guess, total_loan, monthly_installment, tenure_mth):
+    """
+    The original month-by-month balance loop.
+    """
+    interest_balance = total_loan
+    for _ in range(tenure_mth):
+        interest = interest_balance * eir_guess / 12
+        interest_balance = interest_balance + interest - monthly_installment
+    return interest_balance
+
+
+def check_parity(seed=0):
+    """
+    Compare every backend with the reference loop; raise on mismatch.
+    """
+    rng = np.random.default_rng(seed)
+    guesses = np.concatenate([[0.0], rng.uniform(0.001, 0.3, 200)])
+    for tenure_yr in (1, 5, 30):
+        total_loan = 100_000.0
+        monthly_installment = total_loan * 1.2 / (tenure_yr * 12)
+        expected = np.array([
+            eir_residual_reference(g, total_loan, monthly_installment, tenure_yr * 12)
+            for g in guesses
+        ])
+        for backend in BACKENDS:
+            result = kernels.eir_residual(guesses, total_loan, monthly_installment, tenure_yr * 12, backend)
+            if not np.allclose(result, expected, rtol=1e-9, atol=1e-6):
+                raise AssertionError(f"eir_residual ({backend}) differs for {tenure_yr} years")
+    print(f"Parity OK for {', '.join(BACKENDS)} backends")
+
+
+def benchmark(sizes=(1_000, 10_000, 100_000, 1_000_000, 10_000_000), tenure_mth=360):
+    """
+    Wall time to evaluate the residual for `size` rate guesses at once.
+    """
+    for size in sizes:
+        guesses = np.linspace(0.0001, 0.3, size)
+        timings = []
+        for backend in BACKENDS:
+            kernels.eir_residual(guesses[:10], 100_000.0, 500.0, tenure_mth, backend)  # warm up
+            start = time.perf_counter()
+            kernels.eir_residual(guesses, 100_000.0, 500.0, tenure_mth, backend)
+            timings.append(f"{backend}: {time.perf_counter() - start:.6f}s")
+        print(f"{size:>10,} guesses  " + "  ".join(timings))
+
+
+if __name__ == "__main__":
+    check_parity()
+    benchmark()
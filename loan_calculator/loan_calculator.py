@@ -1,3 +1,5 @@
+from kernels import eir_residual
+
 def calculate_eir_guess_balance(eir_guess, total_loan, monthly_installment, tenure_yr):
     """
     Calculate the remaining balance based on the guessed Effective Interest Rate (EIR).
@@ -11,11 +13,7 @@ def calculate_eir_guess_balance(eir_guess, total_loan, monthly_installment, tenu
     Returns:
     float: Remaining balance based on the guessed EIR.
     """
-    interest_balance = total_loan
-    for _ in range(tenure_yr*12):
-        interest = interest_balance * eir_guess / 12
-        interest_balance = interest_balance + interest - monthly_installment
-    return interest_balance
+    return eir_residual(eir_guess, total_loan, monthly_installment, tenure_yr*12)
 
 def find_effective_interest_rate(total_loan, monthly_installment, tenure_yr, interest_rate, tolerance=0.000001, max_iterations=10000):
     """
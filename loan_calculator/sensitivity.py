@@ -0,0 +1,89 @@
+from functools import lru_cache
+
+import numpy as np
+
+from kernels import eir_residual
+
+# Default heatmap axes: 0.1% to 20% in 0.1% steps, 1 to 40 years
+DEFAULT_RATES = tuple(np.round(np.arange(1, 201) * 0.1, 1))
+DEFAULT_TENURES = tuple(range(1, 41))
+
+
+def solve_eir_grid(monthly_installment, tenure_mth, total_loan=1.0, tolerance=1e-10, max_iterations=200):
+    """
+    Solve the Effective Interest Rate for many loans at once by vectorized bisection.
+
+    The remaining balance grows with the rate, so each EIR is bracketed
+    between 0 and an upper bound that is doubled until the balance turns
+    positive, then the whole grid is bisected together.
+
+    Parameters:
+    - monthly_installment (numpy.ndarray): Monthly installment of each loan.
+    - tenure_mth (numpy.ndarray): Tenure in months, broadcastable to monthly_installment.
+    - total_loan (float): Total loan amount shared by all loans.
+    - tolerance (float): Width of the final bracket on the annual rate.
+    - max_iterations (int): Maximum number of bisection steps.
+
+    Returns:
+    numpy.ndarray: EIR of each loan (as a fraction, like find_effective_interest_rate).
+    """
+    monthly_installment, tenure_mth = np.broadcast_arrays(
+        np.asarray(monthly_installment, dtype=np.float64), np.asarray(tenure_mth, dtype=np.float64)
+    )
+    low = np.zeros(monthly_installment.shape)
+    high = np.full(monthly_installment.shape, 0.1)
+
+    def balance(rate):
+        return eir_residual(rate, total_loan, monthly_installment, tenure_mth, backend="numpy")
+
+    for _ in range(64):
+        short = balance(high) < 0
+        if not short.any():
+            break
+        high = np.where(short, high * 2, high)
+
+    for _ in range(max_iterations):
+        mid = (low + high) / 2
+        negative = balance(mid) < 0
+        low = np.where(negative, mid, low)
+        high = np.where(negative, high, mid)
+        if np.max(high - low) <= tolerance:
+            break
+    return (low + high) / 2
+
+
+@lru_cache(maxsize=32)
+def _unit_grid(rates, tenures):
+    # Installments and EIRs for a loan of 1: the installment scales with the
+    # principal and the EIR does not depend on it at all, so one cached grid
+    # serves every principal
+    rate = np.asarray(rates, dtype=np.float64)[np.newaxis, :] / 100
+    tenure_yr = np.asarray(tenures, dtype=np.float64)[:, np.newaxis]
+    monthly_installment = (1 + rate * tenure_yr) / (tenure_yr * 12)
+    eir = solve_eir_grid(monthly_installment, tenure_yr * 12)
+    for array in (monthly_installment, eir):
+        array.flags.writeable = False
+    return monthly_installment, eir
+
+
+def sensitivity_grid(total_loan, rates=DEFAULT_RATES, tenures=DEFAULT_TENURES):
+    """
+    Monthly installment and EIR over a grid of interest rates and tenures.
+
+    Parameters:
+    - total_loan (float): Total loan amount.
+    - rates (sequence of float): Annual flat interest rates in percent (columns).
+    - tenures (sequence of int): Loan tenures in years (rows).
+
+    Returns:
+    dict: 'rates', 'tenures', and 'monthly_installment' and 'eir' arrays of
+    shape (len(tenures), len(rates)), EIR as a fraction.
+    """
+    rates, tenures = tuple(float(r) for r in rates), tuple(int(t) for t in tenures)
+    unit_installment, eir = _unit_grid(rates, tenures)
+    return {
+        'rates': np.asarray(rates),
+        'tenures': np.asarray(tenures),
+        'monthly_installment': unit_installment * total_loan,
+        'eir': eir,
+    }
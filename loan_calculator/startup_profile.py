@@ -0,0 +1,106 @@
+"""
+Profile a cold start of the loan calculator.
+
+Runs each measurement in a fresh interpreter so nothing is cached in memory:
+the slowest imports from `python -X importtime -c "import app"`, then the
+time to import the app, serve the first page and answer the first EIR
+callback, with and without the warmup.
+
+Usage:
+    python startup_profile.py [--top 15]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+TIMING_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import app
+timings = {"import_app": time.perf_counter() - start}
+client = app.server.test_client()
+if WARMUP:
+    start = time.perf_counter()
+    app.warmup()
+    timings["warmup"] = time.perf_counter() - start
+start = time.perf_counter()
+client.get("/")
+client.get("/_dash-layout")
+client.get("/_dash-dependencies")
+timings["first_page"] = time.perf_counter() - start
+start = time.perf_counter()
+client.post("/_dash-update-component", json={
+    "output": "eir.children",
+    "outputs": {"id": "eir", "property": "children"},
+    "inputs": [{"id": "eir_request", "property": "data",
+                "value": {"total_loan": 250000, "tenure": 30, "interest_rate": 4.2}}],
+    "changedPropIds": ["eir_request.data"],
+})
+timings["first_callback"] = time.perf_counter() - start
+print(json.dumps(timings))
+"""
+
+
+def import_times(top):
+    """
+    Slowest imports of the app by cumulative time.
+
+    Parameters:
+    - top (int): Number of imports to return.
+
+    Returns:
+    list of (float, str): Cumulative seconds and module name, slowest first.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=HERE, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative) / 1e6, name.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def cold_start(warmup):
+    """
+    Import, first page and first callback timings of a fresh interpreter.
+
+    Parameters:
+    - warmup (bool): Whether to call app.warmup() before the first request.
+
+    Returns:
+    dict: Seconds per phase.
+    """
+    script = TIMING_SCRIPT.replace("WARMUP", str(warmup))
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=HERE, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=15, help="number of slowest imports to list")
+    args = parser.parse_args()
+
+    print("Slowest imports (cumulative):")
+    for seconds, name in import_times(args.top):
+        print(f"  {seconds:8.3f}s  {name}")
+
+    for warmup in (False, True):
+        timings = cold_start(warmup)
+        print(f"\nCold start {'with' if warmup else 'without'} warmup:")
+        for phase, seconds in timings.items():
+            print(f"  {phase:<15} {seconds:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
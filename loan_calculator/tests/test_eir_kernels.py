@@ -0,0 +1,41 @@
+"""
+Parity of the NumPy and Numba EIR residual kernels with the month-by-month loop.
+"""
+import numpy as np
+import pytest
+
+import kernels
+from kernels_benchmark import eir_residual_reference
+
+BACKENDS = [
+    "numpy",
+    pytest.param("numba", marks=pytest.mark.skipif(not kernels.NUMBA_AVAILABLE, reason="numba not installed")),
+]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("tenure_yr", [1, 5, 30])
+def test_eir_residual_matches_loop(backend, tenure_yr):
+    rng = np.random.default_rng(0)
+    guesses = np.concatenate([[0.0], rng.uniform(0.001, 0.3, 200)])
+    total_loan = 100_000.0
+    monthly_installment = total_loan * 1.2 / (tenure_yr * 12)
+    expected = [
+        eir_residual_reference(guess, total_loan, monthly_installment, tenure_yr * 12)
+        for guess in guesses
+    ]
+    result = kernels.eir_residual(guesses, total_loan, monthly_installment, tenure_yr * 12, backend)
+    np.testing.assert_allclose(result, expected, rtol=1e-9, atol=1e-6)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_eir_residual_scalar_in_scalar_out(backend):
+    result = kernels.eir_residual(0.05, 100_000.0, 1_000.0, 120, backend)
+    assert isinstance(result, float)
+    assert result == pytest.approx(eir_residual_reference(0.05, 100_000.0, 1_000.0, 120), rel=1e-9)
+
+
+def test_numba_backend_requires_numba(monkeypatch):
+    monkeypatch.setattr(kernels, "NUMBA_AVAILABLE", False)
+    with pytest.raises(ImportError):
+        kernels.eir_residual(0.05, 100_000.0, 1_000.0, 120, "numba")
@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_SIZE = 10_000_000
+
+
+def _face_dtype(max_value):
+    """Compact integer type for face values up to `max_value`"""
+    return np.uint8 if max_value <= np.iinfo(np.uint8).max else np.int64
+
+
+def roll_dice(trials, n_dice=2, faces=6, rng=None):
+    """
+    Roll `n_dice` fair dice `trials` times in one draw.
+
+    Parameters:
+    - trials (int): Number of rolls.
+    - n_dice (int): Number of dice per roll.
+    - faces (int): Number of faces per die.
+    - rng (numpy.random.Generator or int, optional): Generator or seed.
+
+    Returns:
+    numpy.ndarray: (trials, n_dice) array of face values from 1 to `faces`.
+    """
+    rng = np.random.default_rng(rng)
+    return rng.integers(1, faces + 1, size=(trials, n_dice), dtype=_face_dtype(faces + 1))
+
+
+def sum_counts(trials, n_dice=2, faces=6, rng=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Count how often each sum of faces occurs over `trials` rolls.
+
+    Rolls are generated in chunks of at most `chunk_size` trials, so memory
+    stays bounded however many trials are requested.
+
+    Parameters:
+    - trials (int): Number of rolls.
+    - n_dice (int): Number of dice per roll.
+    - faces (int): Number of faces per die.
+    - rng (numpy.random.Generator or int, optional): Generator or seed.
+    - chunk_size (int): Maximum number of trials held in memory at once.
+
+    Returns:
+    numpy.ndarray: Counts indexed by sum - n_dice, of length n_dice * (faces - 1) + 1.
+    """
+    rng = np.random.default_rng(rng)
+    n_outcomes = n_dice * (faces - 1) + 1
+    counts = np.zeros(n_outcomes, dtype=np.int64)
+    remaining = trials
+    while remaining > 0:
+        size = min(remaining, chunk_size)
+        # Draw faces from 0 so the sum is already the offset into `counts`
+        rolls = rng.integers(0, faces, size=(size, n_dice), dtype=_face_dtype(faces))
+        counts += np.bincount(rolls.sum(axis=1, dtype=np.int64), minlength=n_outcomes)
+        remaining -= size
+    return counts
+
+
+def exact_sum_distribution(n_dice=2, faces=6):
+    """
+    Exact probability distribution of the sum of `n_dice` fair dice.
+
+    The single-die distribution is convolved with itself n_dice - 1 times.
+
+    Returns:
+    pandas.Series: Probability indexed by sum of faces.
+    """
+    die = np.full(faces, 1.0 / faces)
+    probs = np.ones(1)
+    for _ in range(n_dice):
+        probs = np.convolve(probs, die)
+    return pd.Series(probs, index=np.arange(n_dice, n_dice * faces + 1), name="Prob")
+
+
+def chi_square_distance(counts, expected_probs):
+    """
+    Chi-square distance between observed counts and expected probabilities.
+
+    Returns:
+    float: sum((p_observed - p_expected)^2 / p_expected), 0 for a perfect match.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    expected_probs = np.asarray(expected_probs, dtype=np.float64)
+    total = counts.sum()
+    if total == 0:
+        return np.inf
+    return float(np.sum((counts / total - expected_probs) ** 2 / expected_probs))
+
+
+def rolling_dice_sampling(trial, n_dice=2, faces=6, seed=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Relative frequencies of the sum of faces over `trial` rolls.
+
+    Vectorized replacement for the notebook function of the same name.
+
+    Returns:
+    pandas.Series: Relative frequency indexed by sum of faces (sums never seen are omitted).
+    """
+    counts = sum_counts(trial, n_dice, faces, seed, chunk_size)
+    freq = pd.Series(counts, index=np.arange(n_dice, n_dice * faces + 1))
+    return freq[freq > 0] / trial
+
+
+def convergence_table(trial_sizes, n_dice=2, faces=6, seed=None):
+    """
+    Chi-square distance to the exact distribution for several trial sizes.
+
+    Returns:
+    pandas.Series: Distance indexed by number of trials.
+    """
+    rng = np.random.default_rng(seed)
+    expected = exact_sum_distribution(n_dice, faces).to_numpy()
+    return pd.Series(
+        {
+            trials: chi_square_distance(sum_counts(trials, n_dice, faces, rng), expected)
+            for trials in trial_sizes
+        },
+        name="chi_square_distance",
+    )
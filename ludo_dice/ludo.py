@@ -0,0 +1,297 @@
+import numpy as np
+
+# Token positions, relative to the owner's start square:
+# 0 = in the yard, 1..51 = main track (1 is the start square), 52..56 = home column, 57 = home
+YARD = 0
+START = 1
+TRACK_END = 51
+HOME = 57
+TOKENS = 4
+TRACK_SQUARES = 52
+
+# Absolute track squares where no token can be captured: the four start squares and the stars
+SAFE_SQUARES = np.zeros(TRACK_SQUARES, dtype=bool)
+SAFE_SQUARES[[0, 8, 13, 21, 26, 34, 39, 47]] = True
+
+MAX_SIXES = 3
+
+
+def seat_offsets(n_players):
+    """
+    Absolute track square of each seat's start square.
+
+    Two players sit opposite each other, three or four take consecutive
+    quarters, as on a real board.
+    """
+    return (np.arange(n_players) * 13 * (4 // n_players)).astype(np.int16)
+
+
+def square_table(n_players):
+    """
+    Absolute track square of every (seat, relative position), -1 off the main track.
+
+    Returns:
+    numpy.ndarray: (n_players, HOME + 1) int8 table; squares are looked up
+    with one fancy index instead of computed.
+    """
+    positions = np.arange(HOME + 1)
+    on_track = (positions >= START) & (positions <= TRACK_END)
+    squares = (positions[None, :] - START + seat_offsets(n_players)[:, None]) % TRACK_SQUARES
+    return np.where(on_track[None, :], squares, -1).astype(np.int8)
+
+
+class MoveContext:
+    """
+    Everything a policy sees for a batch of games, one row per game.
+
+    `positions` are the mover's four tokens, `targets` where each would end
+    up with this roll and `legal` which of them may move. `captures`,
+    `lands_safe`, `target_squares` and `opponent_squares` are computed on first use only.
+    """
+
+    def __init__(self, positions, targets, legal, rolls, board, player, squares, rng):
+        self.positions = positions
+        self.targets = targets
+        self.legal = legal
+        self.rolls = rolls
+        self.board = board
+        self.player = player
+        self.squares = squares
+        self.rng = rng
+        self._cache = {}
+
+    def _cached(self, name, compute):
+        if name not in self._cache:
+            self._cache[name] = compute()
+        return self._cache[name]
+
+    @property
+    def target_squares(self):
+        # Overshooting targets are illegal; clipping them to HOME reads as off the track
+        return self._cached(
+            "target_squares", lambda: self.squares[self.player[:, None], np.minimum(self.targets, HOME)]
+        )
+
+    @property
+    def opponent_squares(self):
+        """
+        Absolute squares of all tokens, -1 for the mover's own and for tokens off the track.
+        """
+        def compute():
+            seats = np.arange(self.board.shape[1])
+            squares = self.squares[seats[None, :, None], self.board]
+            own = seats[None, :] == self.player[:, None]
+            return np.where(own[:, :, None], -1, squares)
+
+        return self._cached("opponent_squares", compute)
+
+    @property
+    def lands_safe(self):
+        def compute():
+            squares = self.target_squares
+            return (squares < 0) | SAFE_SQUARES[np.maximum(squares, 0)]
+
+        return self._cached("lands_safe", compute)
+
+    @property
+    def captures(self):
+        """
+        Number of opponent tokens each move would send back to the yard.
+        """
+        def compute():
+            opponents = self.opponent_squares.reshape(len(self.player), 1, self.board.shape[1] * TOKENS)
+            hits = (opponents == self.target_squares[:, :, None]).sum(axis=2)
+            return np.where(self.legal & ~self.lands_safe, hits, 0)
+
+        return self._cached("captures", compute)
+
+
+def choose(context, score):
+    """
+    Legal token with the highest score in each game (the lowest index on ties), -1 if none.
+    """
+    score = np.where(context.legal, score.astype(np.float64), -np.inf)
+    choice = np.argmax(score, axis=1)
+    return np.where(context.legal.any(axis=1), choice, -1)
+
+
+# ---------------------------------------------------------------------------
+# Policies: policy(context) returns the token index to move in each game
+# ---------------------------------------------------------------------------
+
+
+def random_policy(context):
+    """
+    Any legal token, uniformly.
+    """
+    return choose(context, context.rng.random(context.legal.shape))
+
+
+def leader_policy(context):
+    """
+    Race the most advanced token home.
+    """
+    return choose(context, context.positions)
+
+
+def trailer_policy(context):
+    """
+    Move the least advanced token, bringing new tokens out first.
+    """
+    return choose(context, -context.positions.astype(np.int16))
+
+
+def aggressive_policy(context):
+    """
+    Capture whenever possible, else bring a token out, else race the leader.
+    """
+    score = (
+        context.captures * 1000
+        + (context.positions == YARD) * 100
+        + context.positions
+    )
+    return choose(context, score)
+
+
+def safe_policy(context):
+    """
+    Finish or reach the home column, then capture, then land on a safe square.
+    """
+    score = (
+        (context.targets == HOME) * 10000
+        + ((context.targets > TRACK_END) & (context.positions <= TRACK_END)) * 5000
+        + context.captures * 1000
+        + context.lands_safe * 100
+        + context.positions
+    )
+    return choose(context, score)
+
+
+POLICIES = {
+    "random": random_policy,
+    "leader": leader_policy,
+    "trailer": trailer_policy,
+    "aggressive": aggressive_policy,
+    "safe": safe_policy,
+}
+
+
+def _resolve(policy):
+    return POLICIES[policy] if isinstance(policy, str) else policy
+
+
+def simulate_games(n_games, policies, rng=None, max_rolls=5000):
+    """
+    Play `n_games` games of Ludo in lockstep, one die roll per step for every unfinished game.
+
+    Rules: a 6 brings a token out of the yard onto its start square; tokens
+    run 51 squares of the shared track and 5 of their own home column and
+    need the exact roll to reach home. Landing on an opponent outside the
+    safe squares (start squares and stars) sends every opponent token there
+    back to the yard. A 6 or a capture earns another roll, but a third 6 in
+    a row ends the turn without moving. The first player with all four
+    tokens home wins. Blocks (two tokens of one player on a square) are
+    not modelled.
+
+    Parameters:
+    - n_games (int): Number of games.
+    - policies (sequence): One policy per seat, a callable or a name in POLICIES (2 to 4 seats).
+    - rng (numpy.random.Generator or int, optional): Generator or seed; the results depend only on it.
+    - max_rolls (int): Rolls after which unfinished games are abandoned.
+
+    Returns:
+    dict: wins (numpy.ndarray, games won per seat), games (int), unfinished (int),
+    rolls (int, total die rolls) and turns (numpy.ndarray, rolls per finished game).
+    """
+    rng = np.random.default_rng(rng)
+    policies = [_resolve(policy) for policy in policies]
+    n_players = len(policies)
+    if not 2 <= n_players <= 4:
+        raise ValueError("Ludo is played by 2 to 4 players")
+    squares = square_table(n_players)
+    seats = np.arange(n_players)
+    # Seats sharing a policy are decided in one call
+    groups = list(dict.fromkeys(policies))
+    group_of_seat = np.array([groups.index(policy) for policy in policies])
+
+    winner = np.full(n_games, -1, dtype=np.int8)
+    turns = np.zeros(n_games, dtype=np.int32)
+    total_rolls = 0
+
+    # Working set of unfinished games. Finished games stay in it (they have
+    # no legal moves left) until enough of them pile up to be worth removing.
+    ids = np.arange(n_games)
+    board = np.zeros((n_games, n_players, TOKENS), dtype=np.uint8)
+    current = np.zeros(n_games, dtype=np.intp)
+    sixes = np.zeros(n_games, dtype=np.uint8)
+    rolls_taken = np.zeros(n_games, dtype=np.int32)
+    done = np.zeros(n_games, dtype=bool)
+
+    for _ in range(max_rolls):
+        if done.sum() * 8 >= len(ids):
+            keep = ~done
+            ids, board, current, sixes, rolls_taken, done = (
+                ids[keep], board[keep], current[keep], sixes[keep], rolls_taken[keep], done[keep]
+            )
+        if not len(ids):
+            break
+        rows = np.arange(len(ids))
+        player = current
+        rolls = rng.integers(1, 7, len(ids), dtype=np.uint8)
+        total_rolls += int((~done).sum())
+        rolls_taken += 1
+
+        positions = board[rows, player]
+        streak = np.where(rolls == 6, sixes + 1, 0)
+        forfeit = streak >= MAX_SIXES
+        targets = np.where(positions == YARD, START, positions + rolls[:, None])
+        legal = np.where(positions == YARD, rolls[:, None] == 6, targets <= HOME) & (positions < HOME)
+        legal &= ~forfeit[:, None]
+
+        choice = np.full(len(ids), -1, dtype=np.intp)
+        group = group_of_seat[player]
+        for index, policy in enumerate(groups):
+            turn = np.flatnonzero(group == index) if len(groups) > 1 else slice(None)
+            context = MoveContext(
+                positions[turn], targets[turn], legal[turn], rolls[turn],
+                board[turn], player[turn], squares, rng,
+            )
+            choice[turn] = policy(context)
+        moving = choice >= 0
+        if (moving & ~legal[rows, np.maximum(choice, 0)]).any():
+            raise ValueError("A policy chose an illegal move")
+
+        # Move the chosen token, then send opponents on its landing square to the yard
+        moved = rows[moving]
+        mover = player[moving]
+        token = choice[moving]
+        destination = targets[moved, token]
+        board[moved, mover, token] = destination
+        landing = squares[mover, destination]
+        capturable = (landing >= 0) & ~SAFE_SQUARES[np.maximum(landing, 0)]
+        moved, mover, landing = moved[capturable], mover[capturable], landing[capturable]
+        after = board[moved]
+        hit = squares[seats[None, :, None], after] == landing[:, None, None]
+        hit &= (seats[None, :] != mover[:, None])[:, :, None]
+        board[moved] = np.where(hit, YARD, after)
+        captured = np.zeros(len(ids), dtype=bool)
+        captured[moved] = hit.any(axis=(1, 2))
+
+        finished = ~done & (board[rows, player] == HOME).all(axis=1)
+        winner[ids[finished]] = player[finished]
+        turns[ids[finished]] = rolls_taken[finished]
+        done |= finished
+
+        # A 6 (unless it was the third) or a capture rolls again
+        again = ((rolls == 6) & ~forfeit) | captured
+        sixes = np.where(again & (rolls == 6), streak, 0).astype(np.uint8)
+        current = np.where(again, player, (player + 1) % n_players)
+
+    finished = winner >= 0
+    return {
+        "wins": np.bincount(winner[finished], minlength=n_players),
+        "games": n_games,
+        "unfinished": int((~finished).sum()),
+        "rolls": total_rolls,
+        "turns": turns[finished],
+    }
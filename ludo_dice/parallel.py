@@ -0,0 +1,180 @@
+import os
+import time
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+
+from dice import chi_square_distance, exact_sum_distribution, sum_counts
+from ludo import simulate_games
+
+DEFAULT_BLOCK_SIZE = 5_000_000
+DEFAULT_GAMES_BLOCK = 20_000
+
+
+def _block_counts(args):
+    """
+    Worker entry point: count sums for one block with its own RNG stream.
+    """
+    seed_seq, trials, n_dice, faces = args
+    return sum_counts(trials, n_dice, faces, np.random.default_rng(seed_seq))
+
+
+def _block_sizes(trials, block_size):
+    full, rest = divmod(trials, block_size)
+    return [block_size] * full + ([rest] if rest else [])
+
+
+def parallel_sum_counts(
+    trials,
+    n_dice=2,
+    faces=6,
+    seed=None,
+    workers=None,
+    block_size=DEFAULT_BLOCK_SIZE,
+    tolerance=None,
+):
+    """
+    Count sums of dice across a process pool with reproducible results.
+
+    The trials are split into fixed-size blocks and every block gets its own
+    child of `SeedSequence(seed)`. Blocks are merged in order, so the counts
+    depend only on the seed and block size, never on the number of workers.
+
+    Parameters:
+    - trials (int): Maximum number of rolls.
+    - n_dice (int): Number of dice per roll.
+    - faces (int): Number of faces per die.
+    - seed (int, optional): Root seed; None draws fresh entropy.
+    - workers (int, optional): Number of processes, defaults to os.cpu_count().
+    - block_size (int): Trials per block (the unit of work and of reproducibility).
+    - tolerance (float, optional): Stop as soon as the chi-square distance to
+      the exact distribution drops below this value.
+
+    Returns:
+    dict: counts (numpy.ndarray), trials (int), chi_square (float), seconds (float).
+    """
+    workers = workers or os.cpu_count()
+    sizes = _block_sizes(trials, block_size)
+    streams = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(stream, size, n_dice, faces) for stream, size in zip(streams, sizes)]
+    expected = exact_sum_distribution(n_dice, faces).to_numpy()
+
+    counts = np.zeros(len(expected), dtype=np.int64)
+    done = 0
+    start = time.perf_counter()
+    with Pool(processes=workers) as pool:
+        # imap yields in submission order, which keeps the stopping point
+        # deterministic even though blocks finish out of order
+        for block_counts, size in zip(pool.imap(_block_counts, tasks), sizes):
+            counts += block_counts
+            done += size
+            if tolerance is not None and chi_square_distance(counts, expected) < tolerance:
+                pool.terminate()
+                break
+    seconds = time.perf_counter() - start
+
+    return {
+        "counts": counts,
+        "trials": done,
+        "chi_square": chi_square_distance(counts, expected),
+        "seconds": seconds,
+    }
+
+
+def _block_games(args):
+    """
+    Worker entry point: play one block of games with the lineup rotated by `shift` seats.
+
+    Policies travel as names or module-level functions, which pickle by reference.
+    """
+    seed_seq, games, policies, shift = args
+    seated = policies[shift:] + policies[:shift]
+    result = simulate_games(games, seated, np.random.default_rng(seed_seq))
+    # Map seat wins back to positions in the original lineup
+    wins = np.roll(result["wins"], shift)
+    return wins, result["unfinished"], int(result["turns"].sum()), len(result["turns"])
+
+
+def _policy_labels(policies):
+    names = [policy if isinstance(policy, str) else policy.__name__ for policy in policies]
+    return [f"{name} #{i}" if names.count(name) > 1 else name for i, name in enumerate(names)]
+
+
+def parallel_win_rates(games, policies, seed=None, workers=None, block_size=DEFAULT_GAMES_BLOCK):
+    """
+    Estimate win rates of competing Ludo policies across a process pool.
+
+    Games are played in blocks, each with its own child of `SeedSequence(seed)`
+    and with the lineup rotated one seat further than the previous block, so
+    every policy plays from every seat and the first-mover advantage cancels
+    out. Blocks are merged in order: results depend only on the seed and
+    block size, never on the number of workers.
+
+    Parameters:
+    - games (int): Number of games.
+    - policies (list): 2 to 4 policies, names in `ludo.POLICIES` or module-level functions.
+    - seed (int, optional): Root seed; None draws fresh entropy.
+    - workers (int, optional): Number of processes, defaults to os.cpu_count().
+    - block_size (int): Games per block (the unit of work and of reproducibility).
+
+    Returns:
+    dict: win_rates (pandas.Series by policy), wins (numpy.ndarray), games (int),
+    unfinished (int), mean_turns (float, rolls per finished game),
+    games_per_second (float), seconds (float).
+    """
+    workers = workers or os.cpu_count()
+    policies = list(policies)
+    sizes = _block_sizes(games, block_size)
+    streams = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [
+        (stream, size, policies, i % len(policies))
+        for i, (stream, size) in enumerate(zip(streams, sizes))
+    ]
+
+    wins = np.zeros(len(policies), dtype=np.int64)
+    unfinished = turns = finished = 0
+    start = time.perf_counter()
+    with Pool(processes=workers) as pool:
+        for block_wins, block_unfinished, block_turns, block_finished in pool.imap(_block_games, tasks):
+            wins += block_wins
+            unfinished += block_unfinished
+            turns += block_turns
+            finished += block_finished
+    seconds = time.perf_counter() - start
+
+    return {
+        "win_rates": pd.Series(wins / games, index=_policy_labels(policies), name="win_rate"),
+        "wins": wins,
+        "games": games,
+        "unfinished": unfinished,
+        "mean_turns": turns / finished if finished else float("nan"),
+        "games_per_second": games / seconds,
+        "seconds": seconds,
+    }
+
+
+def scaling_report(trials, n_dice=2, faces=6, seed=0, max_workers=None, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Measure throughput of `parallel_sum_counts` from 1 to `max_workers` processes.
+
+    Returns:
+    pandas.DataFrame: trials_per_second, speedup and efficiency indexed by worker count.
+    """
+    max_workers = max_workers or os.cpu_count()
+    rows = []
+    for workers in range(1, max_workers + 1):
+        result = parallel_sum_counts(trials, n_dice, faces, seed, workers, block_size)
+        rows.append({"workers": workers, "trials_per_second": result["trials"] / result["seconds"]})
+
+    report = pd.DataFrame(rows).set_index("workers")
+    report["speedup"] = report["trials_per_second"] / report["trials_per_second"].iloc[0]
+    report["efficiency"] = report["speedup"] / report.index
+    return report
+
+
+if __name__ == "__main__":
+    print(scaling_report(100_000_000, seed=42))
+    result = parallel_win_rates(1_000_000, ["aggressive", "safe", "leader", "random"], seed=42)
+    print(result["win_rates"])
+    print(f"{result['games_per_second']:,.0f} games/s")
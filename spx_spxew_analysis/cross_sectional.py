@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+
+def _window_sums(values, window):
+    """Trailing-window sums along axis 0 as differences of a cumulative sum"""
+    csum = np.cumsum(values, axis=0)
+    sums = csum.copy()
+    sums[window:] -= csum[:-window]
+    return sums
+
+
+def rolling_beta(returns, benchmark, window=TRADING_DAYS, min_periods=None, chunk_size=256, path=None):
+    """Rolling beta of every symbol against a benchmark
+
+    Covariance and variance come from trailing sums of x, y, xy and y^2,
+    each a cumulative sum difference, so all symbols are handled at once
+    instead of one rolling().cov() per symbol. Days where either series is
+    missing are left out of that symbol's window. Columns are processed in
+    chunks of `chunk_size` to bound memory; with `path` the result is
+    written to a .npy file (memory-mapped) instead of being held in RAM.
+    """
+    min_periods = min_periods or window
+    dates, symbols = returns.index, returns.columns
+    bench = benchmark.reindex(dates).to_numpy(dtype=np.float64)[:, None]
+
+    if path is None:
+        out = np.empty(returns.shape)
+    else:
+        out = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=returns.shape)
+
+    for lo in range(0, len(symbols), chunk_size):
+        x = returns.iloc[:, lo : lo + chunk_size].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(x) & ~np.isnan(bench)
+        x = np.where(valid, x, 0.0)
+        y = np.where(valid, bench, 0.0)
+
+        n = _window_sums(valid.astype(np.float64), window)
+        sx = _window_sums(x, window)
+        sy = _window_sums(y, window)
+        sxy = _window_sums(x * y, window)
+        syy = _window_sums(y * y, window)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = sxy - sx * sy / n
+            var = syy - sy * sy / n
+            beta = cov / var
+        beta[(n < min_periods) | (var <= 0)] = np.nan
+        out[:, lo : lo + chunk_size] = beta
+
+    if path is not None:
+        out.flush()
+        return out
+    return pd.DataFrame(out, index=dates, columns=symbols)
+
+
+def rolling_volatility(returns, window=TRADING_DAYS):
+    """Annualized rolling volatility of every symbol (full windows only)"""
+    x = returns.to_numpy(dtype=np.float64)
+    valid = ~np.isnan(x)
+    x = np.where(valid, x, 0.0)
+    n = _window_sums(valid.astype(np.float64), window)
+    sx = _window_sums(x, window)
+    sxx = _window_sums(x * x, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var = (sxx - sx * sx / n) / (n - 1)
+    vol = np.sqrt(np.clip(var, 0, None)) * np.sqrt(TRADING_DAYS)
+    vol[n < window] = np.nan
+    return pd.DataFrame(vol, index=returns.index, columns=returns.columns)
+
+
+def cross_sectional_dispersion(returns):
+    """Cross-sectional standard deviation of returns for each date"""
+    x = returns.to_numpy(dtype=np.float64)
+    # Dates with fewer than two returns stay NaN (and skip nanstd's warning)
+    enough = np.sum(~np.isnan(x), axis=1) > 1
+    dispersion = np.full(len(x), np.nan)
+    dispersion[enough] = np.nanstd(x[enough], axis=1, ddof=1)
+    return pd.Series(dispersion, index=returns.index, name="Dispersion")
+
+
+def rolling_correlation_matrices(
+    returns, window=60, path="rolling_correlations.npy", dtype=np.float32, chunk_size=64
+):
+    """Rolling N x N correlation matrices streamed to a .npy file on disk
+
+    Window sums of x and of the outer products x x^T are updated by adding
+    the newest day and subtracting the one leaving the window. That is the
+    cumulative-sum formulation applied one step at a time, O(N^2) per day
+    rather than N^2 separate rolling().corr() calls. The sums are recomputed
+    exactly once per window to stop rounding drift. A symbol with any
+    missing return in the window gets NaN for that date.
+
+    The output has shape (dates, N, N); matrices are buffered `chunk_size`
+    dates at a time and written to the memory-mapped file, so memory stays
+    at a few N x N arrays. Returns the memmap and the average pairwise
+    correlation per date.
+    """
+    x_all = returns.to_numpy(dtype=np.float64)
+    n_dates, n_symbols = x_all.shape
+    missing_all = np.isnan(x_all)
+    x_all = np.where(missing_all, 0.0, x_all)
+    missing_in_window = _window_sums(missing_all.astype(np.int64), window)
+
+    out = np.lib.format.open_memmap(
+        path, mode="w+", dtype=dtype, shape=(n_dates, n_symbols, n_symbols)
+    )
+    average_corr = np.full(n_dates, np.nan)
+    off_diagonal = ~np.eye(n_symbols, dtype=bool)
+    buffer = np.full((chunk_size, n_symbols, n_symbols), np.nan, dtype=dtype)
+
+    sum_x = np.zeros(n_symbols)
+    sum_xx = np.zeros((n_symbols, n_symbols))
+    for t in range(n_dates):
+        if t >= window - 1 and (t - window + 1) % window == 0:
+            block = x_all[t - window + 1 : t + 1]
+            sum_x = block.sum(axis=0)
+            sum_xx = block.T @ block
+        elif t >= window - 1:
+            new, old = x_all[t], x_all[t - window]
+            sum_x += new - old
+            sum_xx += np.outer(new, new) - np.outer(old, old)
+
+        slot = t % chunk_size
+        if t >= window - 1:
+            cov = sum_xx - np.outer(sum_x, sum_x) / window
+            std = np.sqrt(np.clip(np.diag(cov), 0, None))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                corr = cov / np.outer(std, std)
+            incomplete = (missing_in_window[t] > 0) | (std == 0)
+            corr[incomplete, :] = np.nan
+            corr[:, incomplete] = np.nan
+            buffer[slot] = corr
+            pairs = corr[off_diagonal]
+            if n_symbols > 1 and not np.all(np.isnan(pairs)):
+                average_corr[t] = np.nanmean(pairs)
+        else:
+            buffer[slot] = np.nan
+
+        if slot == chunk_size - 1 or t == n_dates - 1:
+            out[t - slot : t + 1] = buffer[: slot + 1]
+            out.flush()
+
+    return out, pd.Series(average_corr, index=returns.index, name="Average_Correlation")
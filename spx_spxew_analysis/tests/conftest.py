@@ -0,0 +1,31 @@
+# conftest.py
+"""Make the app's flat modules (cross_sectional) importable from the tests"""
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parents[1]
+
+
+def _activate_app():
+    """Put this app first on sys.path and forget another app's same-named modules
+
+    Apps in this repo share flat module names (kernels.py). Every conftest
+    is loaded before any test module is imported, so this runs again right
+    before each of this app's test modules is collected; the run then
+    passes whichever app's tests come first.
+    """
+    if str(APP_DIR) in sys.path:
+        sys.path.remove(str(APP_DIR))
+    sys.path.insert(0, str(APP_DIR))
+    for path in APP_DIR.glob("*.py"):
+        module = sys.modules.get(path.stem)
+        if module is not None and Path(getattr(module, "__file__", "") or "").parent != APP_DIR:
+            del sys.modules[path.stem]
+
+
+_activate_app()
+
+
+def pytest_pycollect_makemodule(module_path, parent):
+    # Only called for test modules under this conftest's directory
+    _activate_app()
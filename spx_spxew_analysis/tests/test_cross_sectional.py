@@ -0,0 +1,117 @@
+# test_cross_sectional.py
+"""Parity of the vectorized cross-sectional statistics with pandas rolling()"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from cross_sectional import (
+    TRADING_DAYS,
+    cross_sectional_dispersion,
+    rolling_beta,
+    rolling_correlation_matrices,
+    rolling_volatility,
+)
+
+
+def returns_frame(n_dates=120, n_symbols=5, seed=0):
+    """Daily returns with a late listing, scattered gaps and one single-symbol date"""
+    rng = np.random.default_rng(seed)
+    values = rng.normal(0.0005, 0.01, (n_dates, n_symbols))
+    values[rng.random(values.shape) < 0.03] = np.nan
+    values[:30, 1] = np.nan
+    values[50, 1:] = np.nan
+    return pd.DataFrame(
+        values,
+        index=pd.bdate_range("2023-01-02", periods=n_dates, name="Date"),
+        columns=[f"S{i}" for i in range(n_symbols)],
+    )
+
+
+def benchmark_series(index, seed=1):
+    rng = np.random.default_rng(seed)
+    values = rng.normal(0.0004, 0.008, len(index))
+    values[[5, 40, 41]] = np.nan
+    return pd.Series(values, index=index)
+
+
+def expected_beta(returns, benchmark, window, min_periods):
+    columns = {}
+    for name, x in returns.items():
+        # Both series on the days both are present, as rolling_beta does
+        y = benchmark.where(x.notna())
+        x = x.where(benchmark.notna())
+        cov = x.rolling(window, min_periods=min_periods).cov(y)
+        var = y.rolling(window, min_periods=min_periods).var()
+        columns[name] = cov / var
+    return pd.DataFrame(columns)
+
+
+def assert_parity(result, expected):
+    np.testing.assert_allclose(result, expected, rtol=1e-8, atol=1e-12, equal_nan=True)
+
+
+@pytest.mark.parametrize("window, min_periods", [(20, None), (20, 10), (60, 45)])
+def test_rolling_beta_matches_pandas(window, min_periods):
+    returns = returns_frame()
+    benchmark = benchmark_series(returns.index)
+    result = rolling_beta(returns, benchmark, window=window, min_periods=min_periods, chunk_size=2)
+    expected = expected_beta(returns, benchmark, window, min_periods or window)
+    assert_parity(result.to_numpy(), expected.to_numpy())
+    # Late listing: no beta before min_periods paired days exist
+    assert result["S1"].iloc[: 30 + (min_periods or window) - 1].isna().all()
+
+
+def test_rolling_beta_memmap(tmp_path):
+    returns = returns_frame()
+    benchmark = benchmark_series(returns.index)
+    path = tmp_path / "beta.npy"
+    stored = rolling_beta(returns, benchmark, window=20, chunk_size=3, path=path)
+    in_memory = rolling_beta(returns, benchmark, window=20)
+    assert stored.shape == returns.shape
+    assert_parity(np.asarray(stored), in_memory.to_numpy())
+    assert_parity(np.load(path), in_memory.to_numpy())
+
+
+@pytest.mark.parametrize("window", [5, 20])
+def test_rolling_volatility_matches_pandas(window):
+    returns = returns_frame()
+    expected = returns.rolling(window).std() * np.sqrt(TRADING_DAYS)
+    assert_parity(rolling_volatility(returns, window).to_numpy(), expected.to_numpy())
+
+
+def test_dispersion_matches_pandas():
+    returns = returns_frame()
+    result = cross_sectional_dispersion(returns)
+    assert_parity(result.to_numpy(), returns.std(axis=1, ddof=1).to_numpy())
+    # One symbol left on a date has no dispersion
+    assert np.isnan(result.iloc[50])
+
+
+@pytest.mark.parametrize("chunk_size", [7, 64])
+def test_rolling_correlations_match_pandas(tmp_path, chunk_size):
+    returns = returns_frame()
+    window = 20
+    path = tmp_path / "corr.npy"
+    matrices, average = rolling_correlation_matrices(
+        returns, window=window, path=path, dtype=np.float64, chunk_size=chunk_size
+    )
+
+    expected = returns.rolling(window).corr().to_numpy().reshape(matrices.shape)
+    assert_parity(np.asarray(matrices), expected)
+    assert_parity(np.load(path), expected)
+
+    off_diagonal = ~np.eye(returns.shape[1], dtype=bool)
+    pairs = expected[:, off_diagonal]
+    has_pairs = ~np.isnan(pairs).all(axis=1)
+    expected_average = np.full(len(returns), np.nan)
+    expected_average[has_pairs] = np.nanmean(pairs[has_pairs], axis=1)
+    assert_parity(average.to_numpy(), expected_average)
+    assert np.isnan(average.iloc[: window - 1]).all()
+
+
+def test_rolling_correlations_float32(tmp_path):
+    returns = returns_frame()
+    matrices, _ = rolling_correlation_matrices(returns, window=20, path=tmp_path / "corr.npy")
+    assert matrices.dtype == np.float32
+    expected = returns.rolling(20).corr().to_numpy().reshape(matrices.shape)
+    np.testing.assert_allclose(matrices, expected, rtol=0, atol=1e-5, equal_nan=True)
@@ -5,23 +5,125 @@ from datetime import datetime, timedelta
 import math
 from plotly.subplots import make_subplots
 import pandas as pd
+import numpy as np
 import io
+import os
+import logging
+import time
+import uuid
+from functools import partial
+import streamlit.components.v1 as components
+from data.metadata import MetadataService
+from data.fetcher import AsyncFetcher
+from data.history import HistoryCache
+from data.loader import DataLoader
+from data.store import FrameStore
+from indicators import MovingAverage, MACD, RSI
+from screener import Screener
+from stream import ReplaySource, SocketSource, StreamingChart, StreamRunner, StreamServer, events_script
+from instrumentation import (
+    METRICS,
+    timed,
+    request_scope,
+    profile_request,
+    start_metrics_server,
+)
+
+# Structured per-request timings are logged as JSON lines
+logging.basicConfig(level=logging.INFO)
+
+# Instrumentation flags: debug sidebar, per-request profiling
+# ("cprofile" or "pyinstrument") and the Prometheus endpoint port
+DEBUG = os.environ.get("STOCK_APP_DEBUG") == "1"
+PROFILER = os.environ.get("STOCK_APP_PROFILE")
+METRICS_PORT = os.environ.get("STOCK_APP_METRICS_PORT")
+METRICS_HOST = os.environ.get("STOCK_APP_METRICS_HOST", "127.0.0.1")
+# Opt-in compact history cache: "float32" or "ticks" (see data/compact.py)
+COMPACT = os.environ.get("STOCK_APP_COMPACT")
+# Port of the server-sent events endpoint that pushes streamed bars to the chart
+STREAM_PORT = int(os.environ.get("STOCK_APP_STREAM_PORT", "8765"))
+# Local browsers only by default; "0.0.0.0" when the app is served to other machines
+STREAM_HOST = os.environ.get("STOCK_APP_STREAM_HOST", "127.0.0.1")
+
+INDICATORS = {"Moving Average": MovingAverage, "MACD": MACD, "RSI": RSI}
+PRICE_ROW = 1
+VOLUME_ROW = 2
+INTERVALS = {"Auto": None, "Daily": "1d", "Weekly": "1wk", "Monthly": "1mo"}
+TARGET_POINTS = 500
 
 
 def initialize_session_state():
     """Initialize all session state variables"""
     if "show_chart" not in st.session_state:
         st.session_state.show_chart = False
-    if "df" not in st.session_state:
-        st.session_state.df = None
+    if "frame" not in st.session_state:
+        # Handle on the daily bars in the shared frame store, not a copy
+        st.session_state.frame = None
 
 
-def load_data(stock_ticker, start_date, end_date, multi_level_bool):
-    """Load data from Yahoo Finance"""
-    data = yf.download(
-        stock_ticker, start=start_date, end=end_date, multi_level_index=multi_level_bool
+@st.cache_resource
+def get_metrics_server():
+    """Start the /metrics endpoint once per process (when a port is configured)"""
+    return start_metrics_server(int(METRICS_PORT), host=METRICS_HOST) if METRICS_PORT else None
+
+
+@st.cache_resource
+def get_metadata_service():
+    """Process-wide metadata cache shared by all sessions"""
+    service = MetadataService()
+    service.start_refresher()
+    return service
+
+
+@st.cache_resource
+def get_fetcher():
+    """Process-wide fetch layer that de-duplicates in-flight requests"""
+    return AsyncFetcher()
+
+
+@st.cache_resource
+def get_history_cache():
+    """Process-wide daily history and OHLC pyramids, one per symbol
+
+    Each downloaded chunk goes through the data-quality stage once, before
+    it is stored, so reads never re-validate.
+    """
+    return HistoryCache(
+        load_history,
+        cleaner=DataLoader.clean_data,
+        compact=COMPACT,
+        screener=get_screener(),
     )
-    return data
+
+
+@st.cache_resource
+def get_stream_server():
+    """Process-wide endpoint pushing streamed chart points to the browsers"""
+    return StreamServer(port=STREAM_PORT, host=STREAM_HOST)
+
+
+@st.cache_resource
+def get_screener():
+    """Latest RSI/MACD values of every cached symbol, updated as bars arrive"""
+    return Screener()
+
+
+@st.cache_resource
+def get_frame_store():
+    """Process-wide read-only frames, shared by every session viewing the same data"""
+    return FrameStore()
+
+
+def load_history(stock_ticker, start=None):
+    """Load daily bars from Yahoo Finance: the full history, or from `start` on
+
+    Prices come unadjusted with the split and dividend columns; the
+    data-quality stage (DataLoader.clean_data) adjusts them once.
+    """
+    options = dict(multi_level_index=False, actions=True, auto_adjust=False)
+    if start is None:
+        return yf.download(stock_ticker, period="max", **options)
+    return yf.download(stock_ticker, start=start, **options)
 
 
 def format_number(number):
@@ -62,24 +164,115 @@ def create_volume_ticks(y_vals):
     return tick_vals, tick_texts
 
 
-def plot_stock(df, chart_type="candlestick", symbol="Stock"):
-    """Create stock price and volume chart"""
-    df.index = pd.to_datetime(df.index).date
+def compute_rangebreaks(index):
+    """Build Plotly rangebreaks that hide the gaps between bars
+
+    Weekends are always hidden, missing weekdays (holidays) are listed
+    explicitly, and for intraday data the hours outside the session seen in
+    the data are hidden as well.
+    """
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    if len(index) < 2:
+        return []
+
+    rangebreaks = [dict(bounds=["sat", "mon"])]
+
+    days = index.normalize().unique()
+    holidays = pd.bdate_range(days.min(), days.max()).difference(days)
+    if len(holidays):
+        rangebreaks.append(dict(values=holidays.strftime("%Y-%m-%d").tolist()))
+
+    if (index != index.normalize()).any():
+        step = pd.Series(index).diff().median()
+        hours = index.hour + index.minute / 60
+        session_end = hours.max() + step / pd.Timedelta(hours=1)
+        if session_end < 24:
+            rangebreaks.append(
+                dict(bounds=[session_end, hours.min()], pattern="hour")
+            )
+
+    return rangebreaks
+
+
+def plot_x(index, axis_mode="time"):
+    """X values for a trace without modifying the frame's index
+
+    On a date axis, epoch milliseconds are sent instead of datetimes: Plotly
+    reads them as dates but serializes them as a compact binary array
+    rather than one ISO string per point.
+    """
+    index = pd.DatetimeIndex(index)
+    if axis_mode == "category":
+        return index.date
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.as_unit("ms").asi8.astype(np.float64)
+
+
+@st.cache_data(ttl=600, max_entries=256)
+def compute_indicator(name, symbol, start, end, resolution, params, axis_mode, version, _df):
+    """Calculate one indicator and return its traces and subplot placement
+
+    Cached per (indicator, ticker, range, resolution, params, pyramid
+    version); the frame itself is not hashed, the other arguments identify
+    it, and the version changes whenever refreshed bars change it.
+    """
+    indicator = INDICATORS[name](_df, **dict(params))
+    indicator.calculate()
+    return indicator_result(name, indicator, axis_mode)
+
+
+def indicator_result(name, indicator, axis_mode="time"):
+    """Traces and subplot placement of a calculated indicator, for plot_stock"""
+    traces = indicator.get_traces()
+    x = plot_x(indicator.df.index, axis_mode)
+    for trace in traces:
+        trace["x"] = x
+    return {"name": name, "traces": traces, **indicator.get_subplot_params()}
+
+
+def subplot_layout(indicators):
+    """Map subplot rows requested by the indicators onto consecutive figure rows
+
+    The price (row 1) and volume (row 2) panels are always shown; indicator
+    panels (e.g. MACD on 3, RSI on 4) are only added when one is enabled.
+    """
+    rows = sorted({PRICE_ROW, VOLUME_ROW} | {ind["rows"] for ind in indicators})
+    row_map = {row: i + 1 for i, row in enumerate(rows)}
+    weights = [3.0 if row == PRICE_ROW else 1.0 for row in rows]
+    heights = [w / sum(weights) for w in weights]
+    return row_map, heights
+
+
+def plot_stock(
+    df, chart_type="candlestick", symbol="Stock", axis_mode="time", indicators=()
+):
+    """Create stock price and volume chart
+
+    axis_mode "time" keeps a native date axis with rangebreaks; "category"
+    plots one evenly spaced label per bar. `indicators` are results of
+    compute_indicator, each placed on the subplot it asks for.
+    """
+    x = plot_x(df.index, axis_mode)
+    row_map, row_heights = subplot_layout(indicators)
+    n_rows = len(row_heights)
 
     fig = make_subplots(
-        rows=2,
+        rows=n_rows,
         cols=1,
-        row_heights=[0.7, 0.3],
+        row_heights=row_heights,
         vertical_spacing=0.03,
         shared_xaxes=True,
-        specs=[[{"secondary_y": False}], [{"secondary_y": False}]],
+        specs=[[{"secondary_y": False}]] * n_rows,
     )
 
     # Add price trace
     if chart_type == "line":
         fig.add_trace(
-            go.Scatter(
-                x=df.index,
+            go.Scattergl(
+                x=x,
                 y=df["Close"],
                 name="Price",
                 line=dict(color="rgb(0, 90, 170)", width=2),
@@ -90,7 +283,7 @@ def plot_stock(df, chart_type="candlestick", symbol="Stock"):
     else:
         fig.add_trace(
             go.Candlestick(
-                x=df.index,
+                x=x,
                 open=df["Open"],
                 high=df["High"],
                 low=df["Low"],
@@ -107,34 +300,48 @@ def plot_stock(df, chart_type="candlestick", symbol="Stock"):
         )
 
     # Add volume trace
-    colors = [
-        (
-            "rgba(220, 50, 50, 0.5)"
-            if row["Close"] < row["Open"]
-            else "rgba(0, 150, 50, 0.5)"
-        )
-        for _, row in df.iterrows()
-    ]
+    colors = np.where(
+        df["Close"].to_numpy() < df["Open"].to_numpy(),
+        "rgba(220, 50, 50, 0.5)",
+        "rgba(0, 150, 50, 0.5)",
+    )
 
     fig.add_trace(
         go.Bar(
-            x=df.index,
+            x=x,
             y=df["Volume"],
             name="Volume",
             marker=dict(color=colors),
             showlegend=False,
             hoverinfo="skip",
         ),
-        row=2,
+        row=row_map[VOLUME_ROW],
         col=1,
     )
 
+    # Add indicator traces
+    for indicator in indicators:
+        row = row_map[indicator["rows"]]
+        for trace in indicator["traces"]:
+            fig.add_trace(
+                dict(trace, showlegend=indicator["show_legend"]), row=row, col=1
+            )
+        if indicator["rows"] != PRICE_ROW:
+            fig.update_yaxes(
+                title_text=indicator["name"],
+                row=row,
+                col=1,
+                gridcolor="rgba(128, 128, 128, 0.1)",
+                gridwidth=1,
+                showgrid=True,
+            )
+
     # Update layout
     fig.update_layout(
         title=dict(text=f"{symbol} Price Chart", x=0.5, y=0.95, font=dict(size=18)),
         template="plotly_white",
         hovermode="x unified",
-        height=700,
+        height=400 + 150 * n_rows,
         showlegend=True,
         legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
         paper_bgcolor="white",
@@ -161,7 +368,7 @@ def plot_stock(df, chart_type="candlestick", symbol="Stock"):
     tick_vals, tick_texts = create_volume_ticks(df["Volume"].values)
     fig.update_yaxes(
         title_text="Volume",
-        row=2,
+        row=row_map[VOLUME_ROW],
         col=1,
         gridcolor="rgba(128, 128, 128, 0.1)",
         gridwidth=1,
@@ -172,11 +379,22 @@ def plot_stock(df, chart_type="candlestick", symbol="Stock"):
     )
 
     # Update x-axes
-    for row in [1, 2]:
+    if axis_mode == "category":
+        axis_type = dict(type="category")
+    else:
+        index = pd.DatetimeIndex(df.index)
+        intraday = (index != index.normalize()).any()
+        axis_type = dict(
+            type="date",
+            rangebreaks=compute_rangebreaks(index),
+            hoverformat="%b %d, %Y %H:%M" if intraday else "%b %d, %Y",
+        )
+
+    for row in range(1, n_rows + 1):
         fig.update_xaxes(
             row=row,
             col=1,
-            type="category",
+            **axis_type,
             tickangle=0,
             tickfont=dict(size=10),
             gridcolor="rgba(128, 128, 128, 0.1)",
@@ -189,6 +407,12 @@ def plot_stock(df, chart_type="candlestick", symbol="Stock"):
     return fig
 
 
+def excel_frame(df):
+    """Drop the timezone from the index, Excel has no tz-aware datetimes"""
+    df.index = pd.to_datetime(df.index).tz_localize(None)
+    return df
+
+
 def setup_page():
     """Configure page settings and display header"""
     st.set_page_config(
@@ -212,12 +436,44 @@ def get_date_range(selected_range):
         if start_date >= end_date:
             st.error("Start date must be before end date")
     else:
-        date_ranges = {"1 Month": 30, "3 Months": 90, "6 Months": 180, "1 Year": 365}
+        date_ranges = {
+            "1 Month": 30,
+            "3 Months": 90,
+            "6 Months": 180,
+            "1 Year": 365,
+            "5 Years": 5 * 365,
+            "10 Years": 10 * 365,
+            "20 Years": 20 * 365,
+            "Max": 200 * 365,
+        }
         start_date = end_date - timedelta(days=date_ranges[selected_range])
 
     return start_date, end_date
 
 
+def select_indicators():
+    """Sidebar controls for the indicators; returns {name: params} for enabled ones"""
+    st.subheader("📐 Indicators")
+    selected = {}
+
+    if st.checkbox("Moving Averages"):
+        periods = st.multiselect("MA Periods:", [20, 50, 200], default=[20, 50])
+        if periods:
+            selected["Moving Average"] = (("periods", tuple(sorted(periods))),)
+
+    if st.checkbox("MACD"):
+        fast = st.number_input("MACD Fast:", min_value=2, value=12)
+        slow = st.number_input("MACD Slow:", min_value=3, value=26)
+        signal = st.number_input("MACD Signal:", min_value=2, value=9)
+        selected["MACD"] = (("fast", fast), ("slow", slow), ("signal", signal))
+
+    if st.checkbox("RSI"):
+        period = st.number_input("RSI Period:", min_value=2, value=14)
+        selected["RSI"] = (("period", period),)
+
+    return selected
+
+
 def show_stock_metrics(df, info):
     """Display stock metrics in columns"""
     col1, col2, col3 = st.columns(3)
@@ -238,7 +494,153 @@ def show_stock_metrics(df, info):
             st.metric("Volume", format_number(info["volume"]))
 
 
+def select_screener():
+    """Sidebar filter over the latest indicator values of all cached symbols"""
+    with st.expander("🔎 Screener"):
+        expression = st.text_input(
+            "Filter:",
+            placeholder="rsi < 30 and crossed_above(macd_hist, 0)",
+            help="Columns: close, prev_close, change_pct, volume, rsi, prev_rsi, macd, "
+            "prev_macd, signal, prev_signal, macd_hist, prev_macd_hist, bars_since_macd_up, "
+            "bars_since_macd_down, bars. Combine comparisons with and / or / not; "
+            "crossed_above(column, level) and crossed_below(column, level) compare the "
+            "last two bars, e.g. crossed_above(macd, signal).",
+        )
+    return expression.strip()
+
+
+def show_screener(expression):
+    """Symbols matching the screener filter, among the symbols cached so far"""
+    screener = get_screener()
+    try:
+        with timed("screener_query"):
+            matches = screener.query(expression, sort_by="rsi")
+    except ValueError as e:
+        st.error(str(e))
+        return
+    st.subheader(f"🔎 {len(matches)} of {len(screener)} cached symbols match")
+    st.dataframe(matches)
+
+
+def select_stream():
+    """Sidebar streaming controls; returns the stream settings, or None when off"""
+    with st.expander("📡 Streaming"):
+        source = st.radio("Bar source:", ["Off", "Replay", "Socket"], horizontal=True)
+        if source == "Replay":
+            return {
+                "source": "replay",
+                "bars": st.number_input("Replay the last N bars:", min_value=1, value=250),
+                "bars_per_second": st.number_input("Bars per second:", min_value=1, value=20),
+            }
+        if source == "Socket":
+            return {
+                "source": "socket",
+                "address": st.text_input("Feed address (host:port):", "127.0.0.1:8766"),
+            }
+    return None
+
+
+def show_stream(df, settings, chart_type, symbol, selected_indicators):
+    """Draw the chart once, then append streamed bars to it in the browser
+
+    Replay seeds the chart with all but the last N bars and plays those
+    back; Socket seeds it with all bars and appends what the feed sends.
+    Only the new points are pushed (extendTraces), the figure is never
+    rebuilt. A rerun stops this session's previous stream.
+    """
+    if settings["source"] == "replay":
+        replayed = min(int(settings["bars"]), len(df) - 1)
+        history = df.iloc[: len(df) - replayed]
+        source = ReplaySource(df.iloc[len(df) - replayed :], bars_per_second=settings["bars_per_second"])
+    else:
+        host, port = settings["address"].rsplit(":", 1)
+        history, source = df, SocketSource(host, int(port))
+
+    indicators = {}
+    for name, params in selected_indicators.items():
+        indicators[name] = INDICATORS[name](history, **dict(params))
+        indicators[name].calculate()
+    fig = plot_stock(
+        history,
+        chart_type,
+        symbol,
+        indicators=[indicator_result(name, ind) for name, ind in indicators.items()],
+    )
+
+    server = get_stream_server()
+    previous = st.session_state.get("stream")
+    if previous is not None:
+        # Stops the previous runner too
+        server.close_channel(previous["channel"])
+    channel = uuid.uuid4().hex
+    runner = StreamRunner(
+        source,
+        StreamingChart(indicators.values(), chart_type, last_timestamp=history.index[-1]),
+        partial(server.publish, channel),
+    )
+    # A session that goes away (tab closed) leaves the channel without
+    # subscribers; the server then closes it and stops the runner
+    server.open_channel(channel, on_close=runner.stop)
+    st.session_state.stream = {"runner": runner, "channel": channel}
+
+    components.html(
+        fig.to_html(include_plotlyjs="cdn", full_html=False, post_script=events_script(server.port, channel)),
+        height=fig.layout.height + 20,
+    )
+    runner.start()
+    show_stream_status(runner)
+
+
+def stream_status(runner, poll=False):
+    """Report a stream that stopped on an error (StreamRunner logs it too) or finished
+
+    With `poll` (inside a fragment) the status is re-checked once a second
+    while the runner is alive, and no more once it has ended.
+    """
+    if runner.error is not None:
+        st.error(f"Stream stopped: {runner.error}")
+    elif not runner.running:
+        st.caption(f"Stream finished after {runner.stats()['bars']} bars")
+    elif poll:
+        time.sleep(1.0)
+        st.rerun(scope="fragment")
+
+
+# Polled where Streamlit has fragments; older versions show the status as
+# of the run that started the stream
+if hasattr(st, "fragment"):
+
+    @st.fragment
+    def show_stream_status(runner):
+        stream_status(runner, poll=True)
+
+else:
+    show_stream_status = stream_status
+
+
+def show_debug_sidebar(request):
+    """Per-stage timings of this run, process counters and the profile report"""
+    with st.sidebar:
+        st.header("🛠️ Debug")
+        stages = pd.DataFrame(request.stages, columns=["Stage", "Seconds"])
+        st.dataframe(stages.groupby("Stage", sort=False).sum())
+        st.caption(f"Total: {request.as_dict()['total_ms']:.0f} ms")
+        st.json(METRICS.snapshot()["counters"])
+        if request.profile:
+            with st.expander("Profile"):
+                st.text(request.profile)
+
+
 def main():
+    get_metrics_server()
+    with request_scope("render") as request:
+        with profile_request(enabled=bool(PROFILER), backend=PROFILER):
+            render_page()
+    if DEBUG:
+        show_debug_sidebar(request)
+
+
+def render_page():
     initialize_session_state()
     setup_page()
 
@@ -248,48 +650,153 @@ def main():
         stock_ticker = st.text_input("Enter Stock Ticker:", "AAPL").upper().strip()
         selected_range = st.selectbox(
             "Select Time Period:",
-            ["1 Month", "3 Months", "6 Months", "1 Year", "Custom"],
+            [
+                "1 Month",
+                "3 Months",
+                "6 Months",
+                "1 Year",
+                "5 Years",
+                "10 Years",
+                "20 Years",
+                "Max",
+                "Custom",
+            ],
         )
         start_date, end_date = get_date_range(selected_range)
+        interval = st.selectbox("Select Interval:", list(INTERVALS))
+        selected_indicators = select_indicators()
+        screener_expression = select_screener()
+        stream_settings = select_stream()
 
         if st.button("Show Chart"):
             st.session_state.show_chart = True
 
+    if screener_expression:
+        show_screener(screener_expression)
+
     # Main content
     if st.session_state.show_chart:
         try:
             with st.spinner(f"Fetching data for {stock_ticker}..."):
-                st.session_state.df = load_data(
-                    stock_ticker, start_date, end_date, multi_level_bool=False
+                # Start the price download and the metadata lookup together
+                fetcher = get_fetcher()
+                history_future = fetcher.fetch(
+                    ("history", stock_ticker),
+                    get_history_cache().refresh,
+                    stock_ticker,
+                )
+                info_future = fetcher.fetch(
+                    ("metadata", stock_ticker),
+                    get_metadata_service().get,
+                    stock_ticker,
+                    2.0,
                 )
 
-                if st.session_state.df.empty:
+                try:
+                    with timed("load_data"):
+                        pyramid = history_future.result()
+                except TimeoutError:
+                    st.error(
+                        f"Timed out fetching data for {stock_ticker}. Please try again."
+                    )
+                    return
+
+                if pyramid is not None:
+                    # Charts use the coarsest bars that still give enough
+                    # detail for the span; metrics and exports stay daily.
+                    # Both come from the shared store, keyed by
+                    # (symbol, range, interval), so sessions viewing the
+                    # same data share one read-only copy.
+                    resolution, chart_df = pyramid.select(
+                        start_date,
+                        end_date,
+                        target_points=TARGET_POINTS,
+                        resolution=INTERVALS[interval],
+                    )
+                    store = get_frame_store()
+                    date_range = f'{start_date.strftime("%Y%m%d")}-{end_date.strftime("%Y%m%d")}'
+                    chart_frame = store.put(
+                        (stock_ticker, date_range, resolution),
+                        chart_df,
+                        version=pyramid.version,
+                    )
+                    chart_df = chart_frame.df
+                    st.session_state.frame = store.put(
+                        (stock_ticker, date_range, "1d"),
+                        pyramid.slice("1d", start_date, end_date),
+                        version=pyramid.version,
+                    )
+                    daily_df = st.session_state.frame.df
+
+                if pyramid is None or daily_df.empty:
                     st.error(
                         f"No data found for ticker {stock_ticker}. Please check the symbol and try again."
                     )
                     return
 
-                stock = yf.Ticker(stock_ticker)
-                show_stock_metrics(st.session_state.df, stock.info)
+                # Metrics are filled in after the chart so a slow lookup
+                # does not hold up the first paint
+                metrics_placeholder = st.empty()
 
                 chart_type = st.radio("Select Chart Type:", ["Candlestick", "Line"])
 
                 with st.spinner("Generating chart..."):
-                    fig = plot_stock(
-                        st.session_state.df, chart_type.lower(), stock_ticker
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
+                    if stream_settings:
+                        with timed("stream_chart"):
+                            show_stream(
+                                chart_df,
+                                stream_settings,
+                                chart_type.lower(),
+                                stock_ticker,
+                                selected_indicators,
+                            )
+                    else:
+                        indicators = []
+                        for name, params in selected_indicators.items():
+                            with timed(f"indicator.{name}"):
+                                indicators.append(
+                                    compute_indicator(
+                                        name,
+                                        stock_ticker,
+                                        start_date.strftime("%Y%m%d"),
+                                        end_date.strftime("%Y%m%d"),
+                                        resolution,
+                                        params,
+                                        "time",
+                                        pyramid.version,
+                                        chart_df,
+                                    )
+                                )
+                        with timed("plot_stock"):
+                            fig = plot_stock(
+                                chart_df,
+                                chart_type.lower(),
+                                stock_ticker,
+                                indicators=indicators,
+                            )
+                        # Includes serializing the figure to JSON
+                        with timed("render_chart"):
+                            st.plotly_chart(fig, use_container_width=True)
+                    st.caption(f"{len(chart_df):,} bars at {resolution} resolution")
+
+                try:
+                    with timed("metadata"):
+                        info = info_future.result()
+                except TimeoutError:
+                    info = {}
+                with metrics_placeholder.container():
+                    show_stock_metrics(daily_df, info)
 
                 with st.expander("Show Raw Data"):
-                    st.dataframe(st.session_state.df)
+                    st.dataframe(daily_df)
 
                 # Prepare Excel download
-                buffer = io.BytesIO()
-                df_excel = st.session_state.df.copy()
-                df_excel.index = pd.to_datetime(df_excel.index).tz_localize(None)
+                with timed("excel_export"):
+                    buffer = io.BytesIO()
+                    df_excel = st.session_state.frame.transform(excel_frame)
 
-                with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
-                    df_excel.to_excel(writer, sheet_name="Stock Data")
+                    with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
+                        df_excel.to_excel(writer, sheet_name="Stock Data")
 
                 st.download_button(
                     label="Download Data as Excel",
@@ -0,0 +1,244 @@
+# backtest.py
+import numpy as np
+import pandas as pd
+from itertools import product
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+TRADING_DAYS = 252
+METRIC_NAMES = ["total_return", "sharpe_ratio", "max_drawdown", "trades"]
+
+
+def rolling_mean(values, window):
+    """Simple moving average using a cumulative sum (NaN for the warm-up period)"""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    if window > values.shape[-1]:
+        return out
+    csum = np.cumsum(values, axis=-1)
+    out[..., window - 1] = csum[..., window - 1]
+    out[..., window:] = csum[..., window:] - csum[..., :-window]
+    out[..., window - 1 :] /= window
+    return out
+
+
+def crossover_signals(fast_ma, slow_ma, allow_short=False):
+    """Target exposure from a fast/slow moving average pair
+
+    1 while the fast average is above the slow one, otherwise 0 (or -1 when
+    short selling is allowed). The warm-up period is flat.
+    """
+    fast_ma = np.asarray(fast_ma, dtype=np.float64)
+    slow_ma = np.asarray(slow_ma, dtype=np.float64)
+    below = -1.0 if allow_short else 0.0
+    signals = np.where(fast_ma > slow_ma, 1.0, below)
+    signals[np.isnan(fast_ma) | np.isnan(slow_ma)] = 0.0
+    return signals
+
+
+def crossover_points(fast_ma, slow_ma):
+    """Boolean buy/sell masks, the array form of the notebook's shift(1) checks"""
+    fast_ma = np.asarray(fast_ma, dtype=np.float64)
+    slow_ma = np.asarray(slow_ma, dtype=np.float64)
+    above = fast_ma > slow_ma
+    below = fast_ma < slow_ma
+    buy = np.zeros(above.shape, dtype=bool)
+    sell = np.zeros(above.shape, dtype=bool)
+    buy[..., 1:] = above[..., 1:] & below[..., :-1]
+    sell[..., 1:] = below[..., 1:] & above[..., :-1]
+    return buy, sell
+
+
+def signals_to_positions(signals, lag=1):
+    """Shift signals forward so a signal seen at the close is traded on the next bar"""
+    signals = np.asarray(signals, dtype=np.float64)
+    positions = np.zeros(signals.shape)
+    if lag == 0:
+        positions[...] = signals
+    elif lag < signals.shape[-1]:
+        positions[..., lag:] = signals[..., :-lag]
+    return positions
+
+
+def calculate_drawdown(equity):
+    """Drawdown from the running peak, as in spx_spxew_analysis.py"""
+    equity = np.asarray(equity, dtype=np.float64)
+    peak = np.maximum.accumulate(equity, axis=-1)
+    return (equity - peak) / peak
+
+
+def strategy_returns(close, positions, cost_bps=0.0, slippage_bps=0.0):
+    """Per-bar strategy returns net of commission and slippage
+
+    Costs are charged on turnover, so flipping from long to short pays twice.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    asset_returns = np.zeros(close.shape)
+    asset_returns[..., 1:] = close[..., 1:] / close[..., :-1] - 1
+    turnover = np.abs(np.diff(positions, axis=-1, prepend=0.0))
+    costs = turnover * (cost_bps + slippage_bps) / 10_000
+    return positions * asset_returns - costs, turnover
+
+
+def performance_metrics(returns, turnover):
+    """Summary statistics along the last axis of a return array"""
+    equity = np.cumprod(1 + returns, axis=-1)
+    std = returns.std(axis=-1, ddof=1) if returns.shape[-1] > 1 else np.zeros(returns.shape[:-1])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std > 0, returns.mean(axis=-1) / std * np.sqrt(TRADING_DAYS), 0.0)
+    return {
+        "total_return": equity[..., -1] - 1,
+        "sharpe_ratio": sharpe,
+        "max_drawdown": calculate_drawdown(equity).min(axis=-1),
+        "trades": np.count_nonzero(turnover, axis=-1),
+    }
+
+
+def run_backtest(
+    df, fast=20, slow=50, cost_bps=0.0, slippage_bps=0.0, allow_short=False
+):
+    """Backtest an SMA crossover strategy on a single price frame
+
+    Returns a DataFrame with the moving averages, signals, positions,
+    returns, equity curve and drawdown, plus a dict of summary metrics.
+    """
+    close = df["Close"].to_numpy(dtype=np.float64)
+    fast_ma = rolling_mean(close, fast)
+    slow_ma = rolling_mean(close, slow)
+    signals = crossover_signals(fast_ma, slow_ma, allow_short)
+    positions = signals_to_positions(signals)
+    returns, turnover = strategy_returns(close, positions, cost_bps, slippage_bps)
+    buy, sell = crossover_points(fast_ma, slow_ma)
+    equity = np.cumprod(1 + returns)
+
+    result = pd.DataFrame(
+        {
+            "Close": close,
+            f"SMA_{fast}": fast_ma,
+            f"SMA_{slow}": slow_ma,
+            "Buy": buy,
+            "Sell": sell,
+            "Position": positions,
+            "Return": returns,
+            "Equity": equity,
+            "Drawdown": calculate_drawdown(equity),
+        },
+        index=df.index,
+    )
+    metrics = {
+        name: value.item()
+        for name, value in performance_metrics(returns, turnover).items()
+    }
+    return result, metrics
+
+
+def _sweep_symbol(close, fast_windows, slow_windows, cost_bps, slippage_bps, allow_short):
+    """Evaluate every (fast, slow) pair for one price series
+
+    Each distinct window is averaged once; all slow windows for a given fast
+    window are then evaluated together as a 2-D array.
+    """
+    close = close[~np.isnan(close)]
+    windows = sorted(set(fast_windows) | set(slow_windows))
+    averages = {w: rolling_mean(close, w) for w in windows}
+    slow_block = np.vstack([averages[w] for w in slow_windows])
+
+    results = np.full((len(fast_windows), len(slow_windows), len(METRIC_NAMES)), np.nan)
+    for i, fast in enumerate(fast_windows):
+        valid = np.asarray(slow_windows) > fast
+        if not valid.any() or len(close) < 2:
+            continue
+        signals = crossover_signals(averages[fast], slow_block[valid], allow_short)
+        positions = signals_to_positions(signals)
+        returns, turnover = strategy_returns(close, positions, cost_bps, slippage_bps)
+        metrics = performance_metrics(returns, turnover)
+        results[i, valid] = np.column_stack([metrics[name] for name in METRIC_NAMES])
+    return results
+
+
+def _sweep_worker(shm_name, shape, rows, fast_windows, slow_windows, cost_bps, slippage_bps, allow_short):
+    """Process-pool entry point that reads prices from shared memory"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        prices = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        return [
+            (
+                row,
+                _sweep_symbol(
+                    prices[row], fast_windows, slow_windows, cost_bps, slippage_bps, allow_short
+                ),
+            )
+            for row in rows
+        ]
+    finally:
+        shm.close()
+
+
+def parameter_sweep(
+    prices,
+    fast_windows,
+    slow_windows,
+    cost_bps=0.0,
+    slippage_bps=0.0,
+    allow_short=False,
+    max_workers=None,
+    chunk_size=8,
+):
+    """Evaluate a grid of (fast, slow) windows across many symbols
+
+    `prices` is a DataFrame of closing prices with one column per symbol.
+    The price matrix is placed in shared memory once and the symbols are
+    split across a process pool. Pairs where fast >= slow are skipped.
+    Returns a long-format DataFrame with one row per (symbol, fast, slow).
+    """
+    fast_windows = [int(w) for w in fast_windows]
+    slow_windows = [int(w) for w in slow_windows]
+    symbols = list(prices.columns)
+    matrix = np.ascontiguousarray(prices.ffill().to_numpy(dtype=np.float64).T)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+    shared = None
+    try:
+        shared = np.ndarray(matrix.shape, dtype=np.float64, buffer=shm.buf)
+        shared[:] = matrix
+        del matrix
+
+        chunks = [
+            list(range(start, min(start + chunk_size, len(symbols))))
+            for start in range(0, len(symbols), chunk_size)
+        ]
+        results = np.full(
+            (len(symbols), len(fast_windows), len(slow_windows), len(METRIC_NAMES)),
+            np.nan,
+        )
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    _sweep_worker,
+                    shm.name,
+                    shared.shape,
+                    rows,
+                    fast_windows,
+                    slow_windows,
+                    cost_bps,
+                    slippage_bps,
+                    allow_short,
+                )
+                for rows in chunks
+            ]
+            for future in futures:
+                for row, values in future.result():
+                    results[row] = values
+    finally:
+        # The view must go before close(), which fails while the buffer is
+        # exported; on an error that BufferError would hide the real one
+        del shared
+        shm.close()
+        shm.unlink()
+
+    index = pd.MultiIndex.from_tuples(
+        list(product(symbols, fast_windows, slow_windows)),
+        names=["symbol", "fast", "slow"],
+    )
+    sweep = pd.DataFrame(results.reshape(-1, len(METRIC_NAMES)), index=index, columns=METRIC_NAMES)
+    return sweep.dropna(how="all")
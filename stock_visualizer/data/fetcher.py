@@ -0,0 +1,56 @@
+# data/fetcher.py
+import asyncio
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncFetcher:
+    """Non-blocking fetch layer shared by all sessions in the process
+
+    Blocking provider calls run in a thread pool driven by an asyncio event
+    loop on a background thread. Identical requests that are in flight at
+    the same time share one upstream call (single-flight), and every caller
+    gets its own timeout without cancelling the shared call for the others.
+    """
+
+    def __init__(self, max_workers=8, timeout=20.0):
+        self.timeout = timeout
+        self.upstream_calls = Counter()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._in_flight = {}  # only touched from the event loop thread
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+    async def _call_upstream(self, key, func, args):
+        self.upstream_calls[key[0]] += 1
+        return await self._loop.run_in_executor(self._executor, func, *args)
+
+    async def _single_flight(self, key, func, args):
+        task = self._in_flight.get(key)
+        if task is None:
+            task = self._loop.create_task(self._call_upstream(key, func, args))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # Shield so a caller timing out does not cancel the shared call
+        return await asyncio.shield(task)
+
+    async def _with_timeout(self, key, func, args, timeout):
+        return await asyncio.wait_for(self._single_flight(key, func, args), timeout)
+
+    def fetch(self, key, func, *args, timeout=None):
+        """Schedule func(*args) under `key` and return a concurrent Future
+
+        Calls with an equal key made while one is running join it instead of
+        starting another. `key[0]` names the kind of request in the counters.
+        The Future raises TimeoutError after `timeout` seconds.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        return asyncio.run_coroutine_threadsafe(
+            self._with_timeout(key, func, args, timeout), self._loop
+        )
+
+    def in_flight(self):
+        """Number of distinct upstream calls currently running"""
+        return len(self._in_flight)
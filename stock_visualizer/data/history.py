@@ -0,0 +1,112 @@
+# data/history.py
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from data.resample import OHLCPyramid
+from instrumentation import METRICS, timed
+
+logger = logging.getLogger("stock_visualizer.history")
+
+
+class HistoryCache:
+    """Full daily history per symbol, kept with its OHLC pyramid
+
+    The first request for a symbol downloads its whole history once; later
+    requests only fetch bars since the last stored one (at most every
+    `refresh_interval` seconds) and update the pyramid incrementally.
+
+    With a `cleaner` (e.g. DataLoader.clean_data) every downloaded chunk is
+    cleaned once before it is stored; its report is kept per symbol, and a
+    split or dividend it reports back-adjusts the stored history. With
+    `compact` the pyramids are stored as CompactBars (see data/compact.py).
+    With a `screener` (see screener.py) every stored symbol's latest
+    indicator values are kept current as its bars arrive.
+    """
+
+    def __init__(self, loader, refresh_interval=15 * 60, max_symbols=256, cleaner=None, compact=None, screener=None):
+        # loader(symbol, start=None) returns daily bars, all of them when start is None
+        self.loader = loader
+        # cleaner(bars) returns (clean bars, report)
+        self.cleaner = cleaner
+        # "float32" or "ticks" to hold the pyramids as CompactBars
+        self.compact = compact
+        self.screener = screener
+        self.reports = {}
+        self.refresh_interval = refresh_interval
+        self.max_symbols = max_symbols
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _store(self, symbol, pyramid):
+        with self._lock:
+            self._entries[symbol] = {"pyramid": pyramid, "checked_at": time.time()}
+            self._entries.move_to_end(symbol)
+            while len(self._entries) > self.max_symbols:
+                evicted, _ = self._entries.popitem(last=False)
+                if self.screener is not None:
+                    self.screener.remove(evicted)
+
+    def get(self, symbol):
+        """Return the cached pyramid for a symbol (or None) without fetching"""
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is not None:
+                self._entries.move_to_end(symbol)
+        return entry["pyramid"] if entry else None
+
+    def _load(self, symbol, start=None):
+        """Download (and clean) bars; returns (bars, report), the report empty without cleaning"""
+        report = {}
+        with timed("history_download"):
+            bars = self.loader(symbol, start=start)
+        METRICS.inc("history_downloads")
+        if bars is not None:
+            # In-memory size of what was downloaded, a proxy for bytes on the wire
+            METRICS.inc("history_download_bytes", int(bars.memory_usage(deep=True).sum()))
+        if self.cleaner is not None and bars is not None and not bars.empty:
+            with timed("data_quality"):
+                bars, report = self.cleaner(bars)
+            self.reports[symbol] = report
+            for issue, count in report.items():
+                if issue not in ("rows_in", "rows_out") and isinstance(count, int) and count:
+                    METRICS.inc(f"quality_{issue}", count)
+            logger.info(json.dumps({"event": "data_quality", "symbol": symbol, **report}))
+        return bars, report
+
+    def refresh(self, symbol):
+        """Return an up-to-date pyramid for a symbol, or None if it has no data"""
+        with self._lock:
+            entry = self._entries.get(symbol)
+        METRICS.inc("history_cache_misses" if entry is None else "history_cache_hits")
+        if entry is None:
+            daily, _ = self._load(symbol)
+            if daily is None or daily.empty:
+                return None
+            pyramid = OHLCPyramid(daily, compact=self.compact)
+            self._store(symbol, pyramid)
+            if self.screener is not None:
+                self.screener.load(symbol, pyramid.daily)
+            return pyramid
+
+        pyramid = entry["pyramid"]
+        if time.time() - entry["checked_at"] >= self.refresh_interval:
+            # Re-download the last stored bar too, it may have been partial
+            new_bars, report = self._load(symbol, start=pyramid.last_timestamp)
+            adjusted = "prior_price_factor" in report or "prior_split_factor" in report
+            if adjusted:
+                # A split or dividend in the new bars changes every earlier price
+                pyramid.adjust(
+                    new_bars.index[0],
+                    report.get("prior_price_factor", 1.0),
+                    report.get("prior_split_factor", 1.0),
+                )
+            pyramid.update(new_bars)
+            self._store(symbol, pyramid)
+            if self.screener is not None and (adjusted or not self.screener.append(symbol, new_bars)):
+                # The stored history was adjusted, or the new bars reach
+                # further back than the last stored one
+                self.screener.load(symbol, pyramid.daily)
+        return pyramid
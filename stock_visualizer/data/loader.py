@@ -1,6 +1,12 @@
 # data/loader.py
 import yfinance as yf
 import pandas as pd
+import numpy as np
+from pandas.tseries.holiday import USFederalHolidayCalendar
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Adj Close"]
+ACTION_COLUMNS = ["Dividends", "Stock Splits"]
+MAX_REPORTED_DATES = 10
 
 
 class DataLoader:
@@ -24,3 +30,134 @@ class DataLoader:
         """Check if dataframe has required columns"""
         required_columns = ["Open", "High", "Low", "Close", "Volume"]
         return all(col in df.columns for col in required_columns)
+
+    @staticmethod
+    def clean_data(df, outlier_threshold=8.0, adjust=True):
+        """Repair and adjust one chunk of OHLCV bars; returns (clean frame, report)
+
+        Every check is a vectorized pass over the price arrays:
+        - out-of-order timestamps are sorted, duplicate timestamps keep the last bar
+        - bars with a missing, zero or negative price are dropped
+        - High/Low are widened to cover Open and Close (fixes High < Low too)
+        - missing weekdays between daily bars are counted, US federal
+          holidays excluded
+        - with `adjust`, "Stock Splits" and "Dividends" columns (present when
+          downloading with actions=True, auto_adjust=False) are turned into
+          backward adjustment factors and then dropped, so a chunk is
+          adjusted exactly once. Bars stored before the chunk need the same
+          adjustment: the report's "prior_price_factor" and
+          "prior_split_factor" (present when not 1) are for the caller to
+          apply to them (see OHLCPyramid.adjust)
+        - jumps more than `outlier_threshold` robust deviations from the
+          median daily log return are reported, not changed
+
+        Meant to run once when a chunk is stored, not on every read.
+        """
+        report = {"rows_in": len(df)}
+        if df.empty:
+            report["rows_out"] = 0
+            return df, report
+
+        index = pd.DatetimeIndex(df.index)
+        ts = index.asi8
+        report["unsorted"] = int(np.count_nonzero(ts[1:] < ts[:-1]))
+        if report["unsorted"]:
+            order = np.argsort(ts, kind="stable")
+            df, index, ts = df.iloc[order], index[order], ts[order]
+
+        duplicated = np.zeros(len(ts), dtype=bool)
+        duplicated[:-1] = ts[1:] == ts[:-1]
+        report["duplicates"] = int(np.count_nonzero(duplicated))
+
+        price_columns = [col for col in PRICE_COLUMNS if col in df.columns]
+        prices = df[price_columns].to_numpy(dtype=np.float64)
+        # NaN compares False, so missing prices are caught here as well
+        invalid = ~(prices > 0).all(axis=1)
+        report["non_positive"] = int(np.count_nonzero(invalid & ~duplicated))
+
+        keep = ~(duplicated | invalid)
+        df = df.loc[keep].copy()
+        index, prices = index[keep], prices[keep]
+
+        if {"Open", "High", "Low", "Close"} <= set(price_columns):
+            ohlc = df[["Open", "High", "Low", "Close"]].to_numpy(dtype=np.float64)
+            high, low = ohlc.max(axis=1), ohlc.min(axis=1)
+            report["high_low"] = int(np.count_nonzero(ohlc[:, 1] < ohlc[:, 2]))
+            report["ohlc_repaired"] = int(
+                np.count_nonzero((ohlc[:, 1] != high) | (ohlc[:, 2] != low))
+            )
+            if report["ohlc_repaired"]:
+                df["High"], df["Low"] = high, low
+
+        local = index.tz_localize(None) if index.tz is not None else index
+        if len(local) > 1 and (local == local.normalize()).all():
+            dates = local.to_numpy().astype("datetime64[D]")
+            holidays = USFederalHolidayCalendar().holidays(local[0], local[-1])
+            gaps = np.busday_count(
+                dates[:-1], dates[1:], holidays=holidays.to_numpy().astype("datetime64[D]")
+            ) - 1
+            report["missing_days"] = int(gaps[gaps > 0].sum())
+            report["largest_gap"] = int(gaps.max(initial=0))
+
+        if adjust and any(col in df.columns for col in ACTION_COLUMNS):
+            _adjust_corporate_actions(df, report)
+
+        if "Close" in df.columns and len(df) > 20:
+            returns = np.diff(np.log(df["Close"].to_numpy(dtype=np.float64)))
+            deviation = np.abs(returns - np.median(returns))
+            scale = 1.4826 * np.median(deviation)
+            if scale > 0:
+                jumps = np.flatnonzero(deviation > outlier_threshold * scale) + 1
+                report["outliers"] = len(jumps)
+                report["outlier_dates"] = [
+                    str(day.date()) for day in df.index[jumps[:MAX_REPORTED_DATES]]
+                ]
+
+        report["rows_out"] = len(df)
+        return df, report
+
+
+def _adjust_corporate_actions(df, report):
+    """Back-adjust prices (and volume, for splits) in place, then drop the action columns
+
+    A split of ratio r on day i divides all earlier prices by r; a dividend
+    D divides them by close[i-1] / (close[i-1] - D). The factor for each bar
+    is the product of the steps after it: a reversed cumulative product.
+    Bars before the chunk take the factor of its first bar, reported when
+    it is not 1.
+    """
+    n = len(df)
+    close = df["Close"].to_numpy(dtype=np.float64)
+    split_step = np.ones(n)
+    dividend_step = np.ones(n)
+
+    if "Stock Splits" in df.columns:
+        ratios = df["Stock Splits"].to_numpy(dtype=np.float64)
+        has_split = ratios > 0
+        split_step[has_split] = 1.0 / ratios[has_split]
+        report["splits"] = int(np.count_nonzero(has_split))
+    if "Dividends" in df.columns:
+        cash = df["Dividends"].to_numpy(dtype=np.float64)
+        has_dividend = cash > 0
+        has_dividend[0] = False  # no earlier close to adjust against
+        prev_close = np.roll(close, 1)
+        dividend_step[has_dividend] = 1.0 - cash[has_dividend] / prev_close[has_dividend]
+        report["dividends"] = int(np.count_nonzero(has_dividend))
+
+    def factors(step):
+        # Factor for bar j: product of the steps of bars j+1..n-1
+        after = np.cumprod(step[::-1])[::-1]
+        return np.append(after[1:], 1.0)
+
+    split_factor = factors(split_step)
+    price_factor = split_factor * factors(dividend_step)
+    if price_factor[0] != 1.0:
+        report["prior_price_factor"] = float(price_factor[0])
+    if split_factor[0] != 1.0:
+        report["prior_split_factor"] = float(split_factor[0])
+    for col in PRICE_COLUMNS:
+        if col in df.columns and col != "Adj Close":
+            df[col] = df[col].to_numpy(dtype=np.float64) * price_factor
+    if "Volume" in df.columns:
+        df["Volume"] = np.rint(df["Volume"].to_numpy(dtype=np.float64) / split_factor).astype(np.int64)
+    df.drop(columns=[col for col in ACTION_COLUMNS if col in df.columns], inplace=True)
@@ -0,0 +1,175 @@
+# data/metadata.py
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import yfinance as yf
+
+from instrumentation import METRICS, timed
+
+logger = logging.getLogger("stock_visualizer.metadata")
+
+
+class MetadataService:
+    """TTL cache for ticker metadata with background refresh and batched lookups
+
+    Only the fields the app displays are kept, and the cache is persisted to a
+    local JSON file so a restarted process starts warm. Lookups never block
+    longer than the caller's timeout: a stale entry is returned while it is
+    refreshed, and a missing one comes back empty until its fetch completes.
+    A failed fetch is cached for `error_ttl` seconds (keeping any older data)
+    so a bad symbol is not looked up again on every rerun.
+    """
+
+    FIELDS = ("marketCap", "volume")
+
+    def __init__(
+        self,
+        cache_path=".cache/metadata.json",
+        ttl=15 * 60,
+        error_ttl=60,
+        refresh_interval=60,
+        hot_size=20,
+        max_workers=8,
+    ):
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.refresh_interval = refresh_interval
+        self.hot_size = hot_size
+        # Batches wait on per-symbol lookups, so they get separate pools
+        self._batch_executor = ThreadPoolExecutor(max_workers=2)
+        self._lookup_executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._lock = threading.RLock()
+        self._pending = {}
+        self._hits = Counter()
+        self._stop = threading.Event()
+        self._refresher = None
+        self._cache = self._load_cache()
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, "r") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_cache(self):
+        with self._lock:
+            snapshot = dict(self._cache)
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(snapshot, file)
+        os.replace(tmp_path, self.cache_path)
+
+    def _ttl(self, entry):
+        return self.error_ttl if "error" in entry else self.ttl
+
+    def _is_fresh(self, entry):
+        return entry is not None and time.time() - entry["fetched_at"] < self._ttl(entry)
+
+    def _fetch_one(self, tickers, symbol):
+        """Fetch a single symbol's info and store the displayed fields"""
+        try:
+            info = tickers.tickers[symbol].info or {}
+        except Exception as e:
+            METRICS.inc("metadata_errors")
+            logger.warning(json.dumps({"event": "metadata_error", "symbol": symbol, "error": str(e)}))
+            with self._lock:
+                previous = self._cache.get(symbol)
+                self._cache[symbol] = {
+                    "data": previous["data"] if previous else {},
+                    "fetched_at": time.time(),
+                    "error": str(e),
+                }
+            return
+        data = {key: info[key] for key in self.FIELDS if info.get(key) is not None}
+        with self._lock:
+            self._cache[symbol] = {"data": data, "fetched_at": time.time()}
+
+    @timed("metadata_fetch")
+    def _fetch_batch(self, symbols):
+        tickers = yf.Tickers(" ".join(symbols))
+        wait([self._lookup_executor.submit(self._fetch_one, tickers, s) for s in symbols])
+        self._save_cache()
+
+    def _schedule(self, symbols):
+        """Start one fetch for all symbols that are not already in flight"""
+        with self._lock:
+            futures = {s: self._pending[s] for s in symbols if s in self._pending}
+            missing = [s for s in symbols if s not in futures]
+            if missing:
+                future = self._batch_executor.submit(self._fetch_batch, missing)
+                for symbol in missing:
+                    self._pending[symbol] = future
+                future.add_done_callback(lambda _, batch=missing: self._clear_pending(batch))
+                futures.update({s: future for s in missing})
+        return futures
+
+    def _clear_pending(self, symbols):
+        with self._lock:
+            for symbol in symbols:
+                self._pending.pop(symbol, None)
+
+    def get_many(self, symbols, timeout=0.0):
+        """Return {symbol: metadata} for many symbols, fetching stale ones in one batch
+
+        Waits at most `timeout` seconds for symbols that have no cached
+        entry at all; those missing when time runs out map to {}.
+        """
+        symbols = [s.upper() for s in symbols]
+        with self._lock:
+            self._hits.update(symbols)
+            entries = {s: self._cache.get(s) for s in symbols}
+
+        stale = [s for s, entry in entries.items() if not self._is_fresh(entry)]
+        METRICS.inc("metadata_cache_hits", len(symbols) - len(stale))
+        METRICS.inc("metadata_cache_misses", len(stale))
+        if stale:
+            futures = self._schedule(stale)
+            waiting = [futures[s] for s in stale if entries[s] is None]
+            if waiting and timeout > 0:
+                wait(waiting, timeout=timeout)
+                with self._lock:
+                    entries = {s: self._cache.get(s) for s in symbols}
+
+        return {s: (entry["data"] if entry else {}) for s, entry in entries.items()}
+
+    def get(self, symbol, timeout=0.0):
+        """Return metadata for one symbol, or {} if it is not available in time"""
+        return self.get_many([symbol], timeout)[symbol.upper()]
+
+    def prefetch(self, symbol):
+        """Start loading a symbol's metadata without waiting for it"""
+        self.get_many([symbol])
+
+    def _refresh_hot(self):
+        while not self._stop.wait(self.refresh_interval):
+            with self._lock:
+                hot = [s for s, _ in self._hits.most_common(self.hot_size)]
+                # Refresh a little before expiry so hot symbols never go stale
+                due = [
+                    s
+                    for s in hot
+                    if s not in self._cache
+                    or time.time() - self._cache[s]["fetched_at"] > 0.8 * self._ttl(self._cache[s])
+                ]
+            if due:
+                self._schedule(due)
+
+    def start_refresher(self):
+        """Keep the most requested symbols fresh from a daemon thread"""
+        if self._refresher is None or not self._refresher.is_alive():
+            self._stop.clear()
+            self._refresher = threading.Thread(target=self._refresh_hot, daemon=True)
+            self._refresher.start()
+
+    def stop(self):
+        self._stop.set()
+        self._batch_executor.shutdown(wait=False)
+        self._lookup_executor.shutdown(wait=False)
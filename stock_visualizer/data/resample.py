@@ -0,0 +1,169 @@
+# data/resample.py
+import itertools
+
+import pandas as pd
+
+from data.compact import CompactBars
+
+# Resolution name -> pandas period alias used to bucket the daily bars
+RESOLUTIONS = {"1d": None, "1wk": "W", "1mo": "M"}
+
+AGGREGATIONS = {
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Adj Close": "last",
+    "Volume": "sum",
+}
+
+# Process-wide source of OHLCPyramid versions
+_VERSIONS = itertools.count(1)
+
+
+def aggregate_ohlcv(daily, period):
+    """Aggregate daily bars into weekly ("W") or monthly ("M") bars
+
+    Each bar is labelled with the timestamp of its first trading day, so
+    the aggregated index only contains real trading days.
+    """
+    if daily.empty:
+        return daily.copy()
+    index = daily.index
+    keys = (index.tz_localize(None) if index.tz is not None else index).to_period(period)
+    agg = {col: how for col, how in AGGREGATIONS.items() if col in daily.columns}
+    grouped = daily.groupby(keys)
+    bars = grouped.agg(agg)
+    bars.index = pd.DatetimeIndex(pd.Series(index, index=index).groupby(keys).first())
+    bars.index.name = index.name
+    return bars
+
+
+class OHLCPyramid:
+    """Daily, weekly and monthly OHLCV levels built once per symbol
+
+    New daily bars are merged with `update`, which only re-aggregates the
+    weeks and months they touch. `select` picks the finest level that shows
+    a date span in at most `target_points` bars.
+
+    With `compact` ("float32" or "ticks") the levels are held as
+    CompactBars and unpacked to frames only for the slices that are read.
+
+    `version` changes whenever the bars do, including a revised last bar
+    that keeps its timestamp, and is never reused within the process.
+    """
+
+    def __init__(self, daily, compact=None):
+        self.compact = compact
+        self._build(daily)
+
+    def _build(self, daily):
+        self.version = next(_VERSIONS)
+        daily = daily.sort_index()
+        daily = daily[~daily.index.duplicated(keep="last")]
+        self.levels = {"1d": self._pack(daily)}
+        for name, period in RESOLUTIONS.items():
+            if period is not None:
+                self.levels[name] = self._pack(aggregate_ohlcv(daily, period))
+
+    def _pack(self, bars):
+        return CompactBars.from_frame(bars, self.compact) if self.compact else bars
+
+    def _frame(self, resolution):
+        level = self.levels[resolution]
+        return level.to_frame() if self.compact else level
+
+    @property
+    def daily(self):
+        return self._frame("1d")
+
+    @property
+    def last_timestamp(self):
+        level = self.levels["1d"]
+        if self.compact:
+            return level.last_timestamp
+        return level.index[-1] if len(level) else None
+
+    @property
+    def nbytes(self):
+        if self.compact:
+            return sum(level.nbytes for level in self.levels.values())
+        return sum(int(level.memory_usage().sum()) for level in self.levels.values())
+
+    def update(self, new_bars):
+        """Merge new (or revised) daily bars and refresh the affected buckets"""
+        if new_bars is None or new_bars.empty:
+            return
+        new_bars = new_bars.sort_index()
+        new_bars = new_bars[~new_bars.index.duplicated(keep="last")]
+        first_new = new_bars.index[0]
+
+        daily = self.daily
+        daily = pd.concat([daily[daily.index < first_new], new_bars])
+        self.levels["1d"] = self._pack(daily)
+        self.version = next(_VERSIONS)
+
+        for name, period in RESOLUTIONS.items():
+            if period is None:
+                continue
+            # Recompute from the start of the first bucket that received new bars
+            bucket_start = _align(
+                first_new.tz_localize(None).to_period(period).start_time, daily.index
+            )
+            level = self._frame(name)
+            tail = aggregate_ohlcv(daily[daily.index >= bucket_start], period)
+            self.levels[name] = self._pack(pd.concat([level[level.index < bucket_start], tail]))
+
+    def adjust(self, before, price_factor=1.0, split_factor=1.0):
+        """Back-adjust the bars before a timestamp for a later split or dividend
+
+        Open/High/Low/Close are multiplied by `price_factor` and volume is
+        divided by `split_factor` (see DataLoader.clean_data); every level
+        is rebuilt.
+        """
+        daily = self.daily.copy()
+        earlier = daily.index < _align(before, daily.index)
+        for col in ("Open", "High", "Low", "Close"):
+            if col in daily.columns:
+                daily.loc[earlier, col] = daily.loc[earlier, col] * price_factor
+        if "Volume" in daily.columns and split_factor != 1.0:
+            volume = daily["Volume"].to_numpy(dtype="float64")
+            volume[earlier] = (volume[earlier] / split_factor).round()
+            daily["Volume"] = volume.astype(daily["Volume"].dtype)
+        self._build(daily)
+
+    def slice(self, resolution, start=None, end=None):
+        """Bars of one level between start and end (inclusive)"""
+        level = self.levels[resolution]
+        if self.compact:
+            lo = 0 if start is None else level.searchsorted(start, "left")
+            hi = len(level) if end is None else level.searchsorted(end, "right")
+            return level.take(lo, hi).to_frame()
+        index = level.index
+        lo = 0 if start is None else index.searchsorted(_align(start, index), "left")
+        hi = len(index) if end is None else index.searchsorted(_align(end, index), "right")
+        return level.iloc[lo:hi]
+
+    def select(self, start=None, end=None, target_points=500, resolution=None):
+        """Return (resolution, bars) for a date span
+
+        With `resolution` given that level is used; otherwise the finest
+        level with no more than `target_points` bars in the span.
+        """
+        if resolution is not None:
+            return resolution, self.slice(resolution, start, end)
+        for name in RESOLUTIONS:
+            bars = self.slice(name, start, end)
+            if len(bars) <= target_points:
+                return name, bars
+        return name, bars
+
+
+def _align(timestamp, index):
+    """Make a bound comparable with a (possibly tz-aware) index"""
+    timestamp = pd.Timestamp(timestamp)
+    if index.tz is not None and timestamp.tz is None:
+        return timestamp.tz_localize(index.tz)
+    if index.tz is None and timestamp.tz is not None:
+        return timestamp.tz_localize(None)
+    return timestamp
@@ -0,0 +1,152 @@
+# data/store.py
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import METRICS
+
+
+def _freeze(df):
+    """Copy a frame once into read-only column arrays
+
+    In-place writes to the stored frame then fail (or, with pandas
+    copy-on-write, copy) instead of silently changing what other sessions see.
+    """
+    columns = {}
+    for col in df.columns:
+        values = np.array(df[col].to_numpy(), copy=True)
+        values.flags.writeable = False
+        columns[col] = values
+    return pd.DataFrame(columns, index=df.index.copy(), copy=False)
+
+
+def _nbytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class FrameHandle:
+    """A session's reference to a stored frame
+
+    Sessions keep handles (not frames) in their state. The reference is
+    released when the handle is garbage collected, e.g. when the session
+    stores another handle in its place or the session ends.
+    """
+
+    def __init__(self, store, key):
+        self.store = store
+        self.key = key
+        self._finalizer = weakref.finalize(self, store._release, key)
+
+    @property
+    def df(self):
+        return self.store.get(self.key)
+
+    def transform(self, func):
+        return self.store.transform(self.key, func)
+
+    def release(self):
+        self._finalizer()
+
+
+class FrameStore:
+    """Read-only frames shared by all sessions, keyed by (symbol, range, interval)
+
+    Each frame is held once per process however many sessions look at it.
+    Frames referenced by a live handle are never evicted; unreferenced ones
+    stay cached and are evicted least recently used first once the store
+    holds more than `max_bytes`.
+    """
+
+    def __init__(self, max_bytes=512 * 2**20):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        # Re-entrant: a handle can be garbage collected (and release its
+        # reference) while this thread already holds the lock
+        self._lock = threading.RLock()
+
+    def put(self, key, df, version=None):
+        """Store a frame (unless the same version is already stored) and return a handle
+
+        `version` identifies the data behind the key, e.g. the version of
+        the pyramid it was sliced from. It must change whenever the data
+        does, including a revised bar that keeps its timestamp; a different
+        version replaces the stored frame and existing handles see the new one.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["version"] == version:
+                METRICS.inc("frame_store_hits")
+                return self.acquire(key)
+        METRICS.inc("frame_store_misses")
+
+        # Copy outside the lock, other sessions keep reading meanwhile
+        frozen = _freeze(df)
+        with self._lock:
+            entry = self._entries.get(key)
+            refs = entry["refs"] if entry else 0
+            if entry is not None:
+                self.nbytes -= entry["nbytes"]
+            entry = {"df": frozen, "version": version, "refs": refs, "nbytes": _nbytes(frozen)}
+            self._entries[key] = entry
+            self.nbytes += entry["nbytes"]
+            return self.acquire(key)
+
+    def acquire(self, key):
+        """Return a new handle on a stored frame, or None if it is not stored"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry["refs"] += 1
+            self._entries.move_to_end(key)
+            self._evict()
+        return FrameHandle(self, key)
+
+    def get(self, key):
+        """The stored read-only frame for a key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry["df"]
+
+    def transform(self, key, func):
+        """Apply a per-session transform to a copy-on-write view of a stored frame
+
+        `func` gets a shallow copy: adding columns or replacing the index
+        only affects the copy, and with copy-on-write (always on in pandas 3)
+        writing to existing values copies the affected columns first, so the
+        shared frame is never modified.
+        """
+        df = self.get(key)
+        if df is None:
+            return None
+        return func(df.copy(deep=False))
+
+    def refs(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry["refs"] if entry else 0
+
+    def _release(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["refs"] > 0:
+                entry["refs"] -= 1
+            self._evict()
+
+    def _evict(self):
+        # Called with the lock held
+        if self.nbytes <= self.max_bytes:
+            return
+        for key in [k for k, e in self._entries.items() if e["refs"] == 0]:
+            entry = self._entries.pop(key)
+            self.nbytes -= entry["nbytes"]
+            METRICS.inc("frame_store_evictions")
+            if self.nbytes <= self.max_bytes:
+                break
@@ -2,13 +2,17 @@
 import pandas as pd
 import numpy as np
 from abc import ABC, abstractmethod
+from collections import deque
+from kernels import ema, rolling_sum
+from data.compact import CompactBars
 
 
 class TechnicalIndicator(ABC):
     """Abstract base class for technical indicators"""
 
     def __init__(self, df):
-        self.df = df.copy()
+        # CompactBars inputs are unpacked to a float64 frame
+        self.df = df.to_frame() if isinstance(df, CompactBars) else df.copy()
         self.traces = []
 
     @abstractmethod
@@ -25,6 +29,62 @@ class TechnicalIndicator(ABC):
         """Get subplot parameters for the indicator"""
         return {"rows": 1, "show_legend": True}  # Default to main price chart
 
+    def stream(self):
+        """Updater continuing the indicator one bar at a time, in O(1) per bar
+
+        Call after calculate(): the updater is seeded from the frame's
+        history, and its update(bar) returns the new point of each trace, in
+        get_traces order.
+        """
+        raise NotImplementedError(f"{type(self).__name__} has no streaming update")
+
+
+class RollingMeanState:
+    """Trailing mean over a window, updated in O(1) per value"""
+
+    def __init__(self, window, history=()):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.updates = 0
+        for value in history[-window:]:
+            self.update(value)
+
+    def update(self, value):
+        if len(self.values) == self.window:
+            self.total -= self.values[0]
+        self.values.append(value)
+        self.total += value
+        self.updates += 1
+        if self.updates % self.window == 0:
+            # Re-add the window exactly so rounding error cannot build up
+            self.total = sum(self.values)
+        return self.mean
+
+    @property
+    def mean(self):
+        return self.total / self.window if len(self.values) == self.window else np.nan
+
+
+class EMAState:
+    """Exponential moving average (adjust=False), updated in O(1) per value"""
+
+    def __init__(self, span, last=np.nan):
+        self.alpha = 2.0 / (span + 1.0)
+        self.last = last
+        # Weight of `last`, decaying over NaN gaps as in kernels.ema
+        self.weight = 1.0
+
+    def update(self, value):
+        if np.isnan(self.last):
+            self.last = value
+            return self.last
+        self.weight *= 1.0 - self.alpha
+        if not np.isnan(value):
+            self.last = (self.weight * self.last + self.alpha * value) / (self.weight + self.alpha)
+            self.weight = 1.0
+        return self.last
+
 
 class MovingAverage(TechnicalIndicator):
     def __init__(self, df, periods=[20, 50, 200]):
@@ -44,7 +104,7 @@ class MovingAverage(TechnicalIndicator):
         ]
         return [
             {
-                "type": "scatter",
+                "type": "scattergl",
                 "x": self.df.index,
                 "y": self.df[f"MA{period}"],
                 "name": f"{period}-day MA",
@@ -53,6 +113,19 @@ class MovingAverage(TechnicalIndicator):
             for period, color in zip(self.periods, colors)
         ]
 
+    def stream(self):
+        close = self.df["Close"].to_numpy(dtype=np.float64)
+        return MovingAverageStream(self.periods, close)
+
+
+class MovingAverageStream:
+    def __init__(self, periods, close):
+        self.means = [RollingMeanState(period, close) for period in periods]
+        self.n_traces = len(self.means)
+
+    def update(self, bar):
+        return [{"y": mean.update(bar.close)} for mean in self.means]
+
 
 class MACD(TechnicalIndicator):
     def __init__(self, df, fast=12, slow=26, signal=9):
@@ -62,24 +135,25 @@ class MACD(TechnicalIndicator):
         self.signal = signal
 
     def calculate(self):
-        exp1 = self.df["Close"].ewm(span=self.fast, adjust=False).mean()
-        exp2 = self.df["Close"].ewm(span=self.slow, adjust=False).mean()
-        self.df["MACD"] = exp1 - exp2
-        self.df["Signal"] = self.df["MACD"].ewm(span=self.signal, adjust=False).mean()
-        self.df["MACD_Hist"] = self.df["MACD"] - self.df["Signal"]
+        close = self.df["Close"].to_numpy(dtype=np.float64)
+        macd = ema(close, span=self.fast) - ema(close, span=self.slow)
+        signal = ema(macd, span=self.signal)
+        self.df["MACD"] = macd
+        self.df["Signal"] = signal
+        self.df["MACD_Hist"] = macd - signal
         return self.df
 
     def get_traces(self):
         return [
             {
-                "type": "scatter",
+                "type": "scattergl",
                 "x": self.df.index,
                 "y": self.df["MACD"],
                 "name": "MACD",
                 "line": {"color": "rgb(0, 0, 255)", "width": 1.5},
             },
             {
-                "type": "scatter",
+                "type": "scattergl",
                 "x": self.df.index,
                 "y": self.df["Signal"],
                 "name": "Signal",
@@ -91,14 +165,11 @@ class MACD(TechnicalIndicator):
                 "y": self.df["MACD_Hist"],
                 "name": "MACD Histogram",
                 "marker": {
-                    "color": [
-                        (
-                            "rgba(0, 150, 50, 0.5)"
-                            if val >= 0
-                            else "rgba(220, 50, 50, 0.5)"
-                        )
-                        for val in self.df["MACD_Hist"]
-                    ]
+                    "color": np.where(
+                        self.df["MACD_Hist"].to_numpy() >= 0,
+                        "rgba(0, 150, 50, 0.5)",
+                        "rgba(220, 50, 50, 0.5)",
+                    )
                 },
             },
         ]
@@ -106,6 +177,42 @@ class MACD(TechnicalIndicator):
     def get_subplot_params(self):
         return {"rows": 3, "show_legend": True}  # Display in third subplot
 
+    def stream(self):
+        close = self.df["Close"].to_numpy(dtype=np.float64)
+        fast = EMAState(self.fast, ema(close, span=self.fast)[-1] if len(close) else np.nan)
+        slow = EMAState(self.slow, ema(close, span=self.slow)[-1] if len(close) else np.nan)
+        signal = EMAState(self.signal, self.df["Signal"].iloc[-1] if len(close) else np.nan)
+        return MACDStream(fast, slow, signal)
+
+
+class MACDStream:
+    n_traces = 3
+
+    def __init__(self, fast, slow, signal):
+        self.fast = fast
+        self.slow = slow
+        self.signal = signal
+
+    def update(self, bar):
+        macd = self.fast.update(bar.close) - self.slow.update(bar.close)
+        signal = self.signal.update(macd)
+        hist = macd - signal
+        color = "rgba(0, 150, 50, 0.5)" if hist >= 0 else "rgba(220, 50, 50, 0.5)"
+        return [{"y": macd}, {"y": signal}, {"y": hist, "marker.color": color}]
+
+
+# Average gains or losses below this are rounding residue of a flat window
+RSI_ZERO = 1e-12
+
+
+def rsi_from_averages(gain, loss):
+    """RSI from average gain and loss: NaN over a flat window, always within [0, 100]"""
+    gain = np.where(np.asarray(gain) < RSI_ZERO, 0.0, gain)
+    loss = np.where(np.asarray(loss) < RSI_ZERO, 0.0, loss)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = gain / loss
+    return np.clip(100 - (100 / (1 + rs)), 0.0, 100.0)
+
 
 class RSI(TechnicalIndicator):
     def __init__(self, df, period=14):
@@ -113,17 +220,16 @@ class RSI(TechnicalIndicator):
         self.period = period
 
     def calculate(self):
-        delta = self.df["Close"].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=self.period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=self.period).mean()
-        rs = gain / loss
-        self.df["RSI"] = 100 - (100 / (1 + rs))
+        delta = np.diff(self.df["Close"].to_numpy(dtype=np.float64), prepend=np.nan)
+        gain = rolling_sum(np.where(delta > 0, delta, 0.0), self.period) / self.period
+        loss = rolling_sum(np.where(delta < 0, -delta, 0.0), self.period) / self.period
+        self.df["RSI"] = rsi_from_averages(gain, loss)
         return self.df
 
     def get_traces(self):
         return [
             {
-                "type": "scatter",
+                "type": "scattergl",
                 "x": self.df.index,
                 "y": self.df["RSI"],
                 "name": f"RSI ({self.period})",
@@ -133,3 +239,36 @@ class RSI(TechnicalIndicator):
 
     def get_subplot_params(self):
         return {"rows": 4, "show_legend": True}  # Display in fourth subplot
+
+    def stream(self):
+        close = self.df["Close"].to_numpy(dtype=np.float64)
+        return RSIStream(self.period, close)
+
+
+class RSIStream:
+    """Rolling gain/loss sums over the last `period` changes, as in RSI.calculate
+
+    A bar without a finite close is skipped, like a NaN in kernels.ema: the
+    last RSI is repeated and the next close is compared with the last
+    finite one.
+    """
+
+    n_traces = 1
+
+    def __init__(self, period, close):
+        self.period = period
+        # As in calculate, the first bar counts as no change
+        delta = np.diff(close, prepend=close[:1])
+        self.gains = RollingMeanState(period, np.where(delta > 0, delta, 0.0))
+        self.losses = RollingMeanState(period, np.where(delta < 0, -delta, 0.0))
+        finite = close[np.isfinite(close)]
+        self.last_close = finite[-1] if len(finite) else np.nan
+
+    def update(self, bar):
+        if not np.isfinite(bar.close):
+            return [{"y": float(rsi_from_averages(self.gains.mean, self.losses.mean))}]
+        delta = 0.0 if np.isnan(self.last_close) else bar.close - self.last_close
+        self.last_close = bar.close
+        gain = self.gains.update(max(delta, 0.0))
+        loss = self.losses.update(max(-delta, 0.0))
+        return [{"y": float(rsi_from_averages(gain, loss))}]
@@ -0,0 +1,223 @@
+# instrumentation.py
+import contextvars
+import cProfile
+import errno
+import functools
+import io
+import json
+import logging
+import pstats
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger("stock_visualizer.metrics")
+
+_current_request = contextvars.ContextVar("current_request", default=None)
+
+
+class Metrics:
+    """Process-wide counters and stage timings, exportable for Prometheus"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = defaultdict(float)
+        self.timings = defaultdict(lambda: {"count": 0, "sum": 0.0, "max": 0.0})
+
+    def inc(self, name, value=1):
+        with self._lock:
+            self.counters[name] += value
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            timing = self.timings[stage]
+            timing["count"] += 1
+            timing["sum"] += seconds
+            timing["max"] = max(timing["max"], seconds)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "timings": {stage: dict(t) for stage, t in self.timings.items()},
+            }
+
+    def render_prometheus(self):
+        """Metrics in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = []
+        for name, value in sorted(snapshot["counters"].items()):
+            metric = f"stock_app_{name}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value:g}"]
+        if snapshot["timings"]:
+            lines.append("# TYPE stock_app_stage_seconds summary")
+            for stage, timing in sorted(snapshot["timings"].items()):
+                label = f'{{stage="{stage}"}}'
+                lines.append(f"stock_app_stage_seconds_count{label} {timing['count']}")
+                lines.append(f"stock_app_stage_seconds_sum{label} {timing['sum']:.6f}")
+            lines.append("# TYPE stock_app_stage_seconds_max gauge")
+            for stage, timing in sorted(snapshot["timings"].items()):
+                lines.append(f'stock_app_stage_seconds_max{{stage="{stage}"}} {timing["max"]:.6f}')
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+
+
+class RequestContext:
+    """Stage timings and profile output collected during one script run"""
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.perf_counter()
+        self.stages = []
+        self.profile = None
+
+    def as_dict(self):
+        return {
+            "event": "request",
+            "request": self.name,
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 3),
+            "stages": {stage: round(seconds * 1000, 3) for stage, seconds in self.stages},
+        }
+
+
+@contextmanager
+def request_scope(name="render"):
+    """Collect timings for everything run inside the block and log them as JSON"""
+    context = RequestContext(name)
+    token = _current_request.set(context)
+    try:
+        yield context
+    finally:
+        _current_request.reset(token)
+        logger.info(json.dumps(context.as_dict()))
+
+
+def current_request():
+    return _current_request.get()
+
+
+class timed:
+    """Time a stage, as a context manager or a decorator
+
+    The duration goes to the process-wide metrics, to the current request
+    (if any) and to the JSON log.
+    """
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self._start
+        METRICS.observe(self.stage, seconds)
+        context = current_request()
+        if context is not None:
+            context.stages.append((self.stage, seconds))
+        logger.debug(json.dumps({"event": "stage", "stage": self.stage, "ms": round(seconds * 1000, 3)}))
+        return False
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(self.stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+
+@contextmanager
+def profile_request(enabled=False, backend="cprofile"):
+    """Profile the block with cProfile or pyinstrument and attach the report
+
+    Does nothing unless enabled. pyinstrument is optional; cProfile is
+    used when it is not installed.
+    """
+    if not enabled:
+        yield
+        return
+
+    context = current_request()
+    profiler = None
+    if backend == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+
+            profiler = Profiler()
+        except ImportError:
+            backend = "cprofile"
+    if profiler is None:
+        profiler = cProfile.Profile()
+
+    if backend == "pyinstrument":
+        profiler.start()
+    else:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if backend == "pyinstrument":
+            profiler.stop()
+            report = profiler.output_text(unicode=True)
+        else:
+            profiler.disable()
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(30)
+            report = stream.getvalue()
+        if context is not None:
+            context.profile = report
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/metrics":
+            body = METRICS.render_prometheus().encode()
+            content_type = "text/plain; version=0.0.4"
+        elif self.path == "/metrics.json":
+            body = json.dumps(METRICS.snapshot()).encode()
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def bind_http_server(host, port, handler):
+    """ThreadingHTTPServer on host:port, or on a free port when that one is in use
+
+    A second app process on the same machine then still starts; the port
+    actually bound is logged and in `server.server_address`.
+    """
+    try:
+        return ThreadingHTTPServer((host, port), handler)
+    except OSError as e:
+        if e.errno != errno.EADDRINUSE:
+            raise
+    server = ThreadingHTTPServer((host, 0), handler)
+    logger.warning(
+        json.dumps({"event": "port_in_use", "port": port, "bound": server.server_address[1]})
+    )
+    return server
+
+
+def start_metrics_server(port=9100, host="127.0.0.1"):
+    """Serve /metrics (Prometheus) and /metrics.json from a daemon thread
+
+    Only local clients can connect unless `host` is e.g. "0.0.0.0".
+    """
+    server = bind_http_server(host, port, _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
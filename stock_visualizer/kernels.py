@@ -0,0 +1,276 @@
+# kernels.py
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    import numba
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+DEFAULT_BACKEND = "numba" if NUMBA_AVAILABLE else "numpy"
+
+
+def _resolve(backend):
+    backend = backend or DEFAULT_BACKEND
+    if backend == "numba" and not NUMBA_AVAILABLE:
+        raise ImportError("The numba backend requires numba to be installed")
+    if backend not in ("numba", "numpy"):
+        raise ValueError(f"Unknown backend: {backend}")
+    return backend
+
+
+# ---------------------------------------------------------------------------
+# NumPy implementations
+# ---------------------------------------------------------------------------
+
+
+def _recursive_smooth_numpy(values, alpha, start, init):
+    """y[start] = init, y[t] = (1 - alpha) * y[t-1] + alpha * x[t] afterwards
+
+    The recursion is solved in closed form block by block: within a block
+    y[k] = beta^(k+1) * (y_prev + alpha * cumsum(x[j] * beta^-(j+1))). Blocks
+    are short enough that beta^-k stays far from overflowing.
+    """
+    out = np.full(values.shape, np.nan)
+    if start >= len(values):
+        return out
+    out[start] = init
+    beta = 1.0 - alpha
+    if beta <= 0.0:
+        out[start + 1 :] = values[start + 1 :]
+        return out
+
+    block = max(1, int(150 / -np.log10(beta)))
+    scale = beta ** -np.arange(1, block + 1, dtype=np.float64)
+    prev = init
+    for lo in range(start + 1, len(values), block):
+        chunk = values[lo : lo + block]
+        p = scale[: len(chunk)]
+        smoothed = (prev + alpha * np.cumsum(chunk * p)) / p
+        out[lo : lo + len(chunk)] = smoothed
+        prev = smoothed[-1]
+    return out
+
+
+def _ema_numpy(values, alpha):
+    """Runs of observations are smoothed in closed form, NaN gaps bridged as pandas does"""
+    out = np.full(values.shape, np.nan)
+    observed = np.flatnonzero(~np.isnan(values))
+    if not len(observed):
+        return out
+    beta = 1.0 - alpha
+    runs = np.split(observed, np.flatnonzero(np.diff(observed) > 1) + 1)
+    prev = prev_at = None
+    for run in runs:
+        lo, hi = run[0], run[-1] + 1
+        if prev is None:
+            init = values[lo]
+        else:
+            # The old value's weight kept decaying over the gap
+            decay = beta ** (lo - prev_at)
+            init = (decay * prev + alpha * values[lo]) / (decay + alpha)
+            out[prev_at + 1 : lo] = prev
+        out[lo:hi] = _recursive_smooth_numpy(values[lo:hi], alpha, 0, init)
+        prev, prev_at = out[hi - 1], hi - 1
+    out[prev_at + 1 :] = prev
+    return out
+
+
+# Rolling sums are rebuilt from a fresh cumsum every block of this many
+# values, so rounding error stays that of a short sum on any series length
+SUM_BLOCK = 1 << 16
+
+
+def _rolling_sum_numpy(values, window):
+    out = np.full(values.shape, np.nan)
+    if window > len(values):
+        return out
+    missing = np.isnan(values)
+    clean = np.where(missing, 0.0, values)
+    block = max(SUM_BLOCK, window)
+    for lo in range(window - 1, len(values), block):
+        hi = min(lo + block, len(values))
+        csum = np.cumsum(clean[lo - window + 1 : hi])
+        out[lo] = csum[window - 1]
+        out[lo + 1 : hi] = csum[window:] - csum[: hi - lo - 1]
+    # A window of zeros sums to exactly zero (RSI over a flat window is 0 / 0),
+    # one holding a NaN to NaN, as in pandas
+    out[_window_counts(clean != 0, window) == 0] = 0.0
+    out[_window_counts(missing, window) > 0] = np.nan
+    return out
+
+
+def _window_counts(flags, window):
+    """Number of True flags in each trailing window (-1 until the window is full)"""
+    counts = np.cumsum(flags, dtype=np.int64)
+    out = np.full(len(flags), -1, dtype=np.int64)
+    out[window - 1] = counts[window - 1]
+    out[window:] = counts[window:] - counts[:-window]
+    return out
+
+
+def _rolling_extreme_numpy(values, window, reducer):
+    out = np.full(values.shape, np.nan)
+    if window > len(values):
+        return out
+    out[window - 1 :] = reducer(sliding_window_view(values, window), axis=1)
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Numba implementations (compiled on first use)
+# ---------------------------------------------------------------------------
+
+if NUMBA_AVAILABLE:
+
+    @numba.njit(cache=True)
+    def _recursive_smooth_numba(values, alpha, start, init):
+        out = np.full(values.shape, np.nan)
+        if start >= len(values):
+            return out
+        out[start] = init
+        prev = init
+        for i in range(start + 1, len(values)):
+            prev = prev + alpha * (values[i] - prev)
+            out[i] = prev
+        return out
+
+    @numba.njit(cache=True)
+    def _ema_numba(values, alpha):
+        # pandas' ewm(adjust=False) loop: NaNs carry the last value forward
+        # while the old value's weight keeps decaying
+        out = np.full(values.shape, np.nan)
+        beta = 1.0 - alpha
+        prev = np.nan
+        weight = 1.0
+        for i in range(len(values)):
+            value = values[i]
+            if np.isnan(prev):
+                prev = value
+            else:
+                weight *= beta
+                if not np.isnan(value):
+                    prev = (weight * prev + alpha * value) / (weight + alpha)
+                    weight = 1.0
+            out[i] = prev
+        return out
+
+    @numba.njit(cache=True)
+    def _rolling_sum_numba(values, window):
+        # Running total over the non-NaN values, recomputed exactly every
+        # `window` steps so rounding error cannot build up
+        out = np.full(values.shape, np.nan)
+        total = 0.0
+        nonzero = 0
+        missing = 0
+        for i in range(len(values)):
+            value = values[i]
+            old = values[i - window] if i >= window else 0.0
+            if i >= window - 1 and (i + 1) % window == 0:
+                total = 0.0
+                for j in range(i - window + 1, i + 1):
+                    if not np.isnan(values[j]):
+                        total += values[j]
+            else:
+                if not np.isnan(value):
+                    total += value
+                if not np.isnan(old):
+                    total -= old
+            nonzero += value != 0 and not np.isnan(value)
+            nonzero -= old != 0 and not np.isnan(old)
+            missing += np.isnan(value)
+            missing -= np.isnan(old)
+            if i >= window - 1:
+                if missing:
+                    out[i] = np.nan
+                elif nonzero:
+                    out[i] = total
+                else:
+                    # A window of zeros sums to exactly zero
+                    out[i] = 0.0
+        return out
+
+    @numba.njit(cache=True)
+    def _rolling_extreme_numba(values, window, is_max):
+        # Monotonic deque of indices: O(n) whatever the window length.
+        # NaNs stay out of the deque; a window holding one is NaN, as in pandas
+        out = np.full(values.shape, np.nan)
+        deque = np.empty(len(values), dtype=np.int64)
+        head = 0
+        tail = 0
+        missing = 0
+        for i in range(len(values)):
+            if np.isnan(values[i]):
+                missing += 1
+            else:
+                while tail > head and (
+                    (is_max and values[deque[tail - 1]] <= values[i])
+                    or (not is_max and values[deque[tail - 1]] >= values[i])
+                ):
+                    tail -= 1
+                deque[tail] = i
+                tail += 1
+            if i >= window and np.isnan(values[i - window]):
+                missing -= 1
+            if tail > head and deque[head] <= i - window:
+                head += 1
+            if i >= window - 1 and missing == 0:
+                out[i] = values[deque[head]]
+        return out
+
+
+# ---------------------------------------------------------------------------
+# Public kernels
+# ---------------------------------------------------------------------------
+
+
+def ema(values, span=None, alpha=None, backend=None):
+    """Exponential moving average, same as Series.ewm(span, adjust=False).mean()
+
+    NaNs are skipped as in pandas: the last average is carried forward.
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    if alpha is None:
+        alpha = 2.0 / (span + 1.0)
+    if len(values) == 0:
+        return values.copy()
+    if _resolve(backend) == "numba":
+        return _ema_numba(values, alpha)
+    return _ema_numpy(values, alpha)
+
+
+def wilder(values, period, backend=None):
+    """Wilder smoothing: seeded with the first `period`-bar mean, alpha = 1 / period"""
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    if len(values) < period:
+        return np.full(values.shape, np.nan)
+    init = values[:period].mean()
+    if _resolve(backend) == "numba":
+        return _recursive_smooth_numba(values, 1.0 / period, period - 1, init)
+    return _recursive_smooth_numpy(values, 1.0 / period, period - 1, init)
+
+
+def rolling_sum(values, window, backend=None):
+    """Sum over a trailing window (NaN until the window is full, exactly 0 over zeros)"""
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    if _resolve(backend) == "numba":
+        return _rolling_sum_numba(values, window)
+    return _rolling_sum_numpy(values, window)
+
+
+def rolling_max(values, window, backend=None):
+    """Maximum over a trailing window (NaN until the window is full)"""
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    if _resolve(backend) == "numba":
+        return _rolling_extreme_numba(values, window, True)
+    return _rolling_extreme_numpy(values, window, np.max)
+
+
+def rolling_min(values, window, backend=None):
+    """Minimum over a trailing window (NaN until the window is full)"""
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    if _resolve(backend) == "numba":
+        return _rolling_extreme_numba(values, window, False)
+    return _rolling_extreme_numpy(values, window, np.min)
@@ -0,0 +1,105 @@
+# kernels_benchmark.py
+"""Parity checks and timings for the indicator kernels
+
+    python kernels_benchmark.py                 # parity + 1k..10M benchmark
+    python kernels_benchmark.py --sizes 1000 100000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import kernels
+
+BACKENDS = ["numpy"] + (["numba"] if kernels.NUMBA_AVAILABLE else [])
+
+
+def wilder_reference(values, period):
+    """Plain Python loop for Wilder smoothing"""
+    out = np.full(len(values), np.nan)
+    if len(values) < period:
+        return out
+    out[period - 1] = values[:period].mean()
+    for i in range(period, len(values)):
+        out[i] = out[i - 1] + (values[i] - out[i - 1]) / period
+    return out
+
+
+KERNELS = {
+    "ema": lambda values, backend: kernels.ema(values, span=26, backend=backend),
+    "wilder": lambda values, backend: kernels.wilder(values, 14, backend=backend),
+    "rolling_sum": lambda values, backend: kernels.rolling_sum(values, 50, backend=backend),
+    "rolling_max": lambda values, backend: kernels.rolling_max(values, 50, backend=backend),
+    "rolling_min": lambda values, backend: kernels.rolling_min(values, 50, backend=backend),
+}
+
+
+def references(values):
+    """Kernel name -> expected result from pandas (or a plain loop)"""
+    series = pd.Series(values)
+    return {
+        "ema": series.ewm(span=26, adjust=False).mean().to_numpy(),
+        "wilder": wilder_reference(values, 14),
+        "rolling_sum": series.rolling(50).sum().to_numpy(),
+        "rolling_max": series.rolling(50).max().to_numpy(),
+        "rolling_min": series.rolling(50).min().to_numpy(),
+    }
+
+
+def check_parity(sizes=(1, 13, 14, 100, 10_000), seed=0):
+    """Compare every backend with the pandas/loop reference; raise on mismatch"""
+    rng = np.random.default_rng(seed)
+    for size in sizes:
+        for values in (
+            100 + np.cumsum(rng.normal(0, 1, size)),  # price-like
+            rng.normal(0, 1, size),  # mixed sign, like the MACD line
+        ):
+            for name, expected in references(values).items():
+                for backend in BACKENDS:
+                    result = KERNELS[name](values, backend)
+                    if not np.allclose(result, expected, rtol=1e-9, atol=1e-9, equal_nan=True):
+                        raise AssertionError(f"{name} ({backend}) differs at size {size}")
+    print(f"Parity OK for {', '.join(BACKENDS)} backends")
+
+
+def benchmark(sizes, repeats=3, seed=0):
+    """Best-of-`repeats` wall time per kernel, backend and input size"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for size in sizes:
+        values = 100 + np.cumsum(rng.normal(0, 1, size))
+        for name, kernel in KERNELS.items():
+            for backend in BACKENDS:
+                kernel(values, backend)  # warm up (and JIT-compile)
+                best = min(_timed(kernel, values, backend) for _ in range(repeats))
+                rows.append({"kernel": name, "backend": backend, "size": size, "seconds": best})
+    table = pd.DataFrame(rows).pivot_table(
+        index=["kernel", "size"], columns="backend", values="seconds"
+    )
+    if "numba" in table:
+        table["speedup"] = table["numpy"] / table["numba"]
+    return table
+
+
+def _timed(kernel, values, backend):
+    start = time.perf_counter()
+    kernel(values, backend)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Indicator kernel parity and benchmarks")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    check_parity()
+    with pd.option_context("display.float_format", "{:.6f}".format):
+        print(benchmark(args.sizes, args.repeats))
+
+
+if __name__ == "__main__":
+    main()
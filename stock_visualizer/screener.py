@@ -0,0 +1,495 @@
+# screener.py
+import ast
+import threading
+from functools import lru_cache, reduce
+
+import numpy as np
+import pandas as pd
+
+from kernels import ema
+
+# Columns that filter expressions can use and queries return
+COLUMNS = [
+    "close",
+    "prev_close",
+    "change_pct",
+    "volume",
+    "rsi",
+    "prev_rsi",
+    "macd",
+    "prev_macd",
+    "signal",
+    "prev_signal",
+    "macd_hist",
+    "prev_macd_hist",
+    "bars_since_macd_up",
+    "bars_since_macd_down",
+    "bars",
+]
+
+# Values that move to their prev_ column when a new bar starts, so the last
+# bar can be revised (and crossovers detected) from the bar before it
+ROLLED = [
+    "close",
+    "ema_fast",
+    "ema_slow",
+    "macd",
+    "signal",
+    "rsi",
+    "macd_hist",
+    "bars_since_macd_up",
+    "bars_since_macd_down",
+]
+
+STATE = ["ema_fast", "ema_slow"] + [f"prev_{name}" for name in ROLLED]
+
+# Columns crossed_above / crossed_below can compare (they have a prev_ twin)
+CROSSABLE = [name for name in COLUMNS if f"prev_{name}" in COLUMNS]
+
+NO_BAR = np.iinfo(np.int64).min
+
+
+class Screener:
+    """Latest RSI and MACD values of many symbols in one columnar table
+
+    Each column is a NumPy array with one row per symbol, so a filter is a
+    few vectorized comparisons over the whole universe. The indicators use
+    the same definitions as indicators.py (RSI over a simple `rsi_period`
+    mean of gains and losses, MACD from adjust=False EMAs) but are carried
+    forward one bar at a time: the EMAs, the last `rsi_period` gains and
+    losses and the previous bar's values are all the state a symbol needs.
+
+    A bar with the same timestamp as a symbol's last one replaces it (a
+    partial bar being revised); later bars are appended. `bars_since_macd_up`
+    counts bars since the MACD histogram last turned positive (0 = on the
+    last bar, NaN = never), `bars_since_macd_down` likewise for negative.
+    """
+
+    def __init__(self, rsi_period=14, fast=12, slow=26, signal=9, capacity=1024):
+        self.rsi_period = rsi_period
+        self.alphas = {
+            "ema_fast": 2.0 / (fast + 1.0),
+            "ema_slow": 2.0 / (slow + 1.0),
+            "signal": 2.0 / (signal + 1.0),
+        }
+        self._lock = threading.Lock()
+        self._rows = {}
+        self._free = []
+        self._size = 0
+        self._capacity = 0
+        self._cols = {}
+        self._symbols = np.empty(0, dtype=object)
+        self._active = np.zeros(0, dtype=bool)
+        self._grow(capacity)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, symbol):
+        return symbol in self._rows
+
+    def _grow(self, capacity):
+        def extend(array, fill, shape=()):
+            grown = np.full((capacity,) + shape, fill, dtype=array.dtype if array is not None else None)
+            if array is not None:
+                grown[: len(array)] = array
+            return grown
+
+        for name in set(COLUMNS + STATE) - {"bars"}:
+            self._cols[name] = extend(self._cols.get(name), np.nan)
+        self._cols["bars"] = extend(self._cols.get("bars"), 0).astype(np.int64)
+        self._cols["timestamp"] = extend(self._cols.get("timestamp"), NO_BAR).astype(np.int64)
+        self._cols["gains"] = extend(self._cols.get("gains"), 0.0, (self.rsi_period,))
+        self._cols["losses"] = extend(self._cols.get("losses"), 0.0, (self.rsi_period,))
+        self._symbols = extend(self._symbols, None).astype(object)
+        self._active = extend(self._active, False).astype(bool)
+        self._capacity = capacity
+
+    def _reset(self, row):
+        for name in set(COLUMNS + STATE) - {"bars"}:
+            self._cols[name][row] = np.nan
+        self._cols["bars"][row] = 0
+        self._cols["timestamp"][row] = NO_BAR
+        self._cols["gains"][row] = 0.0
+        self._cols["losses"][row] = 0.0
+
+    def _row(self, symbol):
+        row = self._rows.get(symbol)
+        if row is not None:
+            return row
+        if self._free:
+            row = self._free.pop()
+        else:
+            if self._size == self._capacity:
+                self._grow(self._capacity * 2)
+            row = self._size
+            self._size += 1
+        self._reset(row)
+        self._rows[symbol] = row
+        self._symbols[row] = symbol
+        self._active[row] = True
+        return row
+
+    def remove(self, symbol):
+        """Drop a symbol from the table (e.g. when its history is evicted)"""
+        with self._lock:
+            row = self._rows.pop(symbol, None)
+            if row is not None:
+                self._active[row] = False
+                self._symbols[row] = None
+                self._free.append(row)
+
+    def load(self, symbol, bars):
+        """(Re)build a symbol's row from its full daily history"""
+        if bars is None or bars.empty:
+            self.remove(symbol)
+            return
+        close = bars["Close"].to_numpy(dtype=np.float64)
+        n = len(close)
+        ema_fast = ema(close, alpha=self.alphas["ema_fast"])
+        ema_slow = ema(close, alpha=self.alphas["ema_slow"])
+        macd = ema_fast - ema_slow
+        signal = ema(macd, alpha=self.alphas["signal"])
+        hist = macd - signal
+
+        # Same first-bar convention as RSI.calculate: no change on bar 0
+        delta = np.diff(close, prepend=close[0])
+        gains = np.where(delta > 0, delta, 0.0)
+        losses = np.where(delta < 0, -delta, 0.0)
+
+        def last(values, back=0):
+            return values[n - 1 - back] if n > back else np.nan
+
+        def bars_since(turned, back=0):
+            # Bars between the last turn at or before bar n-1-back and that bar
+            hits = np.flatnonzero(turned[: n - back])
+            return float(n - 1 - back - hits[-1]) if len(hits) else np.nan
+
+        up = np.zeros(n, dtype=bool)
+        down = np.zeros(n, dtype=bool)
+        up[1:] = (hist[1:] > 0) & (hist[:-1] <= 0)
+        down[1:] = (hist[1:] < 0) & (hist[:-1] >= 0)
+
+        with self._lock:
+            row = self._row(symbol)
+            cols = self._cols
+            # The ring slot of bar i is i % rsi_period
+            window = np.arange(max(0, n - self.rsi_period), n)
+            cols["gains"][row, window % self.rsi_period] = gains[window]
+            cols["losses"][row, window % self.rsi_period] = losses[window]
+            cols["bars"][row] = n
+            cols["timestamp"][row] = _timestamps(bars.index)[-1]
+            cols["volume"][row] = last(bars["Volume"].to_numpy(dtype=np.float64)) if "Volume" in bars else np.nan
+            for name, values in (("close", close), ("ema_fast", ema_fast), ("ema_slow", ema_slow),
+                                 ("macd", macd), ("signal", signal), ("macd_hist", hist)):
+                cols[name][row] = last(values)
+                if f"prev_{name}" in cols:
+                    cols[f"prev_{name}"][row] = last(values, 1)
+            cols["change_pct"][row] = _change_pct(last(close), last(close, 1))
+            cols["rsi"][row] = _rsi(gains[-self.rsi_period:].sum(), losses[-self.rsi_period:].sum()) if n >= self.rsi_period else np.nan
+            cols["prev_rsi"][row] = (
+                _rsi(gains[-self.rsi_period - 1 : -1].sum(), losses[-self.rsi_period - 1 : -1].sum())
+                if n > self.rsi_period else np.nan
+            )
+            cols["bars_since_macd_up"][row] = bars_since(up)
+            cols["prev_bars_since_macd_up"][row] = bars_since(up, 1) if n > 1 else np.nan
+            cols["bars_since_macd_down"][row] = bars_since(down)
+            cols["prev_bars_since_macd_down"][row] = bars_since(down, 1) if n > 1 else np.nan
+
+    def update(self, symbols, timestamps, close, volume=None):
+        """Apply one new (or revised) bar to each of several symbols at once
+
+        `symbols` must not repeat; bars older than a symbol's last bar are
+        ignored. Returns the number of bars applied.
+        """
+        symbols = list(symbols)
+        if len(set(symbols)) != len(symbols):
+            raise ValueError("update takes at most one bar per symbol; use append for several")
+        timestamps = _timestamps(timestamps)
+        close = np.asarray(close, dtype=np.float64)
+        volume = np.full(len(symbols), np.nan) if volume is None else np.asarray(volume, dtype=np.float64)
+        with self._lock:
+            rows = np.fromiter((self._row(symbol) for symbol in symbols), dtype=np.int64, count=len(symbols))
+            return self._apply(rows, timestamps, close, volume)
+
+    def append(self, symbol, bars):
+        """Apply a symbol's new daily bars in order
+
+        Returns False, without changing anything, when the bars start before
+        the symbol's last bar: those need a full `load`.
+        """
+        if bars is None or bars.empty:
+            return True
+        bars = bars.sort_index()
+        timestamps = _timestamps(bars.index)
+        close = bars["Close"].to_numpy(dtype=np.float64)
+        volume = bars["Volume"].to_numpy(dtype=np.float64) if "Volume" in bars else np.full(len(bars), np.nan)
+        with self._lock:
+            row = self._row(symbol)
+            if timestamps[0] < self._cols["timestamp"][row]:
+                return False
+            rows = np.array([row])
+            for i in range(len(timestamps)):
+                self._apply(rows, timestamps[i : i + 1], close[i : i + 1], volume[i : i + 1])
+        return True
+
+    def _apply(self, rows, timestamps, close, volume):
+        cols = self._cols
+        last = cols["timestamp"][rows]
+        keep = timestamps >= last
+        rows, timestamps, close, volume = rows[keep], timestamps[keep], close[keep], volume[keep]
+        if not len(rows):
+            return 0
+
+        # A new bar makes the current values the previous ones; a revised
+        # bar is recomputed from the same previous values again
+        new = rows[timestamps > cols["timestamp"][rows]]
+        for name in ROLLED:
+            cols[f"prev_{name}"][new] = cols[name][new]
+        cols["bars"][new] += 1
+        cols["timestamp"][rows] = timestamps
+
+        bars = cols["bars"][rows]
+        first = bars == 1
+        prev_close = cols["prev_close"][rows]
+        delta = np.where(first, 0.0, close - prev_close)
+        slot = (bars - 1) % self.rsi_period
+        cols["gains"][rows, slot] = np.where(delta > 0, delta, 0.0)
+        cols["losses"][rows, slot] = np.where(delta < 0, -delta, 0.0)
+
+        def smooth(name, value):
+            prev = cols[f"prev_{name}"][rows]
+            smoothed = np.where(first, value, prev + self.alphas[name] * (value - prev))
+            cols[name][rows] = smoothed
+            return smoothed
+
+        macd = smooth("ema_fast", close) - smooth("ema_slow", close)
+        hist = macd - smooth("signal", macd)
+        prev_hist = cols["prev_macd_hist"][rows]
+
+        cols["close"][rows] = close
+        cols["volume"][rows] = volume
+        cols["change_pct"][rows] = np.where(first, np.nan, _change_pct(close, prev_close))
+        cols["macd"][rows] = macd
+        cols["macd_hist"][rows] = hist
+        cols["rsi"][rows] = np.where(
+            bars >= self.rsi_period,
+            _rsi(cols["gains"][rows].sum(axis=1), cols["losses"][rows].sum(axis=1)),
+            np.nan,
+        )
+        for name, turned in (
+            ("bars_since_macd_up", (hist > 0) & (prev_hist <= 0)),
+            ("bars_since_macd_down", (hist < 0) & (prev_hist >= 0)),
+        ):
+            cols[name][rows] = np.where(turned, 0.0, cols[f"prev_{name}"][rows] + 1)
+        return len(rows)
+
+    def snapshot(self, symbols=None):
+        """The table (or some symbols' rows) as a frame indexed by symbol"""
+        with self._lock:
+            if symbols is None:
+                rows = np.flatnonzero(self._active[: self._size])
+            else:
+                rows = np.array([self._rows[s] for s in symbols if s in self._rows], dtype=np.int64)
+            return self._frame(rows, COLUMNS)
+
+    def query(self, expression, columns=None, sort_by=None, ascending=True, limit=None):
+        """Symbols whose latest values match a filter expression
+
+        e.g. "rsi < 30 and crossed_above(macd_hist, 0)". See compile_filter
+        for the syntax. Returns a frame indexed by symbol, optionally sorted
+        (NaN last) and cut to `limit` rows.
+        """
+        evaluate = compile_filter(expression)
+        columns = list(columns or COLUMNS)
+        unknown = [col for col in columns + ([sort_by] if sort_by else []) if col not in COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown screener column(s): {unknown}")
+        with self._lock:
+            size = self._size
+            table = {name: self._cols[name][:size] for name in COLUMNS}
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mask = np.broadcast_to(evaluate(table), (size,)) & self._active[:size]
+            rows = np.flatnonzero(mask)
+            if sort_by:
+                values = table[sort_by][rows]
+                order = np.argsort(values if ascending else -values, kind="stable")
+                rows = rows[order]
+            if limit is not None:
+                rows = rows[:limit]
+            return self._frame(rows, columns)
+
+    def _frame(self, rows, columns):
+        return pd.DataFrame(
+            {name: self._cols[name][rows] for name in columns},
+            index=pd.Index(self._symbols[rows], name="symbol"),
+        )
+
+
+def _timestamps(values):
+    """int64 epoch nanoseconds (UTC for tz-aware values)"""
+    return pd.DatetimeIndex(values).as_unit("ns").asi8
+
+
+def _rsi(gain_sum, loss_sum):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - 100 / (1 + np.asarray(gain_sum) / loss_sum)
+
+
+def _change_pct(close, prev_close):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (np.asarray(close) / prev_close - 1) * 100
+
+
+# ---------------------------------------------------------------------------
+# Filter expressions
+# ---------------------------------------------------------------------------
+
+COMPARISONS = {
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal,
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+}
+
+ARITHMETIC = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.divide,
+}
+
+
+class _Previous:
+    """The column table as of the bar before the last one"""
+
+    def __init__(self, table):
+        self.table = table
+
+    def __getitem__(self, name):
+        return self.table[f"prev_{name}"]
+
+
+def _crossed(level_op, prev_op):
+    def crossed(node, compile_node):
+        name = node.func.id
+        if len(node.args) != 2 or not isinstance(node.args[0], ast.Name):
+            raise ValueError(f"{name}(column, level) takes a column and a level")
+        # The level may use columns too (crossed_above(macd, signal)); on the
+        # bar before, each of them takes its previous value
+        columns = [node.args[0].id] + [
+            child.id for child in ast.walk(node.args[1]) if isinstance(child, ast.Name)
+        ]
+        for column in columns:
+            if column.lower() not in CROSSABLE:
+                raise ValueError(
+                    f"{name} compares the last two bars, so it needs columns with a "
+                    f"previous value ({', '.join(CROSSABLE)}), not {column}"
+                )
+        column = node.args[0].id.lower()
+        level = compile_node(node.args[1])
+        return lambda t: level_op(t[column], level(t)) & prev_op(
+            t[f"prev_{column}"], level(_Previous(t))
+        )
+
+    return crossed
+
+
+FUNCTIONS = {
+    # Above the level on the last bar, at or below it on the bar before
+    "crossed_above": _crossed(np.greater, np.less_equal),
+    "crossed_below": _crossed(np.less, np.greater_equal),
+    "abs": lambda node, compile_node: _unary(node, compile_node, np.abs),
+}
+
+
+def _is_condition(node):
+    """Whether a node evaluates to a boolean mask rather than to numbers"""
+    if isinstance(node, ast.Compare):
+        return True
+    if isinstance(node, ast.BoolOp):
+        return all(_is_condition(value) for value in node.values)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        return _is_condition(node.operand)
+    return (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in ("crossed_above", "crossed_below")
+    )
+
+
+def _unary(node, compile_node, func):
+    if len(node.args) != 1:
+        raise ValueError(f"{node.func.id}() takes one argument")
+    arg = compile_node(node.args[0])
+    return lambda t: func(arg(t))
+
+
+@lru_cache(maxsize=256)
+def compile_filter(expression):
+    """Compile a filter expression into a function of the column table
+
+    The language is a small subset of Python expressions over the screener
+    columns (case-insensitive): numbers, + - * /, comparisons (chained ones
+    like 30 < rsi < 70 too), and / or / not, parentheses, abs(x) and
+    crossed_above(column, level) / crossed_below(column, level) for columns
+    with a prev_ value (CROSSABLE). The level is a number or an expression
+    of such columns, e.g. crossed_above(macd, signal), evaluated on each of
+    the two bars. Comparisons with NaN are false. The expression, and
+    every operand of and / or / not, must be a condition: "rsi" or
+    "rsi + 1" alone is rejected. Anything else raises ValueError.
+    """
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid filter expression: {e.msg}") from None
+    if not _is_condition(tree.body):
+        raise ValueError(
+            f"Filter must be a condition such as rsi < 30, not {ast.unparse(tree.body)!r}"
+        )
+
+    def compile_node(node):
+        if isinstance(node, ast.BoolOp):
+            parts = [compile_node(value) for value in node.values]
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            return lambda t: reduce(combine, [part(t) for part in parts])
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.USub)):
+            operand = compile_node(node.operand)
+            func = np.logical_not if isinstance(node.op, ast.Not) else np.negative
+            return lambda t: func(operand(t))
+        if isinstance(node, ast.Compare):
+            operands = [compile_node(node.left)] + [compile_node(c) for c in node.comparators]
+            ops = []
+            for op in node.ops:
+                if type(op) not in COMPARISONS:
+                    raise ValueError(f"Unsupported comparison: {type(op).__name__}")
+                ops.append(COMPARISONS[type(op)])
+
+            def compare(t):
+                values = [operand(t) for operand in operands]
+                return reduce(
+                    np.logical_and, [op(values[i], values[i + 1]) for i, op in enumerate(ops)]
+                )
+
+            return compare
+        if isinstance(node, ast.BinOp) and type(node.op) in ARITHMETIC:
+            left, right = compile_node(node.left), compile_node(node.right)
+            func = ARITHMETIC[type(node.op)]
+            return lambda t: func(left(t), right(t))
+        if isinstance(node, ast.Name):
+            name = node.id.lower()
+            if name not in COLUMNS:
+                raise ValueError(f"Unknown screener column: {node.id}")
+            return lambda t: t[name]
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            value = float(node.value)
+            return lambda t: value
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS:
+            if node.keywords:
+                raise ValueError(f"{node.func.id}() takes no keyword arguments")
+            return FUNCTIONS[node.func.id](node, compile_node)
+        raise ValueError(f"Unsupported filter syntax: {ast.unparse(node)}")
+
+    return compile_node(tree.body)
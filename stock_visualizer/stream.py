@@ -0,0 +1,492 @@
+# stream.py
+import argparse
+import json
+import logging
+import math
+import socket
+import threading
+import time
+from collections import deque, namedtuple
+from http.server import BaseHTTPRequestHandler
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import METRICS, bind_http_server, timed
+
+logger = logging.getLogger("stock_visualizer.stream")
+
+Bar = namedtuple("Bar", ["timestamp", "open", "high", "low", "close", "volume"])
+
+
+def bars_from_frame(df):
+    """Bars of an OHLCV frame, in index order"""
+    columns = [df[col].to_numpy(dtype=np.float64) for col in ["Open", "High", "Low", "Close", "Volume"]]
+    return [Bar(ts, *values) for ts, *values in zip(df.index, *columns)]
+
+
+# ---------------------------------------------------------------------------
+# Bar sources: any iterable of Bar works
+# ---------------------------------------------------------------------------
+
+
+class ReplaySource:
+    """Replay recorded bars, in real time, accelerated or as fast as possible
+
+    With `bars_per_second` bars are paced at that rate; with `speed` the
+    recorded gaps between timestamps are replayed `speed` times faster
+    (e.g. 86400 plays one day of bars per second). With neither, bars are
+    yielded without waiting, to load-test the update path. Pacing is
+    against a schedule, so a slow consumer catches up instead of drifting.
+    """
+
+    def __init__(self, bars, bars_per_second=None, speed=None):
+        self.bars = bars_from_frame(bars) if isinstance(bars, pd.DataFrame) else list(bars)
+        self.bars_per_second = bars_per_second
+        self.speed = speed
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        """Bars recorded as CSV or Parquet, with the timestamps in the first column"""
+        if str(path).endswith(".parquet"):
+            df = pd.read_parquet(path)
+        else:
+            df = pd.read_csv(path, index_col=0, parse_dates=True)
+        return cls(df.sort_index(), **kwargs)
+
+    def __len__(self):
+        return len(self.bars)
+
+    def _offset(self, i, bar):
+        # Seconds after the start at which bar i is due
+        if self.bars_per_second:
+            return i / self.bars_per_second
+        if self.speed:
+            first = pd.Timestamp(self.bars[0].timestamp)
+            return (pd.Timestamp(bar.timestamp) - first).total_seconds() / self.speed
+        return 0.0
+
+    def __iter__(self):
+        started = time.perf_counter()
+        for i, bar in enumerate(self.bars):
+            wait = started + self._offset(i, bar) - time.perf_counter()
+            # Sleeping for less than a millisecond is mostly overhead
+            if wait > 0.001:
+                time.sleep(wait)
+            yield bar
+
+
+class SocketSource:
+    """Bars read as JSON lines from a TCP socket (a local stand-in for a websocket feed)
+
+    Each line is an object with timestamp (ISO text), open, high, low, close
+    and volume; see serve_bars for the other end. `close` ends an iteration
+    that is waiting for the next line.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8766, timeout=10.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._conn = None
+
+    def close(self):
+        conn = self._conn
+        if conn is not None:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def __iter__(self):
+        with socket.create_connection((self.host, self.port), timeout=self.timeout) as conn:
+            conn.settimeout(None)
+            self._conn = conn
+            for line in conn.makefile("r", encoding="utf-8"):
+                if line.strip():
+                    fields = json.loads(line)
+                    fields["timestamp"] = pd.Timestamp(fields["timestamp"])
+                    yield Bar(**fields)
+
+
+def serve_bars(source, host="127.0.0.1", port=8766):
+    """Send a source's bars to the first client that connects, as JSON lines"""
+    with socket.create_server((host, port)) as server:
+        conn, _ = server.accept()
+        with conn, conn.makefile("w", encoding="utf-8") as out:
+            for bar in source:
+                out.write(json.dumps({**bar._asdict(), "timestamp": pd.Timestamp(bar.timestamp).isoformat()}) + "\n")
+                out.flush()
+
+
+# ---------------------------------------------------------------------------
+# Chart updates
+# ---------------------------------------------------------------------------
+
+
+def _json_value(value):
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+class StreamingChart:
+    """New points of a plot_stock figure, as Plotly extendTraces updates
+
+    Traces are numbered as plot_stock adds them: price, volume, then the
+    traces of each indicator in order. `indicators` must already be
+    calculated on the history the figure was drawn from; each new bar then
+    costs one O(1) update per indicator. Bars not newer than the last one
+    are dropped. Points are buffered until `drain`, so a fast source is
+    pushed to the browser in batches.
+    """
+
+    def __init__(self, indicators=(), chart_type="candlestick", max_points=None, last_timestamp=None):
+        self.streams = [indicator.stream() for indicator in indicators]
+        self.chart_type = chart_type
+        self.max_points = max_points
+        self.last_timestamp = None if last_timestamp is None else pd.Timestamp(last_timestamp)
+        self.bars = 0
+        self.dropped = 0
+        self._pending = {}
+
+    def push(self, bar):
+        """Update the indicators with a bar and buffer its points; False if dropped"""
+        timestamp = pd.Timestamp(bar.timestamp)
+        if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            self.dropped += 1
+            return False
+        self.last_timestamp = timestamp
+
+        # Same x values as plot_x on a date axis: wall-clock epoch milliseconds
+        if timestamp.tz is not None:
+            timestamp = timestamp.tz_localize(None)
+        x = timestamp.as_unit("ns").value / 1e6
+
+        if self.chart_type == "line":
+            points = [{"y": bar.close}]
+        else:
+            points = [{"open": bar.open, "high": bar.high, "low": bar.low, "close": bar.close}]
+        color = "rgba(220, 50, 50, 0.5)" if bar.close < bar.open else "rgba(0, 150, 50, 0.5)"
+        points.append({"y": bar.volume, "marker.color": color})
+        for stream in self.streams:
+            points.extend(stream.update(bar))
+
+        for trace, point in enumerate(points):
+            pending = self._pending.setdefault(trace, {"x": []})
+            pending["x"].append(x)
+            for key, value in point.items():
+                pending.setdefault(key, []).append(_json_value(float(value)) if key != "marker.color" else value)
+        self.bars += 1
+        return True
+
+    def drain(self):
+        """Buffered points as a list of extendTraces calls, then clear the buffer
+
+        Each call is {"update": {key: [values per trace]}, "indices": [...],
+        "maxPoints": n}; traces are grouped by the keys they extend, since
+        one extendTraces call must extend the same keys on every trace.
+        """
+        groups = {}
+        for trace, pending in sorted(self._pending.items()):
+            groups.setdefault(tuple(pending), []).append((trace, pending))
+        self._pending = {}
+        updates = []
+        for keys, traces in groups.items():
+            update = {
+                "update": {key: [pending[key] for _, pending in traces] for key in keys},
+                "indices": [trace for trace, _ in traces],
+            }
+            if self.max_points:
+                update["maxPoints"] = self.max_points
+            updates.append(update)
+        return updates
+
+
+class StreamRunner:
+    """Pump a source through a StreamingChart on a background thread
+
+    Buffered points are handed to `publish` (e.g. StreamServer.publish for
+    one channel) at most every `flush_interval` seconds and when the source
+    ends. An exception from the source or the chart ends the run; it is
+    logged and kept in `error`. `stop` also closes a source that has a
+    `close` method, so a run blocked waiting on a feed ends too.
+    """
+
+    def __init__(self, source, chart, publish, flush_interval=0.1):
+        self.source = source
+        self.chart = chart
+        self.publish = publish
+        self.flush_interval = flush_interval
+        self.started = None
+        self.finished = None
+        self.error = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stream-runner", daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        close = getattr(self.source, "close", None)
+        if close is not None:
+            close()
+        self._thread.join(timeout)
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    def _flush(self):
+        updates = self.chart.drain()
+        if updates:
+            with timed("stream_publish"):
+                self.publish(updates)
+
+    def _run(self):
+        last_flush = time.perf_counter()
+        bars = 0
+        try:
+            for bar in self.source:
+                if self._stop.is_set():
+                    break
+                self.chart.push(bar)
+                bars += 1
+                now = time.perf_counter()
+                if now - last_flush >= self.flush_interval:
+                    self._flush()
+                    METRICS.inc("stream_bars", bars)
+                    bars = 0
+                    last_flush = now
+        except Exception as e:
+            if not self._stop.is_set():
+                self.error = e
+                METRICS.inc("stream_errors")
+                logger.exception("Stream stopped on an error")
+        finally:
+            self._flush()
+            METRICS.inc("stream_bars", bars)
+            self.finished = time.perf_counter()
+
+    def stats(self):
+        elapsed = ((self.finished or time.perf_counter()) - self.started) if self.started else 0.0
+        return {
+            "bars": self.chart.bars,
+            "dropped": self.chart.dropped,
+            "seconds": round(elapsed, 3),
+            "bars_per_second": round(self.chart.bars / elapsed, 1) if elapsed else 0.0,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Server-sent events to the browser
+# ---------------------------------------------------------------------------
+
+
+class _Channel:
+    def __init__(self, backlog, on_close=None):
+        self.condition = threading.Condition()
+        self.messages = deque(maxlen=backlog)
+        self.sequence = 0
+        self.closed = False
+        self.on_close = on_close
+        self.subscribers = 0
+        self.idle_since = time.monotonic()
+
+
+class StreamServer:
+    """Push extendTraces updates to browsers as server-sent events
+
+    GET /events/<channel> streams the channel's messages: first the last
+    `backlog` ones (so a browser that connects after the stream started
+    misses nothing), then each new one as it is published. A client that
+    reconnects with Last-Event-ID resumes where it left off.
+
+    Channels exist from `open_channel` until `close_channel`; other names
+    get a 404. Closing a channel ends its open responses (with an "end"
+    event, so browsers stop reconnecting) and calls its `on_close`, e.g.
+    StreamRunner.stop. A channel nobody has been subscribed to for
+    `idle_timeout` seconds, such as one whose tab was closed, is closed
+    the same way. Use a new channel name for each stream.
+
+    Binds to localhost unless `host` says otherwise; when `port` is taken
+    (e.g. by another app process) a free one is used, see `port`.
+    """
+
+    def __init__(self, port=8765, host="127.0.0.1", backlog=256, keepalive=15.0, idle_timeout=60.0):
+        self.backlog = backlog
+        self.keepalive = keepalive
+        self.idle_timeout = idle_timeout
+        self._channels = {}
+        self._lock = threading.Lock()
+        handler = type("StreamHandler", (_StreamHandler,), {"stream_server": self})
+        self.httpd = bind_http_server(host, port, handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        threading.Thread(target=self._close_idle, name="stream-idle", daemon=True).start()
+
+    def open_channel(self, name, on_close=None):
+        with self._lock:
+            return self._channels.setdefault(name, _Channel(self.backlog, on_close))
+
+    def channel(self, name):
+        """The open channel of that name, or None"""
+        with self._lock:
+            return self._channels.get(name)
+
+    def publish(self, name, message):
+        """Queue a message for a channel's subscribers (dropped once it is closed)"""
+        channel = self.channel(name)
+        if channel is None:
+            return
+        data = json.dumps(message, separators=(",", ":"))
+        with channel.condition:
+            channel.sequence += 1
+            channel.messages.append((channel.sequence, data))
+            channel.condition.notify_all()
+
+    def _subscribe(self, channel, delta):
+        with channel.condition:
+            channel.subscribers += delta
+            if not channel.subscribers:
+                channel.idle_since = time.monotonic()
+
+    def close_channel(self, name):
+        with self._lock:
+            channel = self._channels.pop(name, None)
+        if channel is None:
+            return
+        with channel.condition:
+            channel.closed = True
+            channel.condition.notify_all()
+        if channel.on_close is not None:
+            channel.on_close()
+
+    def _close_idle(self):
+        while True:
+            time.sleep(min(self.idle_timeout, self.keepalive) / 2)
+            now = time.monotonic()
+            with self._lock:
+                idle = [
+                    name
+                    for name, channel in self._channels.items()
+                    if not channel.subscribers and now - channel.idle_since >= self.idle_timeout
+                ]
+            for name in idle:
+                logger.info(json.dumps({"event": "stream_idle", "channel": name}))
+                self.close_channel(name)
+
+    def shutdown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class _StreamHandler(BaseHTTPRequestHandler):
+    stream_server = None
+
+    def do_GET(self):
+        if not self.path.startswith("/events/"):
+            self.send_error(404)
+            return
+        server = self.stream_server
+        channel = server.channel(self.path[len("/events/"):])
+        if channel is None:
+            self.send_error(404)
+            return
+        cursor = int(self.headers.get("Last-Event-ID") or 0)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        server._subscribe(channel, 1)
+        try:
+            closed = False
+            while not closed:
+                with channel.condition:
+                    channel.condition.wait_for(
+                        lambda: channel.sequence > cursor or channel.closed, timeout=server.keepalive
+                    )
+                    pending = [(seq, data) for seq, data in channel.messages if seq > cursor]
+                    closed = channel.closed
+                if not pending and not closed:
+                    self.wfile.write(b": keepalive\n\n")
+                for seq, data in pending:
+                    self.wfile.write(f"id: {seq}\ndata: {data}\n\n".encode())
+                    cursor = seq
+                if closed:
+                    self.wfile.write(b"event: end\ndata:\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            server._subscribe(channel, -1)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Run in the browser after the figure is drawn; plotly's to_html fills in {plot_id}
+EVENTS_SCRIPT = """
+var host = "localhost";
+try { host = window.parent.location.hostname || host; } catch (e) {}
+var source = new EventSource("http://" + host + ":PORT/events/CHANNEL");
+source.addEventListener("end", function () { source.close(); });
+source.onmessage = function (event) {
+    JSON.parse(event.data).forEach(function (call) {
+        Plotly.extendTraces("{plot_id}", call.update, call.indices, call.maxPoints);
+    });
+};
+"""
+
+
+def events_script(port, channel):
+    """post_script for fig.to_html that applies a channel's updates to the figure"""
+    return EVENTS_SCRIPT.replace("PORT", str(port)).replace("CHANNEL", channel)
+
+
+# ---------------------------------------------------------------------------
+# Command line: load test and socket stand-in
+# ---------------------------------------------------------------------------
+
+
+def main():
+    from indicators import MovingAverage, MACD, RSI
+
+    parser = argparse.ArgumentParser(description="Replay recorded bars through the streaming update path")
+    parser.add_argument("file", help="recorded bars (CSV or Parquet with Open/High/Low/Close/Volume)")
+    parser.add_argument("--bps", type=float, default=None, help="bars per second (default: as fast as possible)")
+    parser.add_argument("--history", type=int, default=500, help="bars used to seed the indicators")
+    parser.add_argument("--serve", type=int, default=None, metavar="PORT",
+                        help="instead, send the bars to a SocketSource client on this port")
+    args = parser.parse_args()
+
+    replay = ReplaySource.from_file(args.file, bars_per_second=args.bps)
+    if args.serve:
+        serve_bars(replay, port=args.serve)
+        return
+
+    history = pd.DataFrame(replay.bars[: args.history]).set_index("timestamp")
+    history.columns = ["Open", "High", "Low", "Close", "Volume"]
+    indicators = [cls(history) for cls in (MovingAverage, MACD, RSI)]
+    for indicator in indicators:
+        indicator.calculate()
+    replay.bars = replay.bars[args.history :]
+
+    messages = []
+    runner = StreamRunner(replay, StreamingChart(indicators), messages.append).start()
+    runner.join()
+    payload = sum(len(json.dumps(message)) for message in messages)
+    print(json.dumps({**runner.stats(), "messages": len(messages), "payload_bytes": payload}))
+
+
+if __name__ == "__main__":
+    main()
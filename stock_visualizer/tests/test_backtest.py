@@ -0,0 +1,83 @@
+# test_backtest.py
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import backtest
+from backtest import parameter_sweep, run_backtest
+
+# fast = 1 (the close itself) against a 2-bar average: the close crosses
+# above the average on bar 2 and back below it on bar 4
+CLOSE = [10.0, 9.0, 11.0, 12.0, 11.0, 10.0, 10.0]
+
+
+def frame(close):
+    return pd.DataFrame({"Close": close}, index=pd.bdate_range("2024-01-01", periods=len(close)))
+
+
+def test_crossover_by_hand():
+    result, metrics = run_backtest(frame(CLOSE), fast=1, slow=2, cost_bps=10, slippage_bps=5)
+
+    assert result["Buy"].tolist() == [False, False, True, False, False, False, False]
+    assert result["Sell"].tolist() == [False, False, False, False, True, False, False]
+    # Signals trade on the next bar
+    assert result["Position"].tolist() == [0, 0, 0, 1, 1, 0, 0]
+
+    cost = 15 / 10_000
+    expected = [0, 0, 0, 12 / 11 - 1 - cost, 11 / 12 - 1, -cost, 0]
+    np.testing.assert_allclose(result["Return"], expected, atol=1e-15)
+    equity = np.cumprod(1 + np.array(expected))
+    np.testing.assert_allclose(result["Equity"], equity)
+    assert metrics["total_return"] == pytest.approx(equity[-1] - 1)
+    # The peak is bar 3; the two bars after it are the deepest drawdown
+    assert metrics["max_drawdown"] == pytest.approx((11 / 12) * (1 - cost) - 1)
+    assert metrics["trades"] == 2
+
+
+def test_short_flips_pay_twice():
+    result, metrics = run_backtest(frame(CLOSE), fast=1, slow=2, cost_bps=10, allow_short=True)
+    assert result["Position"].tolist() == [0, 0, -1, 1, 1, -1, -1]
+    # Long to short is a turnover of 2
+    assert result["Return"].iloc[5] == pytest.approx(1 - 10 / 11 - 2 * 10 / 10_000)
+    assert metrics["trades"] == 3
+
+
+def test_sweep_matches_run_backtest():
+    rng = np.random.default_rng(0)
+    prices = pd.DataFrame(
+        100 * np.exp(np.cumsum(rng.normal(0, 0.02, (300, 3)), axis=0)),
+        columns=["AAA", "BBB", "CCC"],
+        index=pd.bdate_range("2023-01-02", periods=300),
+    )
+    sweep = parameter_sweep(prices, [5, 10, 20], [10, 20, 50], cost_bps=5, slippage_bps=2, max_workers=2, chunk_size=2)
+
+    # fast >= slow is skipped
+    assert (10, 10) not in sweep.loc["AAA"].index
+    assert len(sweep) == 3 * 6
+    for (symbol, fast, slow), row in sweep.iterrows():
+        _, metrics = run_backtest(prices[[symbol]].rename(columns={symbol: "Close"}), fast, slow, 5, 2)
+        for name, value in metrics.items():
+            assert row[name] == pytest.approx(value, rel=1e-9, abs=1e-12), (symbol, fast, slow, name)
+
+
+def test_worker_error_does_not_leak_shared_memory(monkeypatch):
+    created = []
+
+    class Recording(shared_memory.SharedMemory):
+        def __init__(self, name=None, create=False, size=0):
+            super().__init__(name=name, create=create, size=size)
+            if create:
+                created.append(self.name)
+
+    monkeypatch.setattr(backtest.shared_memory, "SharedMemory", Recording)
+    prices = pd.DataFrame({"AAA": np.linspace(100, 120, 100)})
+    # A cost that cannot be added fails inside the worker; that error, not
+    # a BufferError from closing the segment, reaches the caller
+    with pytest.raises(TypeError):
+        parameter_sweep(prices, [5], [20], cost_bps="5", max_workers=1)
+
+    assert len(created) == 1
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=created[0])
@@ -0,0 +1,123 @@
+# test_compact.py
+"""Round trips of CompactBars.from_frame / to_frame under the documented rules"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.compact import CompactBars
+from data.resample import OHLCPyramid
+
+
+def bars(n=500, seed=0, price=100.0, tz=None, decimals=None):
+    rng = np.random.default_rng(seed)
+    close = price * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    if decimals is not None:
+        close = np.round(close, decimals)
+    index = pd.bdate_range("2020-01-01", periods=n, name="Date", tz=tz)
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close * 1.01 if decimals is None else np.round(close * 1.01, decimals),
+            "Low": close * 0.99 if decimals is None else np.round(close * 0.99, decimals),
+            "Close": close,
+            "Volume": rng.integers(1_000, 1_000_000, n),
+        },
+        index=index,
+    )
+
+
+def assert_same_shape(result, df):
+    assert list(result.columns) == list(df.columns)
+    pd.testing.assert_index_equal(result.index, df.index.as_unit("ns"))
+
+
+def test_float32_within_precision():
+    df = bars()
+    result = CompactBars.from_frame(df, "float32").to_frame()
+    assert_same_shape(result, df)
+    prices = ["Open", "High", "Low", "Close"]
+    np.testing.assert_allclose(result[prices].to_numpy(), df[prices].to_numpy(), rtol=2.0**-24, atol=0)
+    np.testing.assert_array_equal(result["Volume"].to_numpy(), df["Volume"].to_numpy())
+
+
+def test_ticks_exact_for_decimal_prices():
+    df = bars(decimals=4)
+    packed = CompactBars.from_frame(df, "ticks")
+    assert packed.mode == "ticks"
+    assert packed.prices.dtype == np.int32
+    result = packed.to_frame()
+    assert_same_shape(result, df)
+    pd.testing.assert_frame_equal(result, df, check_index_type=False, check_freq=False, check_exact=True)
+
+
+def test_ticks_round_other_prices_to_nearest_tick():
+    df = bars()
+    result = CompactBars.from_frame(df, "ticks").to_frame()
+    np.testing.assert_allclose(result["Close"].to_numpy(), df["Close"].to_numpy(), rtol=0, atol=0.5e-4)
+
+
+def test_ticks_fall_back_to_float32_above_int32_range():
+    df = bars(price=600_000.0, decimals=2)
+    packed = CompactBars.from_frame(df, "ticks")
+    assert packed.mode == "float32"
+    assert packed.prices.dtype == np.float32
+    result = packed.to_frame()
+    np.testing.assert_allclose(result["Close"].to_numpy(), df["Close"].to_numpy(), rtol=2.0**-24, atol=0)
+
+
+def test_pyramid_levels_fall_back_per_symbol():
+    cheap = OHLCPyramid(bars(decimals=4), compact="ticks")
+    expensive = OHLCPyramid(bars(price=600_000.0, decimals=2), compact="ticks")
+    assert all(level.mode == "ticks" for level in cheap.levels.values())
+    assert all(level.mode == "float32" for level in expensive.levels.values())
+    assert len(expensive.slice("1d")) == 500
+
+
+@pytest.mark.parametrize("mode", ["float32", "ticks"])
+def test_nan_prices_are_kept(mode):
+    df = bars(decimals=4)
+    df.iloc[[0, 10, 499], df.columns.get_loc("Close")] = np.nan
+    result = CompactBars.from_frame(df, mode).to_frame()
+    np.testing.assert_array_equal(result["Close"].isna().to_numpy(), df["Close"].isna().to_numpy())
+
+
+@pytest.mark.parametrize("mode", ["float32", "ticks"])
+def test_tz_aware_index(mode):
+    df = bars(tz="America/New_York", decimals=4)
+    packed = CompactBars.from_frame(df, mode)
+    assert str(packed.tz) == "America/New_York"
+    result = packed.to_frame()
+    assert_same_shape(result, df)
+    assert result.index.name == "Date"
+    # Naive bounds are read in the bars' time zone
+    assert packed.searchsorted("2020-01-03") == 2
+    assert packed.last_timestamp == df.index[-1]
+
+
+def test_volume_exact_and_validated():
+    df = bars()
+    df["Volume"] = df["Volume"].astype(np.float64) * 1_000_000
+    result = CompactBars.from_frame(df, "float32").to_frame()
+    assert result["Volume"].dtype == np.int64
+    np.testing.assert_array_equal(result["Volume"].to_numpy(), df["Volume"].to_numpy())
+
+    df.iloc[3, df.columns.get_loc("Volume")] = np.nan
+    with pytest.raises(ValueError):
+        CompactBars.from_frame(df, "float32")
+    df.iloc[3, df.columns.get_loc("Volume")] = 1.5
+    with pytest.raises(ValueError):
+        CompactBars.from_frame(df, "float32")
+
+
+def test_frame_without_volume():
+    df = bars(decimals=4).drop(columns="Volume")
+    packed = CompactBars.from_frame(df, "ticks")
+    assert packed.volume is None
+    assert_same_shape(packed.to_frame(), df)
+
+
+def test_unknown_mode_and_columns_raise():
+    with pytest.raises(ValueError):
+        CompactBars.from_frame(bars(), "float16")
+    with pytest.raises(ValueError):
+        CompactBars.from_frame(bars().assign(Dividends=0.0), "float32")
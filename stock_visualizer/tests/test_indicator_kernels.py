@@ -0,0 +1,186 @@
+# test_indicator_kernels.py
+"""Parity of the NumPy and Numba kernels with pandas (kernels_benchmark.py times them)"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import kernels
+from indicators import MACD, RSI
+from stream import Bar
+
+BACKENDS = [
+    "numpy",
+    pytest.param("numba", marks=pytest.mark.skipif(not kernels.NUMBA_AVAILABLE, reason="numba not installed")),
+]
+
+
+def prices(size, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100 + np.cumsum(rng.normal(0, 1, size))
+
+
+def with_gaps(values, seed=0):
+    """Leading, scattered and trailing NaNs"""
+    values = values.copy()
+    rng = np.random.default_rng(seed)
+    values[rng.random(len(values)) < 0.05] = np.nan
+    values[:3] = np.nan
+    values[-2:] = np.nan
+    return values
+
+
+def wilder_reference(values, period):
+    out = np.full(len(values), np.nan)
+    if len(values) < period:
+        return out
+    out[period - 1] = values[:period].mean()
+    for i in range(period, len(values)):
+        out[i] = out[i - 1] + (values[i] - out[i - 1]) / period
+    return out
+
+
+def assert_parity(result, expected):
+    np.testing.assert_allclose(result, expected, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("size", [1, 13, 14, 100, 10_000])
+@pytest.mark.parametrize("span", [9, 12, 26])
+def test_ema_matches_pandas(backend, size, span):
+    values = prices(size)
+    expected = pd.Series(values).ewm(span=span, adjust=False).mean().to_numpy()
+    assert_parity(kernels.ema(values, span=span, backend=backend), expected)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("span", [9, 12, 26])
+def test_ema_skips_nan_like_pandas(backend, span):
+    values = with_gaps(prices(5_000))
+    expected = pd.Series(values).ewm(span=span, adjust=False).mean().to_numpy()
+    result = kernels.ema(values, span=span, backend=backend)
+    assert_parity(result, expected)
+    first = np.flatnonzero(~np.isnan(values))[0]
+    assert not np.isnan(result[first:]).any()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_ema_all_nan(backend):
+    assert np.isnan(kernels.ema(np.full(5, np.nan), span=12, backend=backend)).all()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("size", [1, 13, 14, 100, 10_000])
+def test_wilder_matches_loop(backend, size):
+    values = prices(size)
+    assert_parity(kernels.wilder(values, 14, backend=backend), wilder_reference(values, 14))
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("name", ["sum", "max", "min"])
+@pytest.mark.parametrize("size, window", [(1, 1), (100, 1), (100, 14), (10_000, 50), (10, 50), (50, 50)])
+def test_rolling_matches_pandas(backend, name, size, window):
+    values = prices(size)
+    expected = getattr(pd.Series(values).rolling(window), name)().to_numpy()
+    result = getattr(kernels, f"rolling_{name}")(values, window, backend=backend)
+    assert_parity(result, expected)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("name", ["sum", "max", "min"])
+def test_rolling_nan_windows_match_pandas(backend, name):
+    values = with_gaps(prices(2_000))
+    expected = getattr(pd.Series(values).rolling(20), name)().to_numpy()
+    result = getattr(kernels, f"rolling_{name}")(values, 20, backend=backend)
+    assert_parity(result, expected)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_rolling_sum_of_zeros_is_exactly_zero(backend):
+    rng = np.random.default_rng(3)
+    values = rng.exponential(1.0, 200_000)
+    values[150_000:150_100] = 0.0
+    result = kernels.rolling_sum(values, 14, backend=backend)
+    assert (result[150_013:150_100] == 0.0).all()
+    assert (result[150_100:] > 0).all()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("seed", range(50))
+def test_rsi_flat_window_is_nan_and_bounded(backend, seed, monkeypatch):
+    monkeypatch.setattr(kernels, "DEFAULT_BACKEND", backend)
+    close = prices(400, seed)
+    close[150:200] = close[150]
+    rsi = RSI(pd.DataFrame({"Close": close})).calculate()["RSI"].to_numpy()
+    # 14 changes of zero from bar 151 on: every window ending in 164..199 is flat
+    assert np.isnan(rsi[164:200]).all()
+    assert np.nanmin(rsi) >= 0 and np.nanmax(rsi) <= 100
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_rsi_matches_pandas(backend, monkeypatch):
+    monkeypatch.setattr(kernels, "DEFAULT_BACKEND", backend)
+    close = pd.Series(prices(2_000))
+    delta = close.diff()
+    gain = delta.clip(lower=0).rolling(14).mean()
+    loss = (-delta).clip(lower=0).rolling(14).mean()
+    expected = (100 - 100 / (1 + gain / loss)).to_numpy()
+    result = RSI(pd.DataFrame({"Close": close})).calculate()["RSI"].to_numpy()
+    # RSI.calculate counts bar 0 as no change, so its first value comes one bar earlier
+    assert_parity(result[14:], expected[14:])
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_macd_survives_missing_close(backend, monkeypatch):
+    monkeypatch.setattr(kernels, "DEFAULT_BACKEND", backend)
+    close = prices(500)
+    close[100] = np.nan
+    df = MACD(pd.DataFrame({"Close": close})).calculate()
+    series = pd.Series(close)
+    macd = series.ewm(span=12, adjust=False).mean() - series.ewm(span=26, adjust=False).mean()
+    assert_parity(df["MACD"].to_numpy(), macd.to_numpy())
+    assert_parity(df["Signal"].to_numpy(), macd.ewm(span=9, adjust=False).mean().to_numpy())
+    assert not df[["MACD", "Signal", "MACD_Hist"]].isna().any().any()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_streams_match_batch_across_nan(backend, monkeypatch):
+    monkeypatch.setattr(kernels, "DEFAULT_BACKEND", backend)
+    close = prices(400)
+    close[[250, 300, 301]] = np.nan
+    close[320:340] = close[320]
+    macd = MACD(pd.DataFrame({"Close": close[:200]}))
+    rsi = RSI(pd.DataFrame({"Close": close[:200]}))
+    macd.calculate()
+    rsi.calculate()
+    macd_stream, rsi_stream = macd.stream(), rsi.stream()
+
+    streamed_macd, streamed_rsi = [], []
+    for i, value in enumerate(close[200:], start=200):
+        bar = Bar(i, value, value, value, value, 0)
+        streamed_macd.append(macd_stream.update(bar)[0]["y"])
+        streamed_rsi.append(rsi_stream.update(bar)[0]["y"])
+
+    full = MACD(pd.DataFrame({"Close": close})).calculate()
+    np.testing.assert_allclose(streamed_macd, full["MACD"].to_numpy()[200:], rtol=1e-9, atol=1e-9)
+    streamed_rsi = np.array(streamed_rsi)
+    assert np.isnan(streamed_rsi[334 - 200 : 340 - 200]).all()
+    assert np.nanmin(streamed_rsi) >= 0 and np.nanmax(streamed_rsi) <= 100
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_rsi_stream_skips_missing_close(backend, monkeypatch):
+    monkeypatch.setattr(kernels, "DEFAULT_BACKEND", backend)
+    close = prices(400)
+    close[[250, 300, 301]] = np.nan
+    rsi = RSI(pd.DataFrame({"Close": close[:200]}))
+    rsi.calculate()
+    stream = rsi.stream()
+    streamed = np.array([stream.update(Bar(i, v, v, v, v, 0))[0]["y"] for i, v in enumerate(close[200:], start=200)])
+
+    # Same as RSI over the finite closes, repeated on the missing bars
+    finite = ~np.isnan(close)
+    expected = np.full(len(close), np.nan)
+    expected[finite] = RSI(pd.DataFrame({"Close": close[finite]})).calculate()["RSI"].to_numpy()
+    expected = pd.Series(expected).ffill().to_numpy()
+    assert not np.isnan(streamed).any()
+    assert_parity(streamed, expected[200:])
@@ -0,0 +1,61 @@
+# test_loader.py
+import numpy as np
+import pandas as pd
+
+from data.history import HistoryCache
+from data.loader import DataLoader
+
+
+def raw_bars(index, close, splits=None, dividends=None):
+    close = np.asarray(close, dtype=np.float64)
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close + 1,
+            "Low": close - 1,
+            "Close": close,
+            "Volume": np.full(len(close), 1_000, dtype=np.int64),
+            "Dividends": np.zeros(len(close)) if dividends is None else dividends,
+            "Stock Splits": np.zeros(len(close)) if splits is None else splits,
+        },
+        index=index,
+    )
+
+
+def test_missing_days_skip_federal_holidays():
+    # Thanksgiving 2024 (Thursday 28th) is not a missing day, the Friday is
+    index = pd.DatetimeIndex(["2024-11-26", "2024-11-27", "2024-12-02"], name="Date")
+    _, report = DataLoader.clean_data(raw_bars(index, [10, 11, 12]))
+    assert report["missing_days"] == 1
+    assert report["largest_gap"] == 1
+
+
+def test_split_in_chunk_reports_prior_factor():
+    index = pd.bdate_range("2024-01-01", periods=4, name="Date")
+    splits = np.array([0.0, 0.0, 2.0, 0.0])
+    df, report = DataLoader.clean_data(raw_bars(index, [100, 102, 51, 52], splits=splits))
+    np.testing.assert_allclose(df["Close"], [50, 51, 51, 52])
+    np.testing.assert_array_equal(df["Volume"], [2_000, 2_000, 1_000, 1_000])
+    assert report["prior_price_factor"] == 0.5
+    assert report["prior_split_factor"] == 0.5
+    assert "Stock Splits" not in df.columns
+
+
+def test_refresh_adjusts_stored_history():
+    index = pd.bdate_range("2024-01-01", periods=30, name="Date")
+    close = np.linspace(100, 130, 30)
+    splits = np.zeros(30)
+    close[25:] /= 2
+    splits[25] = 2.0
+    full = raw_bars(index, close, splits=splits)
+
+    # The first download ends before the split, the refresh brings it
+    chunks = iter([full.iloc[:20], full.iloc[19:]])
+    cache = HistoryCache(lambda symbol, start=None: next(chunks), refresh_interval=0, cleaner=DataLoader.clean_data)
+    first = cache.refresh("XYZ")
+    version = first.version
+    pyramid = cache.refresh("XYZ")
+
+    expected, _ = DataLoader.clean_data(full)
+    pd.testing.assert_frame_equal(pyramid.daily, expected, check_freq=False)
+    assert pyramid.version != version
@@ -0,0 +1,80 @@
+# test_metadata.py
+import json
+
+import pytest
+
+from data import metadata
+from data.metadata import MetadataService
+from instrumentation import METRICS
+
+
+class FakeTicker:
+    def __init__(self, info):
+        self._info = info
+
+    @property
+    def info(self):
+        if isinstance(self._info, Exception):
+            raise self._info
+        return self._info
+
+
+class FakeTickers:
+    lookups = []
+    infos = {}
+
+    def __init__(self, symbols):
+        self.tickers = {}
+        for symbol in symbols.split():
+            FakeTickers.lookups.append(symbol)
+            self.tickers[symbol] = FakeTicker(FakeTickers.infos[symbol])
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(metadata.yf, "Tickers", FakeTickers)
+    FakeTickers.lookups = []
+    FakeTickers.infos = {"GOOD": {"marketCap": 10, "volume": 5, "other": 1}, "BAD": KeyError("BAD")}
+    service = MetadataService(cache_path=str(tmp_path / "metadata.json"), ttl=60, error_ttl=60)
+    yield service
+    service.stop()
+
+
+def refresh(service, symbol):
+    """Look up a stale symbol and wait for its background refresh"""
+    service.get(symbol)
+    with service._lock:
+        future = service._pending.get(symbol)
+    if future is not None:
+        future.result()
+
+
+def test_failed_fetch_is_cached_and_logged(service, caplog):
+    errors = METRICS.snapshot()["counters"].get("metadata_errors", 0)
+    with caplog.at_level("WARNING", logger="stock_visualizer.metadata"):
+        assert service.get_many(["good", "bad"], timeout=2) == {"GOOD": {"marketCap": 10, "volume": 5}, "BAD": {}}
+
+    assert METRICS.snapshot()["counters"]["metadata_errors"] == errors + 1
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record["event"] == "metadata_error" and record["symbol"] == "BAD"
+
+    # Neither symbol is looked up again while its entry is fresh
+    service.get_many(["GOOD", "BAD"], timeout=2)
+    assert sorted(FakeTickers.lookups) == ["BAD", "GOOD"]
+
+
+def test_failed_refresh_keeps_data_and_retries_after_error_ttl(service):
+    service.get("GOOD", timeout=2)
+    FakeTickers.infos["GOOD"] = ConnectionError("offline")
+    service.ttl = 0
+    refresh(service, "GOOD")
+    assert service.get("GOOD") == {"marketCap": 10, "volume": 5}
+    assert service._cache["GOOD"]["error"] == "offline"
+
+    # Only the short error TTL applies to the failed entry
+    service.ttl = 60
+    service.error_ttl = 0
+    FakeTickers.infos["GOOD"] = {"marketCap": 11}
+    refresh(service, "GOOD")
+    assert service.get("GOOD") == {"marketCap": 11}
+    assert "error" not in service._cache["GOOD"]
@@ -0,0 +1,137 @@
+# test_screener.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import MACD, RSI
+from screener import Screener, compile_filter
+
+
+@pytest.mark.parametrize("expression", ["rsi", "1", "rsi + 1", "abs(macd)", "rsi < 30 and macd", "not rsi"])
+def test_filters_must_be_conditions(expression):
+    with pytest.raises(ValueError):
+        compile_filter(expression)
+
+
+@pytest.mark.parametrize(
+    "expression",
+    ["rsi < 30", "30 < rsi < 70", "not (rsi < 30)", "rsi < 30 or crossed_above(macd_hist, 0)", "abs(macd) > 1"],
+)
+def test_conditions_compile(expression):
+    compile_filter(expression)
+
+
+def test_query_rejects_non_boolean_filter():
+    screener = Screener(capacity=2)
+    screener.update(["AAA"], [np.datetime64("2024-01-02")], [100.0])
+    with pytest.raises(ValueError):
+        screener.query("rsi + 1")
+
+
+def daily(n=200, seed=0, start="2024-01-01"):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    return pd.DataFrame(
+        {"Close": close, "Volume": rng.integers(1_000, 10_000, n).astype(np.float64)},
+        index=pd.bdate_range(start, periods=n, name="Date"),
+    )
+
+
+def assert_rows_equal(left, right):
+    pd.testing.assert_frame_equal(left, right, check_exact=False, rtol=1e-9, atol=1e-9)
+
+
+def test_load_matches_indicators():
+    bars = daily()
+    screener = Screener()
+    screener.load("AAA", bars)
+    row = screener.snapshot().loc["AAA"]
+
+    macd = MACD(bars.copy()).calculate()
+    rsi = RSI(bars.copy()).calculate()["RSI"]
+    assert row["bars"] == len(bars)
+    assert row["close"] == bars["Close"].iloc[-1]
+    assert row["prev_close"] == bars["Close"].iloc[-2]
+    assert row["volume"] == bars["Volume"].iloc[-1]
+    assert row["change_pct"] == pytest.approx((bars["Close"].iloc[-1] / bars["Close"].iloc[-2] - 1) * 100)
+    for column, source in (("macd", "MACD"), ("signal", "Signal"), ("macd_hist", "MACD_Hist")):
+        assert row[column] == pytest.approx(macd[source].iloc[-1])
+        assert row[f"prev_{column}"] == pytest.approx(macd[source].iloc[-2])
+    assert row["rsi"] == pytest.approx(rsi.iloc[-1])
+    assert row["prev_rsi"] == pytest.approx(rsi.iloc[-2])
+
+
+@pytest.mark.parametrize("split", [1, 13, 14, 150, 199])
+def test_append_matches_full_load(split):
+    bars = daily()
+    full, incremental = Screener(), Screener()
+    full.load("AAA", bars)
+    incremental.load("AAA", bars.iloc[:split])
+    assert incremental.append("AAA", bars.iloc[split:])
+    assert_rows_equal(incremental.snapshot(), full.snapshot())
+
+
+def test_revised_last_bar_matches_full_load():
+    bars = daily()
+    screener = Screener()
+    screener.load("AAA", bars.iloc[:150])
+    # The stored last bar was partial: its re-download comes with the new bars
+    revised = bars.iloc[149:].copy()
+    revised.iloc[0, 0] += 2.5
+    assert screener.append("AAA", revised)
+    expected = Screener()
+    expected.load("AAA", pd.concat([bars.iloc[:149], revised]))
+    assert_rows_equal(screener.snapshot(), expected.snapshot())
+
+
+def test_append_before_last_bar_needs_load():
+    bars = daily()
+    screener = Screener()
+    screener.load("AAA", bars)
+    before = screener.snapshot()
+    assert not screener.append("AAA", bars.iloc[100:])
+    assert_rows_equal(screener.snapshot(), before)
+
+
+def test_update_many_symbols_matches_load():
+    frames = {f"S{i}": daily(seed=i) for i in range(5)}
+    incremental, full = Screener(capacity=2), Screener()
+    for symbol, bars in frames.items():
+        incremental.load(symbol, bars.iloc[:-3])
+        full.load(symbol, bars)
+    for i in range(-3, 0):
+        incremental.update(
+            list(frames),
+            [bars.index[i] for bars in frames.values()],
+            [bars["Close"].iloc[i] for bars in frames.values()],
+            [bars["Volume"].iloc[i] for bars in frames.values()],
+        )
+    assert_rows_equal(incremental.snapshot(list(frames)), full.snapshot(list(frames)))
+
+    with pytest.raises(ValueError):
+        incremental.update(["S0", "S0"], [bars.index[-1]] * 2, [1.0, 2.0])
+    incremental.remove("S0")
+    assert "S0" not in incremental and len(incremental) == 4
+
+
+def test_crossed_above_signal():
+    screener = Screener()
+    expected = set()
+    for i in range(200):
+        bars = daily(n=80, seed=i)
+        screener.load(f"S{i}", bars)
+        macd = MACD(bars.copy()).calculate()
+        if macd["MACD"].iloc[-1] > macd["Signal"].iloc[-1] and macd["MACD"].iloc[-2] <= macd["Signal"].iloc[-2]:
+            expected.add(f"S{i}")
+    assert expected
+    assert set(screener.query("crossed_above(macd, signal)").index) == expected
+    assert set(screener.query("crossed_above(macd_hist, 0)").index) == expected
+    below = set(screener.query("crossed_below(macd, signal)").index)
+    assert below and not below & expected
+
+
+def test_crossed_above_needs_previous_values():
+    with pytest.raises(ValueError, match="close, rsi, macd, signal, macd_hist"):
+        compile_filter("crossed_above(volume, 0)")
+    with pytest.raises(ValueError, match="change_pct"):
+        compile_filter("crossed_above(macd, change_pct)")
@@ -0,0 +1,49 @@
+# test_store.py
+import numpy as np
+import pandas as pd
+
+from data.resample import OHLCPyramid
+from data.store import FrameStore
+
+
+def daily_bars(n=30):
+    index = pd.bdate_range("2024-01-01", periods=n)
+    close = np.arange(n, dtype=np.float64) + 100
+    return pd.DataFrame(
+        {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 1_000}, index=index
+    )
+
+
+def test_revised_last_bar_replaces_stored_frame():
+    pyramid = OHLCPyramid(daily_bars())
+    store = FrameStore()
+    handle = store.put(("AAA", "range", "1d"), pyramid.slice("1d"), version=pyramid.version)
+
+    # A partial bar re-downloaded under the same timestamp
+    revised = pyramid.daily.iloc[-1:].copy()
+    revised["Close"] = 500.0
+    pyramid.update(revised)
+    store.put(("AAA", "range", "1d"), pyramid.slice("1d"), version=pyramid.version)
+
+    assert handle.df["Close"].iloc[-1] == 500.0
+
+
+def test_same_version_is_a_hit():
+    pyramid = OHLCPyramid(daily_bars())
+    store = FrameStore()
+    first = store.put(("AAA", "range", "1d"), pyramid.slice("1d"), version=pyramid.version)
+    second = store.put(("AAA", "range", "1d"), pyramid.slice("1d"), version=pyramid.version)
+    assert first.df is second.df
+    assert store.refs(("AAA", "range", "1d")) == 2
+
+
+def test_transform_never_modifies_shared_frame():
+    store = FrameStore()
+    store.put("key", daily_bars())
+
+    def overwrite(df):
+        df.loc[df.index[0], "Close"] = -1.0
+        return df
+
+    assert store.transform("key", overwrite)["Close"].iloc[0] == -1.0
+    assert store.get("key")["Close"].iloc[0] == 100.0
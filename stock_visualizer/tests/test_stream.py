@@ -0,0 +1,73 @@
+# test_stream.py
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from stream import SocketSource, StreamRunner, StreamServer
+
+
+class NullChart:
+    bars = 0
+    dropped = 0
+
+    def push(self, bar):
+        pass
+
+    def drain(self):
+        return []
+
+
+@pytest.fixture
+def server():
+    server = StreamServer(port=0, keepalive=0.2, idle_timeout=0.6)
+    yield server
+    server.shutdown()
+
+
+def events_url(server, name):
+    return f"http://127.0.0.1:{server.port}/events/{name}"
+
+
+def test_unknown_channel_is_404(server):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(events_url(server, "missing"), timeout=2)
+    assert error.value.code == 404
+    assert server.channel("missing") is None
+
+
+def test_close_ends_response_and_calls_on_close(server):
+    closed = []
+    server.open_channel("a", on_close=lambda: closed.append("a"))
+    server.publish("a", [1])
+    response = urllib.request.urlopen(events_url(server, "a"), timeout=3)
+    assert response.readline() == b"id: 1\n"
+    threading.Timer(0.2, server.close_channel, ["a"]).start()
+    assert response.read().endswith(b"event: end\ndata:\n\n")
+    assert closed == ["a"]
+    # Publishing to a closed channel does not bring it back
+    server.publish("a", [2])
+    assert server.channel("a") is None
+
+
+def test_channel_without_subscribers_is_closed(server):
+    closed = []
+    server.open_channel("b", on_close=lambda: closed.append("b"))
+    time.sleep(1.2)
+    assert closed == ["b"]
+    assert server.channel("b") is None
+
+
+def test_stop_ends_runner_blocked_on_socket():
+    with socket.create_server(("127.0.0.1", 0)) as feed:
+        source = SocketSource("127.0.0.1", feed.getsockname()[1])
+        runner = StreamRunner(source, NullChart(), lambda updates: None).start()
+        conn, _ = feed.accept()
+        with conn:
+            time.sleep(0.1)
+            runner.stop()
+            assert not runner.running
+            assert runner.error is None